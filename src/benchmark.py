@@ -0,0 +1,115 @@
+import sys
+from argparse import ArgumentParser, ArgumentTypeError
+from tempfile import TemporaryDirectory
+
+from benchmarks.catalog_generator import CatalogOptions
+from benchmarks.runner import (
+    compare_results,
+    read_results,
+    run_benchmark,
+    write_results,
+)
+
+
+def parse_distribution(value: str) -> tuple[int, ...]:
+    """Muuntaa pilkuilla erotetut kokonaisluvut jakaumaksi.
+
+    Args:
+        value (str): Esimerkiksi "1,5,5,10".
+
+    Raises:
+        ArgumentTypeError: Arvo ei ole kokonaislukuja.
+
+    Returns:
+        tuple[int, ...]: Jakauman arvot.
+    """
+
+    try:
+        return tuple(int(item) for item in value.split(","))
+    except ValueError as error:
+        raise ArgumentTypeError(f"{value} ei ole kokonaislukulista.") from error
+
+
+def get_parser() -> ArgumentParser:
+    """Muodostaa komentoriviparametrien jäsentäjän.
+
+    Returns:
+        ArgumentParser: Jäsentäjä komennoille run ja compare.
+    """
+
+    defaults = CatalogOptions()
+    parser = ArgumentParser(description="Sovelluksen suorituskykymittaukset.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Suorittaa mittaukset.")
+    run.add_argument("--size", type=int, default=defaults.size)
+    run.add_argument("--depth", type=int, default=defaults.depth)
+    run.add_argument("--fan-in", type=int, default=defaults.fan_in)
+    run.add_argument("--credits", type=parse_distribution, default=defaults.credits)
+    run.add_argument("--timings", type=parse_distribution, default=defaults.timings)
+    run.add_argument("--seed", type=int, default=defaults.seed)
+    run.add_argument("--repeats", type=int, default=3)
+    run.add_argument("--output", default="benchmark.json")
+
+    compare = commands.add_parser("compare", help="Vertailee kahta mittausta.")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.1)
+
+    return parser
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """Suorittaa komennon.
+
+    Args:
+        arguments (list[str] | None, optional):
+            Komentoriviparametrit. Oletukseltaan None, jolloin käytetään sys.argv:tä.
+
+    Returns:
+        int: Paluuarvo, 1 jos vertailussa jokin vaihe heikkeni. Muulloin 0.
+    """
+
+    arguments = get_parser().parse_args(arguments)
+
+    if arguments.command == "run":
+        options = CatalogOptions(
+            arguments.size,
+            arguments.depth,
+            arguments.fan_in,
+            arguments.credits,
+            arguments.timings,
+            arguments.seed,
+        )
+
+        with TemporaryDirectory() as directory:
+            results = run_benchmark(options, directory, arguments.repeats)
+
+        write_results(results, arguments.output)
+
+        for stage, result in results["stages"].items():
+            print(f"{stage:<22}{result['time']:>10.4f} s{result['memory']:>14} B")
+
+        return 0
+
+    baseline = read_results(arguments.baseline)
+    current = read_results(arguments.current)
+
+    if baseline["options"] != current["options"]:
+        print("Varoitus: mittausten parametrit eroavat.")
+
+    comparisons = compare_results(baseline, current, arguments.threshold)
+
+    for comparison in comparisons:
+        print(
+            f"{comparison.stage:<22}{comparison.metric:<8}"
+            f"{comparison.baseline:>14.6g}{comparison.current:>14.6g}"
+            f"{comparison.change:>+10.1%}"
+            + (" HEIKKENI" if comparison.regressed else "")
+        )
+
+    return int(any(comparison.regressed for comparison in comparisons))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
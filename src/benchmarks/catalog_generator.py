@@ -0,0 +1,103 @@
+from random import Random
+from typing import NamedTuple
+
+from config import PERIODS_PER_YEAR
+from entities.course import Course
+
+
+class CatalogOptions(NamedTuple):
+    """Satunnaisen kurssivalikoiman parametrit.
+
+    Jakaumat annetaan arvojoukkoina, joista arvotaan tasaisesti,
+    joten toistamalla arvoa sen todennäköisyyttä voi kasvattaa.
+
+    Attributes:
+        size (int): Kurssien määrä.
+        depth (int): Kerrosten määrä eli pisimmän esitietoketjun kurssien määrä.
+        fan_in (int): Esitietovaatimusten enimmäismäärä kurssia kohden.
+        credits (tuple[int, ...]): Opintopistemäärien jakauma.
+        timings (tuple[int, ...]): Kurssin tarjoavien periodien määrän jakauma.
+        seed (int): Satunnaislukugeneraattorin siemen.
+    """
+
+    size: int = 1000
+    depth: int = 10
+    fan_in: int = 3
+    credits: tuple[int, ...] = (1, 2, 3, 5, 5, 5, 10)
+    timings: tuple[int, ...] = (1, 1, 2, 2, 3)
+    seed: int = 0
+
+
+def get_requirements(
+    random: Random, starts: list[int], layer: int, fan_in: int
+) -> set[int]:
+    """Arpoo kurssin esitietovaatimukset aiemmista kerroksista.
+
+    Args:
+        random (Random): Satunnaislukugeneraattori.
+        starts (list[int]): Kerrosten ensimmäisten kurssien indeksit.
+        layer (int): Kurssin kerros.
+        fan_in (int): Esitietovaatimusten enimmäismäärä.
+
+    Returns:
+        set[int]:
+            Esitietokurssien indeksit. Ensimmäisen kerroksen kursseilla ei ole esitietoja,
+            muilla on ainakin yksi edellisen kerroksen kurssi.
+    """
+
+    if layer == 0 or fan_in == 0:
+        return set()
+
+    requirements = {random.randrange(starts[layer - 1], starts[layer])}
+
+    for _ in range(random.randint(0, fan_in - 1)):
+        requirements.add(random.randrange(starts[layer]))
+
+    return requirements
+
+
+def generate_catalog(options: CatalogOptions) -> list[Course]:
+    """Luo satunnaisen kurssivalikoiman, jonka esitietoverkko on syklitön.
+    Kurssit jaetaan id-järjestyksessä kerroksiin, ja jokaisella kerroksen ensimmäisen jälkeisellä
+    kurssilla on esitietona ainakin yksi edellisen kerroksen kurssi, joten pisin esitietoketju
+    on kerrosten mittainen. Muut esitiedot arvotaan aiemmista kerroksista.
+    Sama siemen tuottaa aina saman valikoiman.
+
+    Args:
+        options (CatalogOptions): Valikoiman parametrit.
+
+    Raises:
+        ValueError: Parametri ei ole positiivinen tai jakauma on tyhjä.
+
+    Returns:
+        list[Course]: Kurssit id-järjestyksessä alkaen id:stä 1.
+    """
+
+    if options.size <= 0 or options.depth <= 0 or options.fan_in < 0:
+        raise ValueError("Valikoiman koon ja syvyyden on oltava positiivisia.")
+
+    if not options.credits or not options.timings:
+        raise ValueError("Jakauma ei voi olla tyhjä.")
+
+    random = Random(options.seed)
+    depth = min(options.depth, options.size)
+    starts = [layer * options.size // depth for layer in range(depth + 1)]
+    periods = range(1, PERIODS_PER_YEAR + 1)
+    courses = []
+
+    for layer in range(depth):
+        for index in range(starts[layer], starts[layer + 1]):
+            requirements = get_requirements(random, starts, layer, options.fan_in)
+            count = min(random.choice(options.timings), PERIODS_PER_YEAR)
+
+            courses.append(
+                Course(
+                    f"Kurssi {index + 1}",
+                    random.choice(options.credits),
+                    set(random.sample(periods, count)),
+                    {requirement + 1 for requirement in requirements},
+                    index + 1,
+                )
+            )
+
+    return courses
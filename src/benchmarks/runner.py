@@ -0,0 +1,266 @@
+import gc
+import json
+import os
+import platform
+import tracemalloc
+from collections.abc import Callable
+from time import perf_counter
+from typing import NamedTuple
+
+from benchmarks.catalog_generator import CatalogOptions, generate_catalog
+from config import PERIODS_PER_YEAR
+from entities.course import Course
+from lib.database import Database
+from repositories.course_repository import CourseRepository
+from services.export_service import export_service
+from services.import_service import import_service
+from services.scheduler_service import SchedulerService
+
+
+class StageResult(NamedTuple):
+    """Yhden vaiheen mittaustulos.
+
+    Attributes:
+        time (float): Nopein suoritusaika sekunteina.
+        memory (int): Vaiheen aikana varatun muistin huippu tavuina.
+    """
+
+    time: float
+    memory: int
+
+
+class Comparison(NamedTuple):
+    """Kahden mittauksen yhden vaiheen ja suureen vertailu.
+
+    Attributes:
+        stage (str): Vaiheen nimi.
+        metric (str): Suureen nimi, "time" tai "memory".
+        baseline (float): Vertailukohdan arvo.
+        current (float): Uuden mittauksen arvo.
+        change (float): Suhteellinen muutos, esimerkiksi 0.1 on 10 % kasvu.
+        regressed (bool): Ylittääkö kasvu sallitun rajan.
+    """
+
+    stage: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+    regressed: bool
+
+
+def measure(
+    stage: Callable[[], object],
+    setup: Callable[[], object] | None = None,
+    repeats: int = 3,
+) -> StageResult:
+    """Mittaa vaiheen suoritusajan ja muistinkäytön.
+    Aika mitataan ilman muistin seurantaa, sillä tracemalloc hidastaa varauksia.
+    Muistin huippu mitataan erillisellä suorituskerralla.
+
+    Args:
+        stage (Callable[[], object]): Mitattava vaihe.
+        setup (Callable[[], object] | None, optional):
+            Ennen jokaista suorituskertaa kutsuttava alustus, jota ei mitata.
+            Oletukseltaan None.
+        repeats (int, optional): Aikamittausten määrä. Oletukseltaan 3.
+
+    Returns:
+        StageResult: Nopein suoritusaika ja muistin huippu.
+    """
+
+    times = []
+
+    for _ in range(max(repeats, 1)):
+        if setup:
+            setup()
+
+        gc.collect()
+        started = perf_counter()
+        stage()
+        times.append(perf_counter() - started)
+
+    if setup:
+        setup()
+
+    gc.collect()
+    tracemalloc.start()
+    stage()
+    memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return StageResult(min(times), memory)
+
+
+def render_schedule(
+    schedule: list[list[Course]], starting_year: int, starting_period: int
+) -> list[str]:
+    """Muodostaa aikataulusta samat rivit kuin ScheduleView ilman käyttöliittymää.
+
+    Args:
+        schedule (list[list[Course]]): Aikataulu.
+        starting_year (int): Aloitusvuosi.
+        starting_period (int): Aloitusperiodi.
+
+    Returns:
+        list[str]: Vuosien, periodien ja kurssien rivit näkymän järjestyksessä.
+    """
+
+    rows = []
+    year_row = -1
+    credits_of_year = 0
+    period = starting_period
+    year = starting_year
+
+    for courses in schedule:
+        if year_row == -1:
+            year_row = len(rows)
+            rows.append("")
+
+        credits_of_period = sum(course.credits for course in courses)
+        credits_of_year += credits_of_period
+
+        rows.append(f"{period}. periodi, {credits_of_period} op")
+        rows.extend(str(course) for course in courses)
+        rows[year_row] = f"{year}, {credits_of_year} op"
+
+        period += 1
+
+        if period > PERIODS_PER_YEAR:
+            period = 1
+            year += 1
+            year_row = -1
+            credits_of_year = 0
+
+    return rows
+
+
+def run_benchmark(
+    options: CatalogOptions, directory: str, repeats: int = 3
+) -> dict[str, object]:
+    """Mittaa sovelluksen vaiheet satunnaisella kurssivalikoimalla.
+    Mitattavat vaiheet ovat tuonti, tietokantaan tallennus kurssi kerrallaan ja kerralla,
+    tietokannasta haku ilman välimuistia ja välimuistista, aikataulutus, vienti
+    sekä aikataulun näyttäminen.
+
+    Args:
+        options (CatalogOptions): Kurssivalikoiman parametrit.
+        directory (str): Hakemisto, johon väliaikaiset tiedostot ja tietokanta luodaan.
+        repeats (int, optional): Aikamittausten määrä vaihetta kohden. Oletukseltaan 3.
+
+    Returns:
+        dict[str, object]:
+            Parametrit, vaiheiden tulokset ja aikatauluttajan tunnusluvut JSON-muotoon sopivina.
+    """
+
+    courses = generate_catalog(options)
+    catalog_path = os.path.join(directory, "catalog.json")
+    export_path = os.path.join(directory, "export.json")
+    database = Database(os.path.join(directory, "benchmark.db"))
+    repository = CourseRepository(database)
+    uncached_repository = CourseRepository(database, 0)
+    max_credits = max(15, *options.credits)
+
+    export_service.write(courses, catalog_path)
+
+    def create_courses() -> None:
+        for course in courses:
+            repository.create(course)
+
+    def get_schedule() -> list[list[Course]]:
+        return SchedulerService(courses, 1, max_credits).get_schedule()
+
+    scheduler = SchedulerService(courses, 1, max_credits, instrumented=True)
+    schedule = scheduler.get_schedule()
+
+    stages = {
+        "import": measure(lambda: import_service.read(catalog_path), repeats=repeats),
+        "repository_create": measure(
+            create_courses, repository.delete_all, repeats=repeats
+        ),
+        "repository_replace_all": measure(
+            lambda: repository.replace_all(courses), repeats=repeats
+        ),
+        "repository_find_all": measure(uncached_repository.find_all, repeats=repeats),
+        "repository_find_all_cached": measure(
+            repository.find_all, repository.find_all, repeats=repeats
+        ),
+        "schedule": measure(get_schedule, repeats=repeats),
+        "export": measure(
+            lambda: export_service.write(courses, export_path), repeats=repeats
+        ),
+        "render": measure(lambda: render_schedule(schedule, 2023, 1), repeats=repeats),
+    }
+
+    database.close()
+
+    return {
+        "options": options._asdict(),
+        "python": platform.python_version(),
+        "repeats": repeats,
+        "periods": len(schedule),
+        "stages": {name: result._asdict() for name, result in stages.items()},
+        "scheduler": vars(scheduler.stats),
+    }
+
+
+def write_results(results: dict[str, object], path: str) -> None:
+    """Kirjoittaa mittaustulokset JSON-tiedostoon. Ylikirjoittaa tiedoston.
+
+    Args:
+        results (dict[str, object]): Mittaustulokset.
+        path (str): Kirjoitettavan tiedoston polku.
+    """
+
+    with open(path, mode="w", encoding="utf-8") as file:
+        json.dump(results, file, indent=4)
+
+
+def read_results(path: str) -> dict[str, object]:
+    """Lukee mittaustulokset JSON-tiedostosta.
+
+    Args:
+        path (str): Tiedoston polku.
+
+    Returns:
+        dict[str, object]: Mittaustulokset.
+    """
+
+    with open(path, mode="r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare_results(
+    baseline: dict[str, object], current: dict[str, object], threshold: float = 0.1
+) -> list[Comparison]:
+    """Vertailee kahden mittauksen vaiheita.
+    Vain molemmista mittauksista löytyvät vaiheet vertaillaan.
+
+    Args:
+        baseline (dict[str, object]): Vertailukohdan mittaustulokset.
+        current (dict[str, object]): Uudet mittaustulokset.
+        threshold (float, optional):
+            Suurin sallittu suhteellinen kasvu. Oletukseltaan 0.1 eli 10 %.
+
+    Returns:
+        list[Comparison]: Vertailut vaiheittain ja suureittain.
+    """
+
+    comparisons = []
+
+    for stage, old in baseline["stages"].items():
+        new = current["stages"].get(stage)
+
+        if new is None:
+            continue
+
+        for metric in StageResult._fields:
+            change = new[metric] / old[metric] - 1 if old[metric] else 0.0
+
+            comparisons.append(
+                Comparison(
+                    stage, metric, old[metric], new[metric], change, change > threshold
+                )
+            )
+
+    return comparisons
@@ -21,3 +21,64 @@ try:
     COURSE_NAME_WIDTH = int(os.getenv("COURSE_NAME_WIDTH") or 35)
 except ValueError:
     COURSE_NAME_WIDTH = 35
+
+try:
+    SCHEDULE_CACHE_SIZE = int(os.getenv("SCHEDULE_CACHE_SIZE") or 32)
+except ValueError:
+    SCHEDULE_CACHE_SIZE = 32
+
+try:
+    COURSE_CACHE_SIZE = int(os.getenv("COURSE_CACHE_SIZE") or 10000)
+except ValueError:
+    COURSE_CACHE_SIZE = 10000
+
+try:
+    OPTIMIZER_TIME_BUDGET = float(os.getenv("OPTIMIZER_TIME_BUDGET") or 1.0)
+except ValueError:
+    OPTIMIZER_TIME_BUDGET = 1.0
+
+DATABASE_JOURNAL_MODE = (os.getenv("DATABASE_JOURNAL_MODE") or "WAL").upper()
+
+if DATABASE_JOURNAL_MODE not in {
+    "DELETE",
+    "TRUNCATE",
+    "PERSIST",
+    "MEMORY",
+    "WAL",
+    "OFF",
+}:
+    DATABASE_JOURNAL_MODE = "WAL"
+
+DATABASE_SYNCHRONOUS = (os.getenv("DATABASE_SYNCHRONOUS") or "NORMAL").upper()
+
+if DATABASE_SYNCHRONOUS not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+    DATABASE_SYNCHRONOUS = "NORMAL"
+
+try:
+    DATABASE_CACHE_SIZE = int(os.getenv("DATABASE_CACHE_SIZE") or -16000)
+except ValueError:
+    DATABASE_CACHE_SIZE = -16000
+
+try:
+    DATABASE_MMAP_SIZE = int(os.getenv("DATABASE_MMAP_SIZE") or 268435456)
+except ValueError:
+    DATABASE_MMAP_SIZE = 268435456
+
+DATABASE_TEMP_STORE = (os.getenv("DATABASE_TEMP_STORE") or "MEMORY").upper()
+
+if DATABASE_TEMP_STORE not in {"DEFAULT", "FILE", "MEMORY"}:
+    DATABASE_TEMP_STORE = "MEMORY"
+
+try:
+    DATABASE_STATEMENT_CACHE_SIZE = int(
+        os.getenv("DATABASE_STATEMENT_CACHE_SIZE") or 128
+    )
+except ValueError:
+    DATABASE_STATEMENT_CACHE_SIZE = 128
+
+DATABASE_IN_MEMORY = (os.getenv("DATABASE_IN_MEMORY") or "").lower() in {"1", "true"}
+
+try:
+    DATABASE_SNAPSHOT_INTERVAL = float(os.getenv("DATABASE_SNAPSHOT_INTERVAL") or 60.0)
+except ValueError:
+    DATABASE_SNAPSHOT_INTERVAL = 60.0
@@ -1,5 +1,6 @@
 class Course:
     """Luokka, joka kuvaa kurssia.
+    Kurssi on muuttumaton, joten samaa oliota voi säilyttää välimuisteissa.
 
     Attributes:
         name (str):
@@ -90,18 +91,22 @@ class Course:
     def id(self) -> int:
         return self.__id
 
-    @id.setter
-    def id(self, course_id: int) -> None:
-        """Asettaa uuden id:n.
+    def with_id(self, course_id: int) -> "Course":
+        """Palauttaa kopion kurssista uudella id:llä.
 
         Args:
-            course_id (int): Asetettava id.
+            course_id (int): Uusi id.
 
         Raises:
-            ValueError: Id on negatiivinen.
+            ValueError: Id ei ole positiivinen.
+
+        Returns:
+            Course: Kurssi uudella id:llä.
         """
 
         if course_id <= 0:
             raise ValueError(f"Negatiivinen id {course_id} ei kelpaa.")
 
-        self.__id = course_id
+        return Course(
+            self.__name, self.__credits, self.__timing, self.__requiments, course_id
+        )
@@ -0,0 +1,457 @@
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import Iterable, Sequence
+from copy import copy
+from functools import cache
+from heapq import heapify, heappush
+
+from config import PERIODS_PER_YEAR
+from entities.course import Course
+
+
+@cache
+def get_periods(timing: int) -> tuple[int, ...]:
+    """Palauttaa bittimaskina annetun ajoituksen periodit.
+    Erilaisia ajoituksia on vähän, joten tulokset tallennetaan.
+
+    Args:
+        timing (int): Ajoitus bittimaskina, jossa bitti p vastaa periodia p.
+
+    Returns:
+        tuple[int, ...]: Periodit kasvavassa järjestyksessä.
+    """
+
+    return tuple(
+        period for period in range(timing.bit_length()) if timing >> period & 1
+    )
+
+
+class CourseGraph:
+    """Luokka, joka kuvaa kurssien riippuvuusverkkoa muuttumattomana rakenteena.
+
+    Kurssit numeroidaan tiiviisti indekseillä 0..n-1 id-järjestyksessä.
+    Kaaret tallennetaan CSR-muodossa: kurssista indeksi lähtevät kaaret
+    ovat taulukossa targets väliltä offsets[indeksi]..offsets[indeksi + 1].
+    Verkko muodostetaan kerran kurssivalikoimaa kohden,
+    ja aikataulutus kopioi siitä vain ajokohtaisen tilan.
+    Rakenteen sisältöä ei saa muokata.
+
+    Attributes:
+        courses (tuple[Course, ...]): Kurssit indeksijärjestyksessä.
+        offsets (array): Jokaisen kurssin kaarien alkukohta targets-taulukossa.
+        targets (array):
+            Kurssista riippuvien kurssien indeksit kursseittain järjestettynä.
+        timings (array):
+            Kurssien ajoitukset bittimaskeina, joissa bitti p vastaa periodia p.
+            Välin 1..PERIODS_PER_YEAR ulkopuoliset periodit jätetään pois.
+        in_degrees (array): Kurssien esitietovaatimusten määrät indeksijärjestyksessä.
+        heaps (tuple[tuple[tuple[int, int], ...], ...]):
+            Periodikohtaiset minimikeot (opintopisteet, indeksi) kursseista,
+            joilla ei ole esitietovaatimuksia.
+        missing (dict[int, tuple[int, ...]]):
+            Valikoimasta puuttuvat esitietovaatimukset ja niitä vaativien kurssien indeksit.
+    """
+
+    def __init__(self, courses: list[Course] | None = None) -> None:
+        """Luokan konstruktori.
+
+        Args:
+            courses (list[Course] | None, optional):
+                Verkkoon lisättävät kurssit. Oletukseltaan None.
+        """
+
+        catalog = {course.id: course for course in courses or []}
+
+        self.__courses: tuple[Course, ...] = tuple(
+            catalog[course_id] for course_id in sorted(catalog)
+        )
+        self.__indices: dict[int, int] = {
+            course.id: index for index, course in enumerate(self.__courses)
+        }
+        self.__missing: dict[int, tuple[int, ...]] = {}
+        self.__offsets: array = array("i", [0])
+        self.__targets: array = array("i")
+        self.__build_edges()
+        self.__timings: array = array(
+            "Q", (self.__get_timing(course) for course in self.__courses)
+        )
+        self.__in_degrees: array = array(
+            "i", (len(course.requirements) for course in self.__courses)
+        )
+        self.__heaps: tuple[tuple[tuple[int, int], ...], ...] = self.__get_heaps()
+
+    def __len__(self) -> int:
+        return len(self.__courses)
+
+    def __repr__(self) -> str:
+        return f"CourseGraph({list(self.__courses)})"
+
+    @property
+    def courses(self) -> tuple[Course, ...]:
+        return self.__courses
+
+    @property
+    def offsets(self) -> array:
+        return self.__offsets
+
+    @property
+    def targets(self) -> array:
+        return self.__targets
+
+    @property
+    def timings(self) -> array:
+        return self.__timings
+
+    @property
+    def in_degrees(self) -> array:
+        return self.__in_degrees
+
+    @property
+    def heaps(self) -> tuple[tuple[tuple[int, int], ...], ...]:
+        return self.__heaps
+
+    @property
+    def missing(self) -> dict[int, tuple[int, ...]]:
+        return self.__missing
+
+    def index(self, course_id: int) -> int | None:
+        """Palauttaa id:tä vastaavan kurssin indeksin.
+
+        Args:
+            course_id (int): Kurssin id.
+
+        Returns:
+            int | None: Kurssin indeksi tai None, jos kurssia ei ole verkossa.
+        """
+
+        return self.__indices.get(course_id)
+
+    def mask(self, course_ids: Iterable[int]) -> int:
+        """Palauttaa kurssien indeksit bittimaskina.
+
+        Args:
+            course_ids (Iterable[int]): Kurssien id:t. Verkosta puuttuvat id:t ohitetaan.
+
+        Returns:
+            int: Bittimaski, jossa bitti i vastaa indeksin i kurssia.
+        """
+
+        mask = 0
+
+        for course_id in course_ids:
+            index = self.__indices.get(course_id)
+
+            if index is not None:
+                mask |= 1 << index
+
+        return mask
+
+    def neighbors(self, index: int) -> array:
+        """Palauttaa kurssista suoraan riippuvien kurssien indeksit.
+
+        Args:
+            index (int): Kurssin indeksi.
+
+        Returns:
+            array: Riippuvien kurssien indeksit kasvavassa järjestyksessä.
+        """
+
+        return self.__targets[self.__offsets[index] : self.__offsets[index + 1]]
+
+    def dependents(self, course_id: int) -> Sequence[int]:
+        """Palauttaa id:tä esitietona vaativien kurssien indeksit.
+        Id voi olla verkon kurssi tai valikoimasta puuttuva esitietovaatimus.
+
+        Args:
+            course_id (int): Esitietokurssin id.
+
+        Returns:
+            Sequence[int]: Riippuvien kurssien indeksit kasvavassa järjestyksessä.
+        """
+
+        index = self.index(course_id)
+
+        if index is None:
+            return self.__missing.get(course_id, ())
+
+        return self.neighbors(index)
+
+    def periods(self, index: int) -> tuple[int, ...]:
+        """Palauttaa periodit, joilla kurssi on tarjolla.
+
+        Args:
+            index (int): Kurssin indeksi.
+
+        Returns:
+            tuple[int, ...]: Periodit kasvavassa järjestyksessä.
+        """
+
+        return get_periods(self.__timings[index])
+
+    def replace_course(self, course: Course) -> "CourseGraph":
+        """Palauttaa uuden verkon, johon kurssi on lisätty tai jossa se on korvattu.
+        Jos muiden kurssien indeksit eivät muutu (kurssi on jo verkossa tai sen id on suurin),
+        uusi verkko paikataan tästä verkosta. Muulloin verkko muodostetaan uudelleen.
+
+        Args:
+            course (Course): Lisättävä tai korvaava kurssi.
+
+        Returns:
+            CourseGraph: Uusi verkko.
+        """
+
+        index = self.index(course.id)
+
+        if index is None and self.__courses and course.id < self.__courses[-1].id:
+            return CourseGraph([*self.__courses, course])
+
+        graph = copy(self)
+        CourseGraph.__patch(graph, course, index)
+
+        return graph
+
+    def remove_course(self, course_id: int) -> "CourseGraph":
+        """Palauttaa uuden verkon, josta kurssi on poistettu.
+        Kurssista riippuvilta kursseilta poistetaan vastaava esitietovaatimus
+        samoin kuin tietokannassa, myös jos id on vain puuttuva esitietovaatimus.
+
+        Args:
+            course_id (int): Poistettavan kurssin id.
+
+        Returns:
+            CourseGraph: Uusi verkko.
+        """
+
+        index = self.index(course_id)
+        dependents = self.dependents(course_id)
+
+        if index is None and not dependents:
+            return self
+
+        courses = list(self.__courses)
+
+        for dependent in dependents:
+            course = courses[dependent]
+            courses[dependent] = Course(
+                course.name,
+                course.credits,
+                set(course.timing),
+                set(course.requirements - {course_id}),
+                course.id,
+            )
+
+        if index is not None:
+            del courses[index]
+
+        return CourseGraph(courses)
+
+    def __patch(self, course: Course, index: int | None) -> None:
+        """Lisää tai korvaa kurssin verkon kopiossa.
+        Kutsutaan vain replace_course-metodista, joten alkuperäistä verkkoa ei muuteta.
+        Kaarista lisätään ja poistetaan vain muuttuneet.
+
+        Args:
+            course (Course): Lisättävä tai korvaava kurssi.
+            index (int | None): Korvattavan kurssin indeksi tai None, jos kurssi on uusi.
+        """
+
+        self.__indices = self.__indices.copy()
+        self.__missing = self.__missing.copy()
+        self.__offsets = self.__offsets[:]
+        self.__targets = self.__targets[:]
+        self.__timings = self.__timings[:]
+        self.__in_degrees = self.__in_degrees[:]
+
+        if index is None:
+            index = self.__append(course)
+            old_requirements: frozenset[int] = frozenset()
+        else:
+            old_requirements = self.__courses[index].requirements
+            self.__courses = (
+                self.__courses[:index] + (course,) + self.__courses[index + 1 :]
+            )
+
+        for requirement_id in old_requirements - course.requirements:
+            self.__remove_edge(requirement_id, index)
+
+        for requirement_id in course.requirements - old_requirements:
+            self.__add_edge(requirement_id, index)
+
+        self.__update_heaps(course, index)
+
+    def __append(self, course: Course) -> int:
+        """Lisää paikattavan verkon loppuun uuden kurssin ilman esitietovaatimuksia.
+        Kurssia odottaneet puuttuvat esitietovaatimukset muutetaan kaariksi.
+
+        Args:
+            course (Course): Lisättävä kurssi.
+
+        Returns:
+            int: Kurssin indeksi.
+        """
+
+        index = len(self.__courses)
+
+        self.__courses += (course,)
+        self.__indices[course.id] = index
+        self.__targets.extend(self.__missing.pop(course.id, ()))
+        self.__offsets.append(len(self.__targets))
+        self.__timings.append(0)
+        self.__in_degrees.append(0)
+
+        return index
+
+    def __remove_edge(self, requirement_id: int, index: int) -> None:
+        """Poistaa paikattavasta verkosta kaaren esitietokurssista kurssiin.
+
+        Args:
+            requirement_id (int): Esitietokurssin id.
+            index (int): Kurssin indeksi.
+        """
+
+        source = self.__indices.get(requirement_id)
+
+        if source is None:
+            dependents = tuple(
+                item for item in self.__missing.pop(requirement_id) if item != index
+            )
+
+            if dependents:
+                self.__missing[requirement_id] = dependents
+
+            return
+
+        position = bisect_left(
+            self.__targets, index, self.__offsets[source], self.__offsets[source + 1]
+        )
+        del self.__targets[position]
+
+        for i in range(source + 1, len(self.__offsets)):
+            self.__offsets[i] -= 1
+
+    def __add_edge(self, requirement_id: int, index: int) -> None:
+        """Lisää paikattavaan verkkoon kaaren esitietokurssista kurssiin.
+
+        Args:
+            requirement_id (int): Esitietokurssin id.
+            index (int): Kurssin indeksi.
+        """
+
+        source = self.__indices.get(requirement_id)
+
+        if source is None:
+            dependents = list(self.__missing.get(requirement_id, ()))
+            insort(dependents, index)
+            self.__missing[requirement_id] = tuple(dependents)
+
+            return
+
+        position = bisect_left(
+            self.__targets, index, self.__offsets[source], self.__offsets[source + 1]
+        )
+        self.__targets.insert(position, index)
+
+        for i in range(source + 1, len(self.__offsets)):
+            self.__offsets[i] += 1
+
+    def __update_heaps(self, course: Course, index: int) -> None:
+        """Päivittää paikattavan verkon ajoituksen, in-degreen ja alkutilan keot.
+
+        Args:
+            course (Course): Kurssi muutoksen jälkeen.
+            index (int): Kurssin indeksi.
+        """
+
+        heaps = list(self.__heaps)
+
+        if self.__in_degrees[index] == 0:
+            for period in self.periods(index):
+                heap = [item for item in heaps[period] if item[1] != index]
+                heapify(heap)
+                heaps[period] = tuple(heap)
+
+        self.__timings[index] = self.__get_timing(course)
+        self.__in_degrees[index] = len(course.requirements)
+
+        if self.__in_degrees[index] == 0:
+            for period in self.periods(index):
+                heap = list(heaps[period])
+                heappush(heap, (course.credits, index))
+                heaps[period] = tuple(heap)
+
+        self.__heaps = tuple(heaps)
+
+    def __build_edges(self) -> None:
+        """Muodostaa CSR-muotoiset kaaret esitietokursseista niistä riippuviin kursseihin.
+        Kaaret kerätään ensin pareina, minkä jälkeen ne järjestetään lähtösolmun mukaan
+        laskemalla. Valikoimasta puuttuvat esitietovaatimukset kirjataan erikseen.
+        """
+
+        sources = array("i")
+        destinations = array("i")
+        missing: dict[int, list[int]] = {}
+
+        for index, course in enumerate(self.__courses):
+            for requirement_id in course.requirements:
+                requirement_index = self.__indices.get(requirement_id)
+
+                if requirement_index is None:
+                    missing.setdefault(requirement_id, []).append(index)
+                else:
+                    sources.append(requirement_index)
+                    destinations.append(index)
+
+        offsets = array("i", [0]) * (len(self.__courses) + 1)
+
+        for source in sources:
+            offsets[source + 1] += 1
+
+        for i in range(len(self.__courses)):
+            offsets[i + 1] += offsets[i]
+
+        targets = array("i", [0]) * len(sources)
+        positions = offsets[:-1]
+
+        for source, destination in zip(sources, destinations):
+            targets[positions[source]] = destination
+            positions[source] += 1
+
+        self.__offsets = offsets
+        self.__targets = targets
+        self.__missing = {
+            requirement_id: tuple(dependents)
+            for requirement_id, dependents in missing.items()
+        }
+
+    def __get_timing(self, course: Course) -> int:
+        """Muuntaa kurssin ajoituksen bittimaskiksi.
+
+        Args:
+            course (Course): Kurssi.
+
+        Returns:
+            int: Bittimaski, jossa bitti p vastaa periodia p.
+        """
+
+        return sum(
+            1 << period for period in course.timing if 0 < period <= PERIODS_PER_YEAR
+        )
+
+    def __get_heaps(self) -> tuple[tuple[tuple[int, int], ...], ...]:
+        """Muodostaa alkutilan keot kursseista, joilla ei ole esitietovaatimuksia.
+
+        Returns:
+            tuple[tuple[tuple[int, int], ...], ...]: Keot periodeittain.
+        """
+
+        heaps: list[list[tuple[int, int]]] = [[] for _ in range(PERIODS_PER_YEAR + 1)]
+
+        for index, course in enumerate(self.__courses):
+            if self.__in_degrees[index] == 0:
+                for period in self.periods(index):
+                    heaps[period].append((course.credits, index))
+
+        for heap in heaps:
+            heapify(heap)
+
+        return tuple(tuple(heap) for heap in heaps)
@@ -0,0 +1,205 @@
+from array import array
+
+from config import PERIODS_PER_YEAR
+from entities.course_graph import CourseGraph
+
+
+class CourseMetrics:
+    """Luokka, joka kuvaa kurssien riippuvuusverkosta esilaskettuja tunnuslukuja.
+
+    Tunnusluvut lasketaan yhdellä topologisella läpikäynnillä,
+    ja ne on tarkoitettu aikataulutuksen priorisointiin ja alarajoihin.
+    Taulukot ovat CourseGraph-luokan indeksijärjestyksessä.
+
+    Attributes:
+        graph (CourseGraph): Verkko, josta tunnusluvut on laskettu.
+        order (array): Kurssien indeksit topologisessa järjestyksessä.
+        heights (array): Pisimmän kurssista alkavan riippuvuusketjun kaarien määrä.
+        dependent_counts (array): Kurssista suoraan tai välillisesti riippuvien kurssien määrä.
+    """
+
+    def __init__(self, graph: CourseGraph) -> None:
+        """Luokan konstruktori.
+
+        Args:
+            graph (CourseGraph): Kurssien verkko.
+
+        Raises:
+            ValueError: Verkossa on sykli.
+        """
+
+        self.graph: CourseGraph = graph
+        self.order: array = self.__get_order()
+        self.heights: array = array("i", [0]) * len(graph)
+        self.dependent_counts: array = array("i", [0]) * len(graph)
+        self.__earliest: dict[int, array] = {}
+
+        self.__count_dependents()
+
+    def __count_dependents(self) -> None:
+        """Laskee ketjujen pituudet ja riippuvien kurssien määrät
+        käänteisessä topologisessa järjestyksessä.
+        Riippuvat kurssit kootaan bittimaskeiksi, mutta maski vapautetaan heti,
+        kun kaikki sitä tarvitsevat esitietokurssit on käsitelty,
+        joten kaikkia maskeja ei pidetä muistissa yhtä aikaa.
+        """
+
+        graph = self.graph
+        dependents = [0] * len(graph)
+        remaining = array("i", [0]) * len(graph)
+
+        for target in graph.targets:
+            remaining[target] += 1
+
+        for index in reversed(self.order):
+            mask = 0
+
+            for neighbor in graph.neighbors(index):
+                mask |= dependents[neighbor] | 1 << neighbor
+                self.heights[index] = max(
+                    self.heights[index], self.heights[neighbor] + 1
+                )
+
+                remaining[neighbor] -= 1
+
+                if remaining[neighbor] == 0:
+                    dependents[neighbor] = 0
+
+            self.dependent_counts[index] = mask.bit_count()
+
+            if remaining[index] > 0:
+                dependents[index] = mask
+
+    def height(self, course_id: int) -> int:
+        """Palauttaa pisimmän kurssista alkavan riippuvuusketjun pituuden.
+
+        Args:
+            course_id (int): Kurssin id.
+
+        Returns:
+            int: Ketjun kaarien määrä tai -1, jos kurssia ei ole.
+        """
+
+        index = self.graph.index(course_id)
+
+        return -1 if index is None else self.heights[index]
+
+    def dependent_count(self, course_id: int) -> int:
+        """Palauttaa kurssista suoraan tai välillisesti riippuvien kurssien määrän.
+
+        Args:
+            course_id (int): Kurssin id.
+
+        Returns:
+            int: Riippuvien kurssien määrä tai -1, jos kurssia ei ole.
+        """
+
+        index = self.graph.index(course_id)
+
+        return -1 if index is None else self.dependent_counts[index]
+
+    def earliest_period(self, course_id: int, starting_period: int) -> int:
+        """Palauttaa aikaisimman periodin, jolle kurssin voi aikatauluttaa.
+
+        Args:
+            course_id (int): Kurssin id.
+            starting_period (int): Aloitusperiodi.
+
+        Returns:
+            int:
+                Kuluneiden periodien määrä aloitusperiodista alkaen
+                tai -1, jos kurssia ei ole tai sitä ei voi aikatauluttaa.
+        """
+
+        index = self.graph.index(course_id)
+
+        return -1 if index is None else self.earliest(starting_period)[index]
+
+    def earliest(self, starting_period: int) -> array:
+        """Palauttaa kaikkien kurssien aikaisimmat periodit.
+        Opintopisterajaa ei huomioida, ja kurssi voi olla samassa periodissa
+        kuin sen esitietokurssi. Tulos lasketaan kerran aloitusperiodia kohden.
+
+        Args:
+            starting_period (int): Aloitusperiodi.
+
+        Returns:
+            array:
+                Kuluneiden periodien määrät aloitusperiodista alkaen indeksijärjestyksessä.
+                Arvo on -1, jos kurssilla ei ole kelvollista ajoitusta
+                tai sen esitietoja ei voi täyttää.
+        """
+
+        if starting_period not in self.__earliest:
+            self.__earliest[starting_period] = self.__get_earliest(starting_period)
+
+        return self.__earliest[starting_period]
+
+    def __get_order(self) -> array:
+        """Muodostaa topologisen järjestyksen Kahnin algoritmilla.
+        Valikoimasta puuttuvat esitietovaatimukset eivät vaikuta järjestykseen.
+
+        Raises:
+            ValueError: Verkossa on sykli.
+
+        Returns:
+            array: Kurssien indeksit topologisessa järjestyksessä.
+        """
+
+        in_degrees = array("i", [0]) * len(self.graph)
+
+        for target in self.graph.targets:
+            in_degrees[target] += 1
+
+        order = array("i", (i for i, degree in enumerate(in_degrees) if degree == 0))
+        position = 0
+
+        while position < len(order):
+            for neighbor in self.graph.neighbors(order[position]):
+                in_degrees[neighbor] -= 1
+
+                if in_degrees[neighbor] == 0:
+                    order.append(neighbor)
+
+            position += 1
+
+        if len(order) < len(self.graph):
+            raise ValueError("Kurssit ovat keskenään riippuvia.")
+
+        return order
+
+    def __get_earliest(self, starting_period: int) -> array:
+        """Laskee kurssien aikaisimmat periodit topologisessa järjestyksessä.
+
+        Args:
+            starting_period (int): Aloitusperiodi.
+
+        Returns:
+            array: Kuluneiden periodien määrät indeksijärjestyksessä.
+        """
+
+        earliest = array("i", [0]) * len(self.graph)
+
+        for dependents in self.graph.missing.values():
+            for index in dependents:
+                earliest[index] = -1
+
+        for index in self.order:
+            timing = self.graph.periods(index)
+
+            if earliest[index] == -1 or not timing:
+                earliest[index] = -1
+            else:
+                start = earliest[index]
+                period = (starting_period - 1 + start) % PERIODS_PER_YEAR + 1
+                earliest[index] = start + min(
+                    (item - period) % PERIODS_PER_YEAR for item in timing
+                )
+
+            for neighbor in self.graph.neighbors(index):
+                if earliest[index] == -1 or earliest[neighbor] == -1:
+                    earliest[neighbor] = -1
+                else:
+                    earliest[neighbor] = max(earliest[neighbor], earliest[index])
+
+        return earliest
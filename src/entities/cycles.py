@@ -0,0 +1,72 @@
+from entities.course_graph import CourseGraph
+
+
+def find_cycle(graph: CourseGraph) -> list[int]:
+    """Etsii verkosta syklin iteratiivisella syvyyshaulla.
+    Haku aloitetaan jokaisesta käsittelemättömästä solmusta,
+    joten myös erilliset komponentit tarkistetaan.
+
+    Args:
+        graph (CourseGraph): Tarkistettava verkko.
+
+    Returns:
+        list[int]:
+            Syklin solmujen indeksit kaarien suunnassa tai tyhjä lista, jos sykliä ei ole.
+    """
+
+    # 0: käsittelemätön, 1: käsittelyssä, 2: käsitelty
+    states = bytearray(len(graph))
+
+    for root in range(len(graph)):
+        if states[root] == 0:
+            cycle = find_cycle_from(graph, root, states)
+
+            if cycle:
+                return cycle
+
+    return []
+
+
+def find_cycle_from(graph: CourseGraph, root: int, states: bytearray) -> list[int]:
+    """Etsii sykliä syvyyshaulla annetusta solmusta alkaen.
+    Pinossa on jokaiselle solmulle seuraavan käsiteltävän kaaren kohta targets-taulukossa.
+
+    Args:
+        graph (CourseGraph): Tarkistettava verkko.
+        root (int): Solmu, josta haku aloitetaan.
+        states (bytearray): Solmujen tilat, päivitetään haun aikana.
+
+    Returns:
+        list[int]:
+            Syklin solmujen indeksit kaarien suunnassa tai tyhjä lista, jos sykliä ei löydy.
+    """
+
+    offsets = graph.offsets
+    targets = graph.targets
+
+    states[root] = 1
+    nodes = [root]
+    edges = [offsets[root]]
+
+    while nodes:
+        node = nodes[-1]
+        edge = edges[-1]
+
+        if edge == offsets[node + 1]:
+            states[node] = 2
+            nodes.pop()
+            edges.pop()
+            continue
+
+        edges[-1] = edge + 1
+        neighbor = targets[edge]
+
+        if states[neighbor] == 1:
+            return nodes[nodes.index(neighbor) :]
+
+        if states[neighbor] == 0:
+            states[neighbor] = 1
+            nodes.append(neighbor)
+            edges.append(offsets[neighbor])
+
+    return []
@@ -0,0 +1,120 @@
+from collections import deque
+from enum import Enum
+from typing import NamedTuple
+
+from config import PERIODS_PER_YEAR
+from entities.course_graph import CourseGraph
+
+
+class UnschedulableReason(Enum):
+    """Syy, jonka vuoksi kurssia ei voi aikatauluttaa tai sen ajoitus on virheellinen."""
+
+    TIMING = "ei ajoitusta lukuvuoden periodeilla"
+    INVALID_PERIODS = "osa ajoituksen periodeista ei ole lukuvuoden periodeja"
+    MISSING_REQUIREMENTS = "esitietoja puuttuu valikoimasta"
+    UNSCHEDULABLE_REQUIREMENTS = "esitietoja ei voi aikatauluttaa"
+
+
+class UnschedulableCourse(NamedTuple):
+    """Kurssi, jota ei voi aikatauluttaa tai jonka ajoituksesta osa jätetään huomiotta.
+
+    Attributes:
+        course_id (int): Kurssin id.
+        reason (UnschedulableReason): Syy.
+        details (tuple[int, ...]):
+            Ajoituksen virheelliset periodit, puuttuvien esitietojen id:t
+            tai aikataulutuskelvottomien suorien esitietojen id:t syyn mukaan.
+    """
+
+    course_id: int
+    reason: UnschedulableReason
+    details: tuple[int, ...]
+
+    def __str__(self) -> str:
+        details = ", ".join(str(item) for item in self.details)
+
+        return f"{self.course_id}: {self.reason.value}" + (
+            f" ({details})" if details else ""
+        )
+
+
+def find_unschedulable(graph: CourseGraph) -> list[UnschedulableCourse]:
+    """Etsii kurssit, joita ei voi aikatauluttaa, yhdellä lineaarisella läpikäynnillä.
+    Kurssia ei voi aikatauluttaa, jos sillä ei ole yhtään periodia väliltä
+    1..PERIODS_PER_YEAR, jos jokin sen esitiedoista puuttuu valikoimasta
+    tai jos se riippuu suoraan tai välillisesti tällaisesta kurssista.
+    Myös kurssit, joiden ajoituksessa on välin ulkopuolisia periodeja,
+    ilmoitetaan, vaikka ne aikataulutetaan välin sisäisille periodeille.
+    Syklejä ei tarkisteta.
+
+    Args:
+        graph (CourseGraph): Kurssien verkko.
+
+    Returns:
+        list[UnschedulableCourse]: Kurssit verkon indeksijärjestyksessä.
+    """
+
+    reasons: list[UnschedulableReason | None] = [None] * len(graph)
+    details: list[list[int]] = [[] for _ in range(len(graph))]
+    queue = deque()
+
+    for missing_id, dependents in graph.missing.items():
+        for index in dependents:
+            reasons[index] = UnschedulableReason.MISSING_REQUIREMENTS
+            details[index].append(missing_id)
+
+    for index, timing in enumerate(graph.timings):
+        invalid_periods = _get_invalid_periods(graph, index, timing)
+
+        if reasons[index] is None and (timing == 0 or invalid_periods):
+            reasons[index] = (
+                UnschedulableReason.TIMING
+                if timing == 0
+                else UnschedulableReason.INVALID_PERIODS
+            )
+            details[index] = invalid_periods
+
+        if reasons[index] not in (None, UnschedulableReason.INVALID_PERIODS):
+            queue.append(index)
+
+    while queue:
+        index = queue.popleft()
+
+        for neighbor in graph.neighbors(index):
+            if reasons[neighbor] in (None, UnschedulableReason.INVALID_PERIODS):
+                reasons[neighbor] = UnschedulableReason.UNSCHEDULABLE_REQUIREMENTS
+                details[neighbor] = []
+                queue.append(neighbor)
+
+            if reasons[neighbor] is UnschedulableReason.UNSCHEDULABLE_REQUIREMENTS:
+                details[neighbor].append(graph.courses[index].id)
+
+    return [
+        UnschedulableCourse(
+            graph.courses[index].id, reason, tuple(sorted(details[index]))
+        )
+        for index, reason in enumerate(reasons)
+        if reason is not None
+    ]
+
+
+def _get_invalid_periods(graph: CourseGraph, index: int, timing: int) -> list[int]:
+    """Palauttaa kurssin ajoituksen periodit, jotka eivät ole väliltä 1..PERIODS_PER_YEAR.
+    Verkon ajoituksessa ovat vain välin sisäiset periodit, joten kurssin periodit
+    käydään läpi vain, jos niitä on enemmän kuin verkon ajoituksessa.
+
+    Args:
+        graph (CourseGraph): Kurssien verkko.
+        index (int): Kurssin indeksi.
+        timing (int): Kurssin ajoitus verkossa bittimaskina.
+
+    Returns:
+        list[int]: Virheelliset periodit kasvavassa järjestyksessä.
+    """
+
+    periods = graph.courses[index].timing
+
+    if timing.bit_count() == len(periods):
+        return []
+
+    return sorted(period for period in periods if not 1 <= period <= PERIODS_PER_YEAR)
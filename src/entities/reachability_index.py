@@ -0,0 +1,381 @@
+from collections import deque
+from collections.abc import Callable, Iterable
+
+from entities.course import Course
+
+
+class ReachabilityIndex:
+    """Luokka, joka kuvaa kurssien välillisten esitietosuhteiden hakemistoa.
+
+    Jokaisella kurssilla on bittipaikka, ja kurssin kaikki välilliset esitiedot sekä kaikki
+    siitä riippuvat kurssit tallennetaan bittimaskeina. Kysely on siten yksi bittitesti
+    tai maskin läpikäynti. Muutoksen jälkeen lasketaan uudelleen vain kurssit,
+    joiden maskit voivat muuttua. Valikoimasta puuttuvat esitietovaatimukset
+    otetaan huomioon, kun puuttuva kurssi lisätään.
+    """
+
+    def __init__(self, courses: Iterable[Course] | None = None) -> None:
+        """Luokan konstruktori.
+
+        Args:
+            courses (Iterable[Course] | None, optional):
+                Hakemistoon lisättävät kurssit. Oletukseltaan None.
+        """
+
+        self.__slots: dict[int, int] = {}
+        self.__ids: list[int] = []
+        self.__free: list[int] = []
+        self.__requirements: dict[int, frozenset[int]] = {}
+        self.__dependents: dict[int, set[int]] = {}
+        self.__ancestors: dict[int, int] = {}
+        self.__descendants: dict[int, int] = {}
+
+        for course in courses or []:
+            self.__insert(course)
+
+        self.__propagate_ancestors(set(self.__slots))
+        self.__propagate_descendants(set(self.__slots))
+
+    def __contains__(self, course_id: int) -> bool:
+        return course_id in self.__slots
+
+    def __len__(self) -> int:
+        return len(self.__slots)
+
+    def add_course(self, course: Course) -> None:
+        """Lisää kurssin tai korvaa saman id:n kurssin.
+
+        Args:
+            course (Course): Lisättävä tai muokattu kurssi.
+        """
+
+        course_id = course.id
+        affected = self.__ancestors.get(course_id, 0)
+
+        if course_id in self.__slots:
+            self.__remove_edges(course_id)
+
+        self.__insert(course)
+
+        self.__propagate_ancestors(self.__get_reachable_from(course_id))
+        affected |= self.__ancestors[course_id] | self.__get_bit(course_id)
+        self.__propagate_descendants(self.__to_ids(affected))
+
+    def remove_course(self, course_id: int) -> None:
+        """Poistaa kurssin ja siihen viittaavat esitietovaatimukset.
+
+        Args:
+            course_id (int): Poistettavan kurssin id.
+        """
+
+        if course_id not in self.__slots:
+            return
+
+        descendants = self.__get_reachable_from(course_id) - {course_id}
+        ancestors = self.__to_ids(self.__ancestors[course_id])
+
+        for dependent in self.__dependents.pop(course_id, set()):
+            self.__requirements[dependent] -= {course_id}
+
+        self.__remove_edges(course_id)
+        slot = self.__slots.pop(course_id)
+        self.__ids[slot] = -1
+        self.__free.append(slot)
+
+        del self.__requirements[course_id]
+        del self.__ancestors[course_id]
+        del self.__descendants[course_id]
+
+        self.__propagate_ancestors(descendants)
+        self.__propagate_descendants(ancestors - {course_id})
+
+    def ancestors(self, course_id: int) -> set[int]:
+        """Palauttaa kurssin välilliset esitiedot.
+
+        Args:
+            course_id (int): Kurssin id.
+
+        Returns:
+            set[int]: Valikoiman kurssit, jotka kurssi vaatii suoraan tai välillisesti.
+        """
+
+        return self.__to_ids(self.__ancestors.get(course_id, 0))
+
+    def descendants(self, course_id: int) -> set[int]:
+        """Palauttaa kurssista riippuvat kurssit.
+
+        Args:
+            course_id (int): Kurssin id.
+
+        Returns:
+            set[int]: Kurssit, jotka vaativat kurssin suoraan tai välillisesti.
+        """
+
+        return self.__to_ids(self.__descendants.get(course_id, 0))
+
+    def requires(self, course_id: int, requirement_id: int) -> bool:
+        """Tarkistaa, vaatiiko kurssi toisen kurssin suoraan tai välillisesti.
+
+        Args:
+            course_id (int): Kurssin id.
+            requirement_id (int): Mahdollisen esitietokurssin id.
+
+        Returns:
+            bool: True, jos kurssi vaatii esitietokurssin. Muulloin False.
+        """
+
+        return bool(self.__ancestors.get(course_id, 0) & self.__get_bit(requirement_id))
+
+    def creates_cycle(self, course_id: int, requirement_id: int) -> bool:
+        """Tarkistaa, muodostaisiko esitietovaatimuksen lisääminen syklin.
+
+        Args:
+            course_id (int): Kurssin id.
+            requirement_id (int): Lisättävän esitietokurssin id.
+
+        Returns:
+            bool: True, jos esitietokurssi on kurssi itse tai riippuu kurssista.
+        """
+
+        dependents = self.__descendants.get(course_id, 0)
+
+        return course_id == requirement_id or bool(
+            dependents & self.__get_bit(requirement_id)
+        )
+
+    def get_valid_requirements(self, course_id: int) -> set[int]:
+        """Palauttaa kurssit, jotka voi lisätä kurssin esitiedoiksi muodostamatta sykliä.
+
+        Args:
+            course_id (int): Kurssin id. Uudelle kurssille kaikki kurssit kelpaavat.
+
+        Returns:
+            set[int]: Kelvollisten esitietokurssien id:t.
+        """
+
+        mask = self.__descendants.get(course_id, 0) | self.__get_bit(course_id)
+
+        return self.__to_ids((1 << len(self.__ids)) - 1 & ~mask) - {-1}
+
+    def __insert(self, course: Course) -> None:
+        """Lisää kurssin bittipaikan ja kaaret laskematta maskeja.
+
+        Args:
+            course (Course): Lisättävä kurssi.
+        """
+
+        course_id = course.id
+
+        if course_id not in self.__slots:
+            if self.__free:
+                slot = self.__free.pop()
+                self.__ids[slot] = course_id
+            else:
+                slot = len(self.__ids)
+                self.__ids.append(course_id)
+
+            self.__slots[course_id] = slot
+            self.__ancestors[course_id] = 0
+            self.__descendants[course_id] = 0
+
+        self.__requirements[course_id] = course.requirements
+
+        for requirement_id in course.requirements:
+            self.__dependents.setdefault(requirement_id, set()).add(course_id)
+
+    def __remove_edges(self, course_id: int) -> None:
+        """Poistaa kurssin esitietovaatimuskaaret.
+
+        Args:
+            course_id (int): Kurssin id.
+        """
+
+        for requirement_id in self.__requirements[course_id]:
+            dependents = self.__dependents[requirement_id]
+            dependents.discard(course_id)
+
+            if not dependents:
+                del self.__dependents[requirement_id]
+
+        self.__requirements[course_id] = frozenset()
+
+    def __get_bit(self, course_id: int) -> int:
+        """Palauttaa kurssin bittipaikkaa vastaavan maskin.
+
+        Args:
+            course_id (int): Kurssin id.
+
+        Returns:
+            int: Maski, jossa on vain kurssin bitti, tai 0, jos kurssia ei ole.
+        """
+
+        slot = self.__slots.get(course_id)
+
+        return 0 if slot is None else 1 << slot
+
+    def __to_ids(self, mask: int) -> set[int]:
+        """Muuntaa maskin kurssien id:iksi.
+
+        Args:
+            mask (int): Bittimaski.
+
+        Returns:
+            set[int]: Maskin bittejä vastaavat id:t.
+        """
+
+        # Merkkijonon haku käy bitit läpi C-tasolla, joten harvakin maski puretaan nopeasti.
+        bits = bin(mask)[:1:-1]
+        course_ids = set()
+        slot = bits.find("1")
+
+        while slot != -1:
+            course_ids.add(self.__ids[slot])
+            slot = bits.find("1", slot + 1)
+
+        return course_ids
+
+    def __get_reachable_from(self, course_id: int) -> set[int]:
+        """Palauttaa kurssin ja kurssit, jotka riippuvat siitä nykyisten kaarien mukaan.
+        Suorien riippuvien kurssien maskit ovat voimassa, joten syvyyshakua ei tarvita.
+
+        Args:
+            course_id (int): Kurssin id.
+
+        Returns:
+            set[int]: Kurssit, joiden esitietomaskit voivat muuttua kurssin muuttuessa.
+        """
+
+        mask = 0
+
+        for dependent in self.__dependents.get(course_id, ()):
+            mask |= self.__descendants[dependent] | self.__get_bit(dependent)
+
+        return self.__to_ids(mask) | {course_id}
+
+    def __propagate_ancestors(self, affected: set[int]) -> None:
+        """Laskee esitietomaskit uudelleen annetuille kursseille.
+
+        Args:
+            affected (set[int]): Kurssit, joiden maskit voivat olla vanhentuneita.
+        """
+
+        self.__propagate(
+            affected,
+            self.__ancestors,
+            self.__requirements.__getitem__,
+            self.__get_dependents,
+        )
+
+    def __propagate_descendants(self, affected: set[int]) -> None:
+        """Laskee riippuvien kurssien maskit uudelleen annetuille kursseille.
+
+        Args:
+            affected (set[int]): Kurssit, joiden maskit voivat olla vanhentuneita.
+        """
+
+        self.__propagate(
+            affected,
+            self.__descendants,
+            self.__get_dependents,
+            self.__requirements.__getitem__,
+        )
+
+    def __get_dependents(self, course_id: int) -> set[int]:
+        """Palauttaa kurssit, jotka vaativat kurssin suoraan.
+
+        Args:
+            course_id (int): Kurssin id.
+
+        Returns:
+            set[int]: Suoraan riippuvien kurssien id:t.
+        """
+
+        return self.__dependents.get(course_id, set())
+
+    def __propagate(
+        self,
+        affected: set[int],
+        masks: dict[int, int],
+        sources: Callable[[int], Iterable[int]],
+        targets: Callable[[int], Iterable[int]],
+    ) -> None:
+        """Nollaa kurssien maskit ja laskee ne uudelleen kiintopisteeseen asti.
+        Muiden kurssien maskit ovat voimassa, joten nollista alkava kasvava laskenta
+        tuottaa täsmälleen saavutettavat kurssit myös syklien kanssa. Kurssit käsitellään
+        Kahnin algoritmin mukaisessa järjestyksessä, joten syklittömässä verkossa
+        jokainen kurssi lasketaan kerran.
+
+        Args:
+            affected (set[int]): Uudelleen laskettavat kurssit.
+            masks (dict[int, int]): Päivitettävät maskit.
+            sources (Callable[[int], Iterable[int]]): Kurssit, joista maski kootaan.
+            targets (Callable[[int], Iterable[int]]): Kurssit, joiden maski riippuu kurssista.
+        """
+
+        affected = {course_id for course_id in affected if course_id in self.__slots}
+        queue = deque(self.__get_order(affected, sources, targets))
+        queued = set(affected)
+
+        for course_id in affected:
+            masks[course_id] = 0
+
+        while queue:
+            course_id = queue.popleft()
+            queued.discard(course_id)
+            mask = 0
+
+            for source in sources(course_id):
+                if source in self.__slots:
+                    mask |= masks[source] | 1 << self.__slots[source]
+
+            if mask == masks[course_id]:
+                continue
+
+            masks[course_id] = mask
+
+            for target in targets(course_id):
+                if target in affected and target not in queued:
+                    queued.add(target)
+                    queue.append(target)
+
+    def __get_order(
+        self,
+        affected: set[int],
+        sources: Callable[[int], Iterable[int]],
+        targets: Callable[[int], Iterable[int]],
+    ) -> list[int]:
+        """Järjestää kurssit Kahnin algoritmilla niin, että lähteet käsitellään ensin.
+        Sykleissä olevat kurssit lisätään loppuun.
+
+        Args:
+            affected (set[int]): Järjestettävät kurssit.
+            sources (Callable[[int], Iterable[int]]): Kurssit, joista maski kootaan.
+            targets (Callable[[int], Iterable[int]]): Kurssit, joiden maski riippuu kurssista.
+
+        Returns:
+            list[int]: Kurssit käsittelyjärjestyksessä.
+        """
+
+        in_degrees = {
+            course_id: sum(source in affected for source in sources(course_id))
+            for course_id in affected
+        }
+        order = [course_id for course_id, degree in in_degrees.items() if degree == 0]
+        position = 0
+
+        while position < len(order):
+            for target in targets(order[position]):
+                if target not in in_degrees:
+                    continue
+
+                in_degrees[target] -= 1
+
+                if in_degrees[target] == 0:
+                    order.append(target)
+
+            position += 1
+
+        if len(order) < len(affected):
+            order.extend(affected.difference(order))
+
+        return order
@@ -0,0 +1,45 @@
+from array import array
+
+from entities.course import Course
+from entities.course_graph import CourseGraph
+
+
+class ScheduleState:
+    """Luokka, joka kuvaa yhden aikataulutusajon muuttuvaa tilaa.
+
+    Tila kopioidaan muuttumattomasta verkosta taulukkokopioina,
+    joten samaa verkkoa voidaan aikatauluttaa toistuvasti ja rinnakkain.
+
+    Attributes:
+        graph (CourseGraph): Aikataulutettava verkko.
+        starting_period (int): Aloitusperiodi.
+        max_credits (int): Opintopisteyläraja periodille.
+        in_degrees (array): Kurssien täyttämättömien esitietovaatimusten määrät.
+        heaps (list[list[tuple[int, int]]]): Periodikohtaiset keot.
+        periods (list[int]): Järjestetty lista periodeista, joiden keko ei ole tyhjä.
+        positions (array):
+            Kurssien periodilaskurit aikataulussa indeksin mukaan, -1 jos kurssia ei ole lisätty.
+        schedule (dict[int, list[Course]]): Aikataulu ilman tyhjiä periodeja.
+    """
+
+    def __init__(
+        self, graph: CourseGraph, starting_period: int, max_credits: int
+    ) -> None:
+        """Luokan konstruktori.
+
+        Args:
+            graph (CourseGraph): Aikataulutettava verkko.
+            starting_period (int): Aloitusperiodi.
+            max_credits (int): Opintopisteyläraja periodille.
+        """
+
+        self.graph: CourseGraph = graph
+        self.starting_period: int = starting_period
+        self.max_credits: int = max_credits
+        self.in_degrees: array = graph.in_degrees[:]
+        self.heaps: list[list[tuple[int, int]]] = [list(heap) for heap in graph.heaps]
+        self.periods: list[int] = [
+            period for period, heap in enumerate(self.heaps) if heap
+        ]
+        self.positions: array = array("i", [-1]) * len(graph)
+        self.schedule: dict[int, list[Course]] = {}
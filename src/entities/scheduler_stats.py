@@ -0,0 +1,42 @@
+class SchedulerStats:
+    """Luokka, joka kuvaa yhden aikataulutusajon tunnuslukuja.
+
+    Keko-operaatioiden määrät johdetaan ajon jälkeen aikataulusta ja periodikohtaisista
+    tiedoista, joten mittaus ei lisää työtä kurssikohtaiseen silmukkaan.
+
+    Attributes:
+        pushes (int): Kekoihin lisättyjen alkioiden määrä alkutila mukaan lukien.
+        pops (int): Keoista poistettujen alkioiden määrä.
+        stale_pops (int): Poistot, joiden kurssi oli jo lisätty aikatauluun toiselta keolta.
+        repushes (int): Kekoon palautetut kurssit, jotka eivät mahtuneet opintopisterajaan.
+        skipped_periods (int): Periodit, joiden yli periodilaskuri hyppäsi käsittelemättä.
+        graph_time (float): Verkon muodostamiseen kulunut aika sekunteina.
+        validation_time (float): Verkon tarkistukseen kulunut aika sekunteina.
+        loop_time (float): Aikataulutussilmukassa kulunut aika sekunteina.
+    """
+
+    def __init__(self, graph_time: float = 0.0, validation_time: float = 0.0) -> None:
+        """Luokan konstruktori.
+
+        Args:
+            graph_time (float, optional): Verkon muodostamiseen kulunut aika. Oletukseltaan 0.
+            validation_time (float, optional):
+                Verkon tarkistukseen kulunut aika. Oletukseltaan 0.
+        """
+
+        self.pushes: int = 0
+        self.pops: int = 0
+        self.stale_pops: int = 0
+        self.repushes: int = 0
+        self.skipped_periods: int = 0
+        self.graph_time: float = graph_time
+        self.validation_time: float = validation_time
+        self.loop_time: float = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"SchedulerStats(pushes={self.pushes}, pops={self.pops}, "
+            f"stale_pops={self.stale_pops}, repushes={self.repushes}, "
+            f"skipped_periods={self.skipped_periods}, graph_time={self.graph_time:.6f}, "
+            f"validation_time={self.validation_time:.6f}, loop_time={self.loop_time:.6f})"
+        )
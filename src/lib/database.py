@@ -1,31 +1,254 @@
+import atexit
 import os
+from collections.abc import Callable
 from sqlite3 import Connection, Cursor, OperationalError, Row, connect
+from threading import Event, Lock, Thread
 
-from config import DATABASE_FILE_PATH
+from config import (
+    DATABASE_CACHE_SIZE,
+    DATABASE_FILE_PATH,
+    DATABASE_IN_MEMORY,
+    DATABASE_JOURNAL_MODE,
+    DATABASE_MMAP_SIZE,
+    DATABASE_SNAPSHOT_INTERVAL,
+    DATABASE_STATEMENT_CACHE_SIZE,
+    DATABASE_SYNCHRONOUS,
+    DATABASE_TEMP_STORE,
+)
+from lib.migrations import MIGRATIONS
 
 
 class Database:
     """Luokka, joka vastaa tietokantayhteydestä.
 
+    Yhteys avataan vasta ensimmäisellä käyttökerralla, joten olion luominen
+    ei koske tietokantatiedostoon.
+
+    Muistinvaraisessa tilassa tietokanta luetaan tiedostosta muistiin yhteyttä avattaessa,
+    ja sen vahvistettu tila kirjoitetaan tiedostoon SQLiten varmuuskopiointirajapinnalla
+    pyydettäessä, ajastetusti sekä yhteyttä suljettaessa ja ohjelman päättyessä.
+
     Attributes:
+        path (str): Tietokantatiedoston polku tai ":memory:".
+        in_memory (bool): Pidetäänkö tietokanta muistissa ja tallennetaan vain tilannekuvina.
+        snapshot_interval (float):
+            Tilannekuvien väli sekunteina muistinvaraisessa tilassa. Nolla poistaa ajastuksen.
         connection (Connection): Tietokantayhteys.
         cursor (Cursor): Tietokantaosoitin.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        path: str = DATABASE_FILE_PATH,
+        in_memory: bool = DATABASE_IN_MEMORY,
+        snapshot_interval: float = DATABASE_SNAPSHOT_INTERVAL,
+    ) -> None:
+        """Luokan konstruktori.
+
+        Args:
+            path (str, optional):
+                Tietokantatiedoston polku. Oletukseltaan konfiguraation DATABASE_FILE_PATH.
+            in_memory (bool, optional):
+                Pidetäänkö tietokanta muistissa. Oletukseltaan konfiguraation DATABASE_IN_MEMORY.
+            snapshot_interval (float, optional):
+                Tilannekuvien väli sekunteina.
+                Oletukseltaan konfiguraation DATABASE_SNAPSHOT_INTERVAL.
+        """
+
+        self.path: str = path
+        self.in_memory: bool = in_memory and path != ":memory:"
+        self.snapshot_interval: float = snapshot_interval
+        self.__connection: Connection | None = None
+        self.__cursor: Cursor | None = None
+        self.__stopped: Event = Event()
+        self.__lock: Lock = Lock()
+
+    @property
+    def connection(self) -> Connection:
+        if self.__connection is None:
+            self.__connect()
+
+        return self.__connection  # type: ignore
+
+    @property
+    def cursor(self) -> Cursor:
+        if self.__cursor is None:
+            self.__connect()
+
+        return self.__cursor  # type: ignore
+
+    @property
+    def connected(self) -> bool:
+        return self.__connection is not None
+
+    def __connect(self) -> None:
+        """Avaa yhteyden, asettaa sen asetukset ja alustaa tai päivittää tietokannan.
+        Muistinvaraisessa tilassa tietokanta luetaan ensin tiedostosta muistiin.
+
+        Raises:
+            IOError: Tietokantatiedostoon ei ole oikeuksia tai tietokanta on sovellusta uudempi.
+        """
+
         try:
-            self.connection: Connection = connect(DATABASE_FILE_PATH)
-            self.connection.row_factory = Row
+            self.__open()
+            self.__cursor = self.__connection.cursor()  # type: ignore
 
-            self.cursor: Cursor = self.connection.cursor()
+            self.configure()
+
+            if self.__is_empty():
+                self.initialize()
+            else:
+                self.migrate()
         except OperationalError as error:
+            self.__disconnect()
             raise IOError("Ei ole oikeutta tietokantatiedostoon.") from error
+        except Exception:
+            self.__disconnect()
+            raise
+
+        if self.in_memory:
+            self.__start_snapshots()
+
+    def __open(self) -> None:
+        """Avaa yhteyden tiedostoon tai muistissa olevaan tietokantaan.
+        Muistissa olevaan tietokantaan luetaan tiedoston sisältö, jos tiedosto on olemassa.
+        """
+
+        if self.in_memory:
+            # Tilannekuvat otetaan taustasäikeessä samalla yhteydellä.
+            self.__connection = connect(
+                ":memory:",
+                cached_statements=DATABASE_STATEMENT_CACHE_SIZE,
+                check_same_thread=False,
+            )
+            self.__load()
+        else:
+            self.__connection = connect(
+                self.path, cached_statements=DATABASE_STATEMENT_CACHE_SIZE
+            )
+
+        self.__connection.row_factory = Row
+
+    def __load(self) -> None:
+        """Lukee tietokantatiedoston muistissa olevaan tietokantaan."""
+
+        if not os.path.exists(self.path):
+            return
+
+        source = connect(self.path)
+
+        try:
+            source.backup(self.__connection)  # type: ignore
+        finally:
+            source.close()
+
+    def __is_empty(self) -> bool:
+        """Tarkistaa, onko tietokanta tyhjä eli pitääkö se alustaa.
+
+        Returns:
+            bool: True, jos tietokannassa ei ole tauluja. Muulloin False.
+        """
+
+        return self.cursor.execute("SELECT 1 FROM sqlite_master").fetchone() is None
+
+    def snapshot(self) -> None:
+        """Kirjoittaa muistissa olevan tietokannan vahvistetun tilan tiedostoon.
+        Tiedostoon kirjoitetaan yhdessä transaktiossa, joten se on aina eheä.
+        Tiedostotilassa tai ennen yhteyden avaamista ei tehdä mitään.
+
+        Raises:
+            IOError: Tietokannassa on keskeneräinen transaktio tai tiedostoon ei voi kirjoittaa.
+        """
+
+        with self.__lock:
+            if not self.in_memory or self.__connection is None:
+                return
+
+            if self.__connection.in_transaction:
+                raise IOError("Tietokannassa on keskeneräinen transaktio.")
 
-        if os.path.getsize(DATABASE_FILE_PATH) == 0:
-            self.initialize()
+            target = None
+
+            try:
+                target = connect(self.path)
+                self.__connection.backup(target)
+            except OperationalError as error:
+                raise IOError("Tietokantatiedostoon ei voi kirjoittaa.") from error
+            finally:
+                if target is not None:
+                    target.close()
+
+    def __start_snapshots(self) -> None:
+        """Käynnistää ajastetut tilannekuvat ja tilannekuvan ohjelman päättyessä."""
+
+        self.__stopped = Event()
+
+        if self.snapshot_interval > 0:
+            Thread(target=self.__take_snapshots, daemon=True).start()
+
+        atexit.register(self.close)
+
+    def __take_snapshots(self) -> None:
+        """Ottaa tilannekuvia väliajoin, kunnes yhteys suljetaan.
+        Epäonnistunut tilannekuva yritetään uudelleen seuraavalla kerralla.
+        """
+
+        stopped = self.__stopped
+
+        while not stopped.wait(self.snapshot_interval):
+            try:
+                self.snapshot()
+            except IOError:
+                pass
+
+    def close(self) -> None:
+        """Sulkee yhteyden, jos se on auki. Seuraava käyttökerta avaa uuden yhteyden.
+        Muistinvaraisessa tilassa vahvistettu tila kirjoitetaan ensin tiedostoon
+        ja keskeneräinen transaktio perutaan.
+
+        Raises:
+            IOError: Tiedostoon ei voi kirjoittaa.
+        """
+
+        try:
+            if self.in_memory and self.__connection is not None:
+                self.__stopped.set()
+                atexit.unregister(self.close)
+                self.__connection.rollback()
+                self.snapshot()
+        finally:
+            self.__disconnect()
+
+    def __disconnect(self) -> None:
+        """Sulkee yhteyden kirjoittamatta tilannekuvaa."""
+
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+
+            self.__connection = None
+            self.__cursor = None
+
+    @property
+    def version(self) -> int:
+        return self.cursor.execute("PRAGMA user_version").fetchone()[0]
+
+    def configure(self) -> None:
+        """Ottaa viiteavaimet käyttöön ja asettaa suorituskykyasetukset konfiguraation mukaan.
+        Oletukset sopivat sovelluksen kuormaan, jossa tuonti kirjoittaa paljon kerralla
+        ja aikataulutus lukee koko valikoiman: WAL-loki ja synchronous=NORMAL vähentävät
+        levyn synkronointeja, ja välimuisti sekä muistikartoitus nopeuttavat lukemista.
+        """
+
+        self.cursor.execute("PRAGMA foreign_keys = ON")
+        self.cursor.execute(f"PRAGMA journal_mode = {DATABASE_JOURNAL_MODE}")
+        self.cursor.execute(f"PRAGMA synchronous = {DATABASE_SYNCHRONOUS}")
+        self.cursor.execute(f"PRAGMA cache_size = {DATABASE_CACHE_SIZE}")
+        self.cursor.execute(f"PRAGMA mmap_size = {DATABASE_MMAP_SIZE}")
+        self.cursor.execute(f"PRAGMA temp_store = {DATABASE_TEMP_STORE}")
 
     def create_tables(self) -> None:
-        """Luo tietokantaan taulut."""
+        """Luo tietokantaan taulut skeeman versiossa 0."""
 
         self.cursor.execute(
             """
@@ -63,16 +286,58 @@ class Database:
         """Tyhjentää tietokannan."""
 
         self.cursor.execute("DROP TABLE IF EXISTS Requirements")
-        self.cursor.execute("DROP TABLE IF EXISTS Courses")
         self.cursor.execute("DROP TABLE IF EXISTS Periods")
+        self.cursor.execute("DROP TABLE IF EXISTS Courses")
+        self.cursor.execute("PRAGMA user_version = 0")
 
         self.connection.commit()
 
+    def migrate(self) -> None:
+        """Päivittää tietokannan skeeman uusimpaan versioon.
+        Jokainen muutos ajetaan omassa transaktiossa yhdessä versionumeron päivityksen kanssa,
+        joten keskeytynyt päivitys jatkuu seuraavalla kerralla viimeisestä onnistuneesta versiosta.
+
+        Raises:
+            IOError: Tietokanta on sovellusta uudempi.
+        """
+
+        version = self.version
+
+        if version > len(MIGRATIONS):
+            raise IOError("Tietokanta on luotu sovelluksen uudemmalla versiolla.")
+
+        for number, statements in enumerate(MIGRATIONS[version:], version + 1):
+            try:
+                self.cursor.execute("BEGIN")
+
+                for statement in statements:
+                    self.__execute(statement)
+
+                self.cursor.execute(f"PRAGMA user_version = {number}")
+            except Exception:
+                self.connection.rollback()
+                raise
+
+            self.connection.commit()
+
+    def __execute(self, statement: str | Callable[[Cursor], None]) -> None:
+        """Suorittaa skeeman muutoksen SQL-lauseen tai funktion.
+
+        Args:
+            statement (str | Callable[[Cursor], None]): SQL-lause tai funktio.
+        """
+
+        if callable(statement):
+            statement(self.cursor)
+        else:
+            self.cursor.execute(statement)
+
     def initialize(self) -> None:
         """Alustaa tietokannan."""
 
         self.drop_tables()
         self.create_tables()
+        self.migrate()
 
 
 database = Database()
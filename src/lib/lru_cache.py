@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, NamedTuple, TypeVar
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+ValueT = TypeVar("ValueT")
+
+
+class CacheInfo(NamedTuple):
+    """Välimuistin tilastot.
+
+    Attributes:
+        hits (int): Osumien määrä.
+        misses (int): Ohiosumien määrä.
+        maxsize (int): Välimuistin enimmäiskoko.
+        currsize (int): Välimuistin nykyinen koko.
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache(Generic[KeyT, ValueT]):
+    """Kokorajoitettu välimuisti, joka poistaa pisimpään käyttämättä olleen alkion."""
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """Luokan konstruktori.
+
+        Args:
+            maxsize (int, optional):
+                Välimuistin enimmäiskoko. Nolla poistaa välimuistin käytöstä.
+                Oletukseltaan 128.
+
+        Raises:
+            ValueError: Enimmäiskoko on negatiivinen.
+        """
+
+        if maxsize < 0:
+            raise ValueError("Välimuistin koko ei voi olla negatiivinen.")
+
+        self.__maxsize: int = maxsize
+        self.__items: OrderedDict[KeyT, ValueT] = OrderedDict()
+        self.__hits: int = 0
+        self.__misses: int = 0
+
+    def __contains__(self, key: KeyT) -> bool:
+        return key in self.__items
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def get(self, key: KeyT) -> ValueT | None:
+        """Palauttaa avainta vastaavan arvon ja merkitsee sen viimeksi käytetyksi.
+
+        Args:
+            key (KeyT): Haettava avain.
+
+        Returns:
+            ValueT | None: Avainta vastaava arvo tai None, jos avainta ei löydy.
+        """
+
+        if key not in self.__items:
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+        self.__items.move_to_end(key)
+
+        return self.__items[key]
+
+    def put(self, key: KeyT, value: ValueT) -> None:
+        """Tallentaa arvon välimuistiin. Poistaa tarvittaessa vanhimman alkion.
+
+        Args:
+            key (KeyT): Tallennettavan arvon avain.
+            value (ValueT): Tallennettava arvo.
+        """
+
+        if self.__maxsize == 0:
+            return
+
+        self.__items[key] = value
+        self.__items.move_to_end(key)
+
+        if len(self.__items) > self.__maxsize:
+            self.__items.popitem(last=False)
+
+    def discard(self, key: KeyT) -> None:
+        """Poistaa avaimen välimuistista, jos se on siellä.
+
+        Args:
+            key (KeyT): Poistettava avain.
+        """
+
+        self.__items.pop(key, None)
+
+    def clear(self) -> None:
+        """Tyhjentää välimuistin. Tilastoja ei nollata."""
+
+        self.__items.clear()
+
+    def info(self) -> CacheInfo:
+        """Palauttaa välimuistin tilastot.
+
+        Returns:
+            CacheInfo: Osumat, ohiosumat, enimmäiskoko ja nykyinen koko.
+        """
+
+        return CacheInfo(self.__hits, self.__misses, self.__maxsize, len(self.__items))
@@ -0,0 +1,106 @@
+from collections.abc import Callable
+from sqlite3 import Cursor
+
+from lib.packing import pack_requirements
+
+
+def pack_course_requirements(cursor: Cursor) -> None:
+    """Kirjoittaa Requirements-taulun rivit kurssien requirements-sarakkeeseen pakattuina.
+
+    Args:
+        cursor (Cursor): Tietokantaosoitin.
+    """
+
+    requirements: dict[int, set[int]] = {}
+
+    for course_id, requirement_id in cursor.execute(
+        "SELECT course_id, requirement_id FROM Requirements"
+    ).fetchall():
+        requirements.setdefault(course_id, set()).add(requirement_id)
+
+    cursor.executemany(
+        "UPDATE Courses SET requirements=? WHERE id=?",
+        [
+            (pack_requirements(frozenset(requirement_ids)), course_id)
+            for course_id, requirement_ids in requirements.items()
+        ],
+    )
+
+
+# Tietokannan skeeman muutokset järjestyksessä. Versio n saadaan ajamalla n ensimmäistä
+# muutosta Database.create_tables-metodin luomalle skeemalle. Muutos on SQL-lause tai
+# funktio, joka saa tietokantaosoittimen. Versio tallennetaan tietokantaan
+# PRAGMA user_version -arvona, joten jo julkaistuja muutoksia ei saa muokata.
+MIGRATIONS: list[tuple[str | Callable[[Cursor], None], ...]] = [
+    # 1: Esitietovaatimusten haku ja poisto esitietokurssin perusteella.
+    # Taulujen UNIQUE-rajoitteet kattavat jo haut course_id:n perusteella.
+    (
+        """
+        CREATE INDEX IF NOT EXISTS Requirements_requirement_id
+        ON Requirements (requirement_id, course_id)
+        """,
+    ),
+    # 2: Kurssin omat rivit poistuvat kurssin mukana viiteavainten kautta, ja esitietovaatimukset
+    # poistettuun kurssiin poistuvat liipaisimella. Esitietokurssi voi puuttua valikoimasta,
+    # joten requirement_id ei ole viiteavain. Orvot rivit jätetään pois.
+    (
+        """
+        CREATE TABLE Requirements_new (
+            course_id INTEGER REFERENCES Courses ON DELETE CASCADE,
+            requirement_id INTEGER,
+            UNIQUE(course_id, requirement_id)
+        )
+        """,
+        """
+        INSERT INTO Requirements_new (course_id, requirement_id)
+        SELECT course_id, requirement_id FROM Requirements
+        WHERE course_id IN (SELECT id FROM Courses)
+        """,
+        "DROP TABLE Requirements",
+        "ALTER TABLE Requirements_new RENAME TO Requirements",
+        """
+        CREATE INDEX Requirements_requirement_id
+        ON Requirements (requirement_id, course_id)
+        """,
+        """
+        CREATE TABLE Periods_new (
+            course_id INTEGER REFERENCES Courses ON DELETE CASCADE,
+            period INTEGER,
+            UNIQUE(course_id, period)
+        )
+        """,
+        """
+        INSERT INTO Periods_new (course_id, period)
+        SELECT course_id, period FROM Periods
+        WHERE course_id IN (SELECT id FROM Courses)
+        """,
+        "DROP TABLE Periods",
+        "ALTER TABLE Periods_new RENAME TO Periods",
+        """
+        CREATE TRIGGER Courses_delete_requirements AFTER DELETE ON Courses
+        BEGIN
+            DELETE FROM Requirements WHERE requirement_id = OLD.id;
+        END
+        """,
+    ),
+    # 3: Ajoitus tallennetaan kurssin riville bittimaskina, jossa bitti p vastaa periodia p,
+    # ja esitietovaatimukset 32-bittisinä little-endian-kokonaislukuina BLOB-sarakkeessa.
+    # Koko valikoima luetaan yhdellä kyselyllä ilman liitoksia. Periodit väliltä
+    # 0..MAX_PERIOD mahtuvat maskiin, ja muita ei voi aikatauluttaa, joten ne jätetään pois.
+    # Pakatut sarakkeet korvaavat Periods- ja Requirements-taulut kokonaan. Kurssiin viittaavat
+    # kurssit haetaan CourseRepository-luokan muistissa pitämästä käänteisestä hakemistosta.
+    (
+        "ALTER TABLE Courses ADD COLUMN timing INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE Courses ADD COLUMN requirements BLOB NOT NULL DEFAULT x''",
+        """
+        UPDATE Courses SET timing = (
+            SELECT coalesce(sum(1 << period), 0) FROM Periods
+            WHERE course_id = Courses.id AND period BETWEEN 0 AND 62
+        )
+        """,
+        pack_course_requirements,
+        "DROP TRIGGER Courses_delete_requirements",
+        "DROP TABLE Requirements",
+        "DROP TABLE Periods",
+    ),
+]
@@ -0,0 +1,92 @@
+import sys
+from array import array
+from functools import cache
+
+# Suurin periodi, jonka bitti mahtuu SQLiten etumerkilliseen 64-bittiseen kokonaislukuun.
+MAX_PERIOD = 62
+
+
+def pack_timing(timing: frozenset[int]) -> int:
+    """Muuntaa ajoituksen bittimaskiksi, jossa bitti p vastaa periodia p.
+
+    Args:
+        timing (frozenset[int]): Kurssin perioditarjonta.
+
+    Raises:
+        ValueError: Periodi ei ole väliltä 0..MAX_PERIOD, joten se ei mahdu
+            SQLiten 64-bittiseen kokonaislukuun.
+
+    Returns:
+        int: Ajoitus bittimaskina.
+    """
+
+    mask = 0
+
+    for period in timing:
+        if not 0 <= period <= MAX_PERIOD:
+            raise ValueError(f"Periodi {period} ei mahdu ajoituksen bittimaskiin.")
+
+        mask |= 1 << period
+
+    return mask
+
+
+@cache
+def unpack_timing(mask: int) -> frozenset[int]:
+    """Muuntaa bittimaskin ajoitukseksi.
+    Erilaisia ajoituksia on vähän, joten tulokset tallennetaan.
+
+    Args:
+        mask (int): Ajoitus bittimaskina, jossa bitti p vastaa periodia p.
+
+    Returns:
+        frozenset[int]: Kurssin perioditarjonta.
+    """
+
+    return frozenset(
+        period for period in range(mask.bit_length()) if mask >> period & 1
+    )
+
+
+def pack_requirements(requirements: frozenset[int]) -> bytes:
+    """Pakkaa esitietovaatimukset 32-bittisiksi little-endian-kokonaisluvuiksi
+    kasvavassa järjestyksessä.
+
+    Args:
+        requirements (frozenset[int]): Esitietokurssien id:t.
+
+    Raises:
+        ValueError: Id ei mahdu 32-bittiseen kokonaislukuun.
+
+    Returns:
+        bytes: Pakatut id:t.
+    """
+
+    try:
+        packed = array("i", sorted(requirements))
+    except OverflowError as error:
+        raise ValueError("Esitietokurssin id ei mahdu 32 bittiin.") from error
+
+    if sys.byteorder == "big":
+        packed.byteswap()
+
+    return packed.tobytes()
+
+
+def unpack_requirements(blob: bytes) -> array:
+    """Purkaa pakatut esitietovaatimukset.
+
+    Args:
+        blob (bytes): Funktion pack_requirements pakkaamat id:t.
+
+    Returns:
+        array: Esitietokurssien id:t kasvavassa järjestyksessä.
+    """
+
+    unpacked = array("i")
+    unpacked.frombytes(blob)
+
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+
+    return unpacked
@@ -1,118 +1,568 @@
-from sqlite3 import Connection, Cursor
+from bisect import bisect_left
+from collections.abc import Iterable
+from sqlite3 import Cursor, IntegrityError
 
+from config import COURSE_CACHE_SIZE
 from entities.course import Course
+from entities.reachability_index import ReachabilityIndex
 from lib.database import Database
 from lib.database import database as default_database
+from lib.lru_cache import CacheInfo, LRUCache
+from lib.packing import (
+    pack_requirements,
+    pack_timing,
+    unpack_requirements,
+    unpack_timing,
+)
 
 
 class CourseRepository:
-    """Kurssien tietokantaoperaatioista vastaava luokka."""
+    """Kurssien tietokantaoperaatioista vastaava luokka.
+
+    Luetut kurssit säilytetään kokorajoitetussa välimuistissa id:n mukaan,
+    ja koko valikoima säilytetään, jos se mahtuu välimuistiin.
+    Kaikki muutokset kulkevat luokan kautta, joten välimuisti päivitetään
+    muutoksen yhteydessä vain muuttuneiden kurssien osalta.
+    Kurssin ajoitus ja esitietovaatimukset tallennetaan vain kurssin riville pakattuina,
+    joten kurssi luetaan yhtenä rivinä. Kurssiin viittaavat kurssit haetaan
+    muistissa pidettävästä käänteisestä hakemistosta, joka muodostetaan
+    ensimmäisellä käyttökerralla yhdellä kyselyllä ja päivitetään muutosten yhteydessä.
+    Hakumetodit palauttavat samat kurssioliot, joita ei saa muokata.
+
+    Attributes:
+        fingerprint (int):
+            Kurssivalikoiman sisällöstä laskettu tunniste.
+            Lasketaan ensimmäisellä käyttökerralla ja päivitetään jokaisen muutoksen yhteydessä,
+            joten sama sisältö tuottaa aina saman tunnisteen.
+        reachability (ReachabilityIndex):
+            Kurssien välillisten esitietosuhteiden hakemisto.
+            Muodostetaan ensimmäisellä käyttökerralla ja päivitetään jokaisen muutoksen yhteydessä.
+    """
+
+    __UPSERT = """
+        INSERT INTO Courses (id, name, credits, timing, requirements)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET
+            name=excluded.name,
+            credits=excluded.credits,
+            timing=excluded.timing,
+            requirements=excluded.requirements
+        """
 
-    def __init__(self, database: Database = default_database) -> None:
+    def __init__(
+        self,
+        database: Database = default_database,
+        cache_size: int = COURSE_CACHE_SIZE,
+    ) -> None:
         """Luokan konstruktori.
 
         Args:
             database (Database): Tietokanta.
+            cache_size (int, optional):
+                Välimuistissa säilytettävien kurssien enimmäismäärä.
+                Nolla poistaa välimuistin käytöstä. Oletukseltaan COURSE_CACHE_SIZE.
         """
 
-        self.__connection: Connection = database.connection
-        self.__cursor: Cursor = database.cursor
+        self.__database: Database = database
+        self.__fingerprint: int | None = None
+        self.__reachability: ReachabilityIndex | None = None
+        self.__cache_size: int = cache_size
+        self.__courses: LRUCache[int, Course] = LRUCache(cache_size)
+        self.__all_courses: list[Course] | None = None
+        self.__dependents: dict[int, set[int]] | None = None
+
+    @property
+    def fingerprint(self) -> int:
+        if self.__fingerprint is None:
+            fingerprint = 0
+
+            for course in self.find_all():
+                fingerprint ^= self.__hash_course(course)
+
+            self.__fingerprint = fingerprint
+
+        return self.__fingerprint
 
-    def create(self, course: Course) -> None:
-        """Tallentaa kurssin tietokantaan tai muokkaa jo olevaa.
-        Voi muokata annetun kurssin id:n.
+    @property
+    def reachability(self) -> ReachabilityIndex:
+        if self.__reachability is None:
+            self.__reachability = ReachabilityIndex(self.find_all())
+
+        return self.__reachability
+
+    def create(self, course: Course) -> Course:
+        """Tallentaa kurssin tietokantaan tai muokkaa jo olevaa yhdessä transaktiossa.
+        Jo olevan kurssin rivi päivitetään paikallaan yhdellä lauseella.
 
         Args:
             course (Course): Tallennettava tai muokattava kurssi.
+
+        Raises:
+            ValueError: Periodi tai esitietokurssin id ei mahdu pakattuun muotoon.
+
+        Returns:
+            Course: Tallennettu kurssi. Uudella kurssilla on tietokannan antama id.
+        """
+
+        old_course = self.find_by_id(course.id) if course.id != -1 else None
+        row = self.__pack(course)
+        cursor = self.__database.connection.cursor()
+
+        try:
+            course_id = self.__insert_rows(cursor, [row])[0]
+        except Exception:
+            self.__database.connection.rollback()
+            raise
+
+        self.__database.connection.commit()
+
+        if course.id != course_id:
+            course = course.with_id(course_id)
+
+        self.__update_fingerprint(old_course, course)
+        self.__update_cache(course.id, course)
+        self.__update_dependents(course.id, old_course, course)
+
+        if self.__reachability is not None:
+            self.__reachability.add_course(course)
+
+        return course
+
+    def create_all(self, courses: Iterable[Course]) -> list[Course]:
+        """Tallentaa kurssit tietokantaan tai muokkaa jo olevia yhdessä transaktiossa.
+        Joko kaikki kurssit tallennetaan tai virheen sattuessa ei mitään.
+
+        Args:
+            courses (Iterable[Course]): Tallennettavat tai muokattavat kurssit.
+
+        Raises:
+            sqlite3.IntegrityError: Samaa id:tä on annettu useasti.
+            ValueError: Periodi tai esitietokurssin id ei mahdu pakattuun muotoon.
+
+        Returns:
+            list[Course]: Tallennetut kurssit samassa järjestyksessä tietokannan id:illä.
+        """
+
+        return self.__write_all(list(courses), False)
+
+    def replace_all(self, courses: Iterable[Course]) -> list[Course]:
+        """Korvaa kaikki kurssit annetuilla kursseilla yhdessä transaktiossa.
+        Virheen sattuessa tietokanta jää ennalleen.
+
+        Args:
+            courses (Iterable[Course]): Uudet kurssit.
+
+        Raises:
+            sqlite3.IntegrityError: Samaa id:tä on annettu useasti.
+            ValueError: Periodi tai esitietokurssin id ei mahdu pakattuun muotoon.
+
+        Returns:
+            list[Course]: Tallennetut kurssit samassa järjestyksessä tietokannan id:illä.
+        """
+
+        return self.__write_all(list(courses), True)
+
+    def __write_all(self, courses: list[Course], replace: bool) -> list[Course]:
+        """Kirjoittaa kurssien rivit executemany-kutsulla yhdessä transaktiossa.
+
+        Args:
+            courses (list[Course]): Tallennettavat kurssit.
+            replace (bool): Poistetaanko kaikki jo olevat kurssit ensin.
+
+        Returns:
+            list[Course]: Tallennetut kurssit tietokannan id:illä.
+        """
+
+        course_ids = [course.id for course in courses if course.id != -1]
+
+        if len(set(course_ids)) < len(course_ids):
+            raise IntegrityError("Sama id on annettu useasti.")
+
+        rows = [self.__pack(course) for course in courses]
+        cursor = self.__database.connection.cursor()
+
+        try:
+            if replace:
+                cursor.execute("DELETE FROM Courses")
+
+            new_ids = self.__insert_rows(cursor, rows)
+        except Exception:
+            self.__database.connection.rollback()
+            raise
+
+        self.__database.connection.commit()
+        self.__invalidate()
+
+        return [
+            course if course.id == course_id else course.with_id(course_id)
+            for course, course_id in zip(courses, new_ids)
+        ]
+
+    def __invalidate(self) -> None:
+        """Hylkää valikoiman tunnisteen, hakemistot ja välimuistin.
+        Ne muodostetaan uudelleen seuraavalla käyttökerralla.
+        """
+
+        self.__fingerprint = None
+        self.__reachability = None
+        self.__courses.clear()
+        self.__all_courses = None
+        self.__dependents = None
+
+    def __insert_rows(
+        self, cursor: Cursor, rows: list[tuple[int, str, int, int, bytes]]
+    ) -> list[int]:
+        """Lisää kurssien rivit vahvistamatta muutosta.
+
+        Args:
+            cursor (Cursor): Tietokantaosoitin.
+            rows (list[tuple[int, str, int, int, bytes]]): Lisättävien kurssien pakatut rivit.
+
+        Returns:
+            list[int]: Kurssien id:t samassa järjestyksessä.
+        """
+
+        cursor.executemany(self.__UPSERT, [row for row in rows if row[0] != -1])
+        new_ids = []
+
+        for row in rows:
+            if row[0] == -1:
+                cursor.execute(
+                    """
+                    INSERT INTO Courses (name, credits, timing, requirements)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    row[1:],
+                )
+
+            new_ids.append(cursor.lastrowid if row[0] == -1 else row[0])
+
+        return new_ids
+
+    def __pack(self, course: Course) -> tuple[int, str, int, int, bytes]:
+        """Muuntaa kurssin tietokannan riviksi.
+
+        Args:
+            course (Course): Kurssi.
+
+        Raises:
+            ValueError: Periodi tai esitietokurssin id ei mahdu pakattuun muotoon.
+
+        Returns:
+            tuple[int, str, int, int, bytes]:
+                Id, nimi, opintopisteet, ajoitus bittimaskina ja pakatut esitietovaatimukset.
+        """
+
+        return (
+            course.id,
+            course.name,
+            course.credits,
+            pack_timing(course.timing),
+            pack_requirements(course.requirements),
+        )
+
+    def __unpack(
+        self, course_id: int, name: str, course_credits: int, timing: int, blob: bytes
+    ) -> Course:
+        """Muodostaa kurssin tietokannan rivistä.
+
+        Args:
+            course_id (int): Kurssin id.
+            name (str): Kurssin nimi.
+            course_credits (int): Kurssin opintopistemäärä.
+            timing (int): Ajoitus bittimaskina.
+            blob (bytes): Pakatut esitietovaatimukset.
+
+        Returns:
+            Course: Kurssi.
         """
 
-        self.__cursor = self.__connection.cursor()
+        return Course(
+            name,
+            course_credits,
+            set(unpack_timing(timing)),
+            set(unpack_requirements(blob)),
+            course_id,
+        )
+
+    def delete(self, course_id: int) -> None:
+        """Poistaa id:tä vastaavan kurssin yhdessä transaktiossa.
+        Poistaa myös muiden kurssien esitietovaatimukset, jotka viittaavat kurssiin,
+        vaikka kurssia ei olisi valikoimassa.
+
+        Args:
+            course_id (int): Kurssin id.
+        """
 
-        if course.id == -1:
-            self.__cursor.execute(
-                "INSERT INTO Courses (name, credits) VALUES (?, ?)",
-                (course.name, course.credits),
+        old_courses = self.__find_affected(course_id)
+        new_courses = [
+            Course(
+                old_course.name,
+                old_course.credits,
+                set(old_course.timing),
+                set(old_course.requirements - {course_id}),
+                old_course.id,
             )
+            for old_course in old_courses
+            if old_course.id != course_id
+        ]
+        cursor = self.__database.connection.cursor()
+
+        try:
+            cursor.execute("DELETE FROM Courses WHERE id=?", (course_id,))
+            cursor.executemany(
+                "UPDATE Courses SET requirements=? WHERE id=?",
+                [
+                    (pack_requirements(course.requirements), course.id)
+                    for course in new_courses
+                ],
+            )
+        except Exception:
+            self.__database.connection.rollback()
+            raise
+
+        self.__database.connection.commit()
+        new_courses_by_id = {course.id: course for course in new_courses}
 
-            if self.__cursor.lastrowid:
-                course.id = self.__cursor.lastrowid
+        for old_course in old_courses:
+            new_course = new_courses_by_id.get(old_course.id)
+            self.__update_fingerprint(old_course, new_course)
+            self.__update_cache(old_course.id, new_course)
+            self.__update_dependents(old_course.id, old_course, new_course)
+
+        if self.__dependents is not None:
+            self.__dependents.pop(course_id, None)
+
+        if self.__reachability is not None:
+            self.__reachability.remove_course(course_id)
+
+    def __update_cache(self, course_id: int, course: Course | None) -> None:
+        """Päivittää kurssin välimuistiin.
+
+        Args:
+            course_id (int): Muuttuneen kurssin id.
+            course (Course | None): Kurssi muutoksen jälkeen tai None, jos kurssi poistettiin.
+        """
 
+        if course is None:
+            self.__courses.discard(course_id)
+        else:
+            self.__courses.put(course_id, course)
+
+        if self.__all_courses is None:
+            return
+
+        courses = self.__all_courses
+        index = bisect_left(courses, course_id, key=lambda course: course.id)
+        exists = index < len(courses) and courses[index].id == course_id
+
+        if course is None:
+            if exists:
+                del courses[index]
+        elif exists:
+            courses[index] = course
+        elif len(courses) < self.__cache_size:
+            courses.insert(index, course)
         else:
-            if self.find_by_id(course.id):
-                self.delete(course.id)
+            self.__all_courses = None
+
+    def delete_subtree(self, course_id: int) -> list[int]:
+        """Poistaa kurssin ja kaikki siitä suoraan tai välillisesti riippuvat kurssit
+        yhdessä transaktiossa. Haara etsitään käänteisestä hakemistosta.
+        Kaikki poistettuihin kursseihin viittaavat kurssit poistuvat samalla,
+        joten muiden kurssien esitietovaatimuksia ei tarvitse päivittää.
+
+        Args:
+            course_id (int): Poistettavan haaran juurikurssin id.
 
-            self.__cursor.execute(
-                "INSERT INTO Courses (id, name, credits) VALUES (?, ?, ?)",
-                (course.id, course.name, course.credits),
+        Returns:
+            list[int]: Poistettujen kurssien id:t nousevassa järjestyksessä.
+        """
+
+        courses = [
+            course
+            for course in map(self.find_by_id, sorted(self.__find_subtree(course_id)))
+            if course is not None
+        ]
+        cursor = self.__database.connection.cursor()
+
+        try:
+            cursor.executemany(
+                "DELETE FROM Courses WHERE id=?", [(course.id,) for course in courses]
             )
+        except Exception:
+            self.__database.connection.rollback()
+            raise
+
+        self.__database.connection.commit()
 
-        self.__connection.commit()
+        for course in courses:
+            self.__update_fingerprint(course, None)
+            self.__update_cache(course.id, None)
+            self.__update_dependents(course.id, course, None)
 
-        self.__write_timing(course)
-        self.__write_requirements(course)
+            if self.__reachability is not None:
+                self.__reachability.remove_course(course.id)
 
-    def __write_timing(self, course: Course) -> None:
-        """Tallentaa kurssin ajoituksen tietokantaan.
+        if self.__dependents is not None:
+            self.__dependents.pop(course_id, None)
+
+        return [course.id for course in courses]
+
+    def __find_subtree(self, course_id: int) -> set[int]:
+        """Palauttaa kurssin ja kaikki siitä suoraan tai välillisesti riippuvat kurssit.
 
         Args:
-            course (Course): Kurssi, jonka ajoitus tallennetaan.
+            course_id (int): Haaran juurikurssin id. Kurssin ei tarvitse olla valikoimassa.
+
+        Returns:
+            set[int]: Haaran kurssien id:t.
         """
 
-        cursor = self.__connection.cursor()
+        dependents = self.__get_dependents()
+        subtree = {course_id}
+        stack = [course_id]
 
-        for period in course.timing:
-            cursor.execute(
-                "INSERT INTO Periods (course_id, period) VALUES (?, ?)",
-                (course.id, period),
-            )
+        while stack:
+            for dependent_id in dependents.get(stack.pop(), ()):
+                if dependent_id not in subtree:
+                    subtree.add(dependent_id)
+                    stack.append(dependent_id)
 
-        self.__connection.commit()
+        return subtree
 
-    def __write_requirements(self, course: Course) -> None:
-        """Tallentaa kurssin esitietovaatimukset tietokantaan.
+    def __find_affected(self, course_id: int) -> list[Course]:
+        """Palauttaa kurssin ja kurssit, jotka vaativat sen esitietona.
 
         Args:
-            course (Course): Kurssi, jonka esitietovaatimukset tallennetaan.
+            course_id (int): Kurssin id.
+
+        Returns:
+            list[Course]: Kurssit, joihin kurssin poistaminen vaikuttaa.
+        """
+
+        course_ids = {course_id} | self.__get_dependents().get(course_id, set())
+        courses = [self.find_by_id(affected_id) for affected_id in course_ids]
+
+        return [course for course in courses if course is not None]
+
+    def __get_dependents(self) -> dict[int, set[int]]:
+        """Palauttaa käänteisen hakemiston esitietokurssien id:istä niitä vaativiin kursseihin.
+        Hakemisto muodostetaan ensimmäisellä käyttökerralla välimuistissa olevasta
+        valikoimasta tai yhdellä kyselyllä, joka lukee vain pakatut esitietovaatimukset.
+
+        Returns:
+            dict[int, set[int]]: Esitietokurssien id:t ja niitä suoraan vaativien kurssien id:t.
+                Esitietokurssin ei tarvitse olla valikoimassa.
         """
 
-        cursor = self.__connection.cursor()
+        if self.__dependents is not None:
+            return self.__dependents
 
-        for requirement_id in course.requirements:
-            cursor.execute(
-                "INSERT INTO Requirements (course_id, requirement_id) VALUES (?, ?)",
-                (course.id, requirement_id),
+        if self.__all_courses is not None:
+            rows = ((course.id, course.requirements) for course in self.__all_courses)
+        else:
+            cursor = self.__database.connection.cursor()
+            cursor.row_factory = None
+            rows = (
+                (dependent_id, unpack_requirements(blob))
+                for dependent_id, blob in cursor.execute(
+                    "SELECT id, requirements FROM Courses WHERE requirements != x''"
+                )
             )
 
-        self.__connection.commit()
+        dependents: dict[int, set[int]] = {}
 
-    def delete(self, course_id: int) -> None:
-        """Poistaa id:tä vastaavan kurssin.
+        for dependent_id, requirements in rows:
+            for requirement_id in requirements:
+                dependents.setdefault(requirement_id, set()).add(dependent_id)
+
+        self.__dependents = dependents
+
+        return dependents
+
+    def __update_dependents(
+        self, course_id: int, old_course: Course | None, new_course: Course | None
+    ) -> None:
+        """Päivittää käänteisen hakemiston kurssin esitietovaatimusten muuttuessa,
+        jos hakemisto on jo muodostettu.
 
         Args:
-            course_id (int): Kurssin id.
+            course_id (int): Muuttuneen kurssin id.
+            old_course (Course | None): Kurssi ennen muutosta tai None, jos kurssi on uusi.
+            new_course (Course | None): Kurssi muutoksen jälkeen tai None, jos kurssi poistettiin.
         """
 
-        cursor = self.__connection.cursor()
+        dependents = self.__dependents
 
-        cursor.execute("DELETE FROM Courses WHERE id=?", (course_id,))
-        cursor.execute("DELETE FROM Periods WHERE course_id=?", (course_id,))
-        cursor.execute(
-            "DELETE FROM Requirements WHERE course_id=:course_id or requirement_id=:course_id",
-            (course_id,),
-        )
+        if dependents is None:
+            return
+
+        old_requirements = old_course.requirements if old_course else frozenset()
+        new_requirements = new_course.requirements if new_course else frozenset()
+
+        for requirement_id in old_requirements - new_requirements:
+            dependent_ids = dependents[requirement_id]
+            dependent_ids.discard(course_id)
+
+            if not dependent_ids:
+                del dependents[requirement_id]
+
+        for requirement_id in new_requirements - old_requirements:
+            dependents.setdefault(requirement_id, set()).add(course_id)
+
+    def __update_fingerprint(
+        self, old_course: Course | None, new_course: Course | None
+    ) -> None:
+        """Päivittää valikoiman tunnisteen kurssin muuttuessa.
+
+        Args:
+            old_course (Course | None): Kurssi ennen muutosta tai None, jos kurssi on uusi.
+            new_course (Course | None): Kurssi muutoksen jälkeen tai None, jos kurssi poistettiin.
+        """
 
-        self.__connection.commit()
+        if self.__fingerprint is None:
+            return
+
+        if old_course:
+            self.__fingerprint ^= self.__hash_course(old_course)
+
+        if new_course:
+            self.__fingerprint ^= self.__hash_course(new_course)
+
+    def __hash_course(self, course: Course) -> int:
+        """Palauttaa kurssin sisällöstä lasketun tiivisteen.
+
+        Args:
+            course (Course): Kurssi.
+
+        Returns:
+            int: Kurssin tiiviste.
+        """
+
+        return hash(
+            (course.id, course.name, course.credits, course.timing, course.requirements)
+        )
 
     def delete_all(self) -> None:
         """Poistaa kaikki kurssit tietokannasta."""
 
-        cursor = self.__connection.cursor()
+        self.__database.connection.cursor().execute("DELETE FROM Courses")
+        self.__database.connection.commit()
+        self.__fingerprint = 0
+        self.__reachability = ReachabilityIndex()
+        self.__courses.clear()
+        self.__all_courses = [] if self.__cache_size > 0 else None
+        self.__dependents = {}
 
-        cursor.execute("DELETE FROM Courses")
-        cursor.execute("DELETE FROM Periods")
-        cursor.execute("DELETE FROM Requirements")
+    def cache_info(self) -> CacheInfo:
+        """Palauttaa kurssivälimuistin tilastot.
 
-        self.__connection.commit()
+        Returns:
+            CacheInfo: Osumat, ohiosumat, enimmäiskoko ja nykyinen koko.
+        """
+
+        return self.__courses.info()
 
     def find_by_id(self, course_id: int) -> Course | None:
         """Palauttaa id:tä vastaavan kurssin.
@@ -124,34 +574,64 @@ class CourseRepository:
             Course | None: id:tä vastaava kurssi tai None, jos ei löydy.
         """
 
-        cursor = self.__connection.cursor()
+        course = self.__courses.get(course_id)
+
+        if course is not None:
+            return course
+
+        cursor = self.__database.connection.cursor()
+        cursor.row_factory = None
 
-        course_data = cursor.execute(
-            "SELECT * FROM Courses WHERE id=?", (course_id,)
+        row = cursor.execute(
+            "SELECT id, name, credits, timing, requirements FROM Courses WHERE id=?",
+            (course_id,),
         ).fetchone()
 
-        if course_data is None:
+        if row is None:
             return None
 
-        requirements = self.find_requirements(course_id)
-        timing = self.find_timing(course_id)
+        course = self.__unpack(*row)
+        self.__courses.put(course_id, course)
 
-        return Course(
-            course_data["name"], course_data["credits"], timing, requirements, course_id
-        )
+        return course
 
     def find_all(self) -> list[Course]:
         """Palauttaa kaikki kurssit.
+        Valikoima luetaan tietokannasta vain, jos se ei ole välimuistissa.
 
         Returns:
             list[Course]: Lista kursseista id-järjestyksessä.
         """
 
-        cursor = self.__connection.cursor()
+        if self.__all_courses is None:
+            courses = self.__read_all()
+
+            if self.__cache_size == 0 or len(courses) > self.__cache_size:
+                return courses
+
+            for course in courses:
+                self.__courses.put(course.id, course)
 
-        rows = cursor.execute("SELECT id FROM Courses ORDER BY id").fetchall()
+            self.__all_courses = courses
 
-        return [self.find_by_id(row["id"]) for row in rows if row is not None]  # type: ignore
+        return list(self.__all_courses)
+
+    def __read_all(self) -> list[Course]:
+        """Lukee kaikki kurssit tietokannasta yhdellä kyselyllä.
+
+        Returns:
+            list[Course]: Lista kursseista id-järjestyksessä.
+        """
+
+        cursor = self.__database.connection.cursor()
+        cursor.row_factory = None
+
+        return [
+            self.__unpack(*row)
+            for row in cursor.execute(
+                "SELECT id, name, credits, timing, requirements FROM Courses ORDER BY id"
+            )
+        ]
 
     def find_requirements(self, course_id: int) -> set[int]:
         """Palauttaa kurssin esitietovaatimukset.
@@ -163,13 +643,13 @@ class CourseRepository:
             set[int]: Esitietokurssien id:t joukkona.
         """
 
-        cursor = self.__connection.cursor()
+        cursor = self.__database.connection.cursor()
 
-        requirements = cursor.execute(
-            "SELECT requirement_id FROM Requirements WHERE course_id=?", (course_id,)
-        ).fetchall()
+        row = cursor.execute(
+            "SELECT requirements FROM Courses WHERE id=?", (course_id,)
+        ).fetchone()
 
-        return {row["requirement_id"] for row in requirements}
+        return set() if row is None else set(unpack_requirements(row["requirements"]))
 
     def find_timing(self, course_id: int) -> set[int]:
         """Palauttaa kurssin perioditarjonnan.
@@ -181,13 +661,13 @@ class CourseRepository:
             set[int]: Kurssin perioditarjonta.
         """
 
-        cursor = self.__connection.cursor()
+        cursor = self.__database.connection.cursor()
 
-        timing = cursor.execute(
-            "SELECT period FROM Periods WHERE course_id=?", (course_id,)
-        ).fetchall()
+        row = cursor.execute(
+            "SELECT timing FROM Courses WHERE id=?", (course_id,)
+        ).fetchone()
 
-        return {row["period"] for row in timing}
+        return set() if row is None else set(unpack_timing(row["timing"]))
 
 
 course_repository = CourseRepository()
@@ -0,0 +1,122 @@
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+from entities.course_graph import CourseGraph
+from services.scheduler_service import SchedulerService
+from services.worker_pool import get_process_count, initialize_worker, map_in_workers
+
+
+class StudentCourses(NamedTuple):
+    """Yhden opiskelijan kurssit verkon indekseinä.
+
+    Attributes:
+        planned (int): Aikataulutettavat kurssit bittimaskina.
+        completed (int): Suoritetut kurssit bittimaskina. Oletukseltaan 0.
+    """
+
+    planned: int
+    completed: int = 0
+
+
+class BatchResult(NamedTuple):
+    """Yhden opiskelijan aikataulu.
+
+    Attributes:
+        student (int): Opiskelijan järjestysnumero syötteessä.
+        schedule (tuple[tuple[int, ...], ...]): Kurssien id:t periodeittain.
+    """
+
+    student: int
+    schedule: tuple[tuple[int, ...], ...]
+
+
+def schedule_student(
+    scheduler: SchedulerService, student: int, courses: StudentCourses
+) -> BatchResult:
+    """Laskee yhden opiskelijan aikataulun.
+
+    Args:
+        scheduler (SchedulerService): Aikatauluttaja, jolle verkko on alustettu.
+        student (int): Opiskelijan järjestysnumero.
+        courses (StudentCourses): Opiskelijan kurssit.
+
+    Returns:
+        BatchResult: Opiskelijan aikataulu.
+    """
+
+    schedule = scheduler.get_subset_schedule(courses.planned, courses.completed)
+
+    return BatchResult(
+        student,
+        tuple(tuple(course.id for course in period) for period in schedule),
+    )
+
+
+class BatchService:
+    """Luokka, joka aikatauluttaa usean opiskelijan kurssit yhteisestä valikoimasta.
+
+    Valikoiman verkko muodostetaan kerran, ja opiskelijoiden kurssit annetaan
+    verkon indeksien bittimaskeina, joten kurssiolioita ei luoda opiskelijakohtaisesti.
+    """
+
+    def __init__(self, processes: int | None = None) -> None:
+        """Luokan konstruktori.
+
+        Args:
+            processes (int | None, optional):
+                Prosessien määrä. Yhdellä prosessilla aikataulut lasketaan samassa prosessissa.
+                Oletukseltaan None, jolloin käytetään kaikkia suorittimia.
+        """
+
+        self.processes: int = get_process_count(processes)
+
+    def schedule(
+        self,
+        graph: CourseGraph,
+        students: Iterable[StudentCourses],
+        starting_period: int,
+        max_credits: int,
+    ) -> Iterator[BatchResult]:
+        """Aikatauluttaa opiskelijoiden kurssit.
+        Verkko tarkistetaan heti, mutta aikataulut lasketaan vasta tuloksia luettaessa.
+
+        Args:
+            graph (CourseGraph): Kurssivalikoiman verkko.
+            students (Iterable[StudentCourses]): Opiskelijoiden kurssit.
+            starting_period (int): Aloitusperiodi.
+            max_credits (int): Opintopisteyläraja periodille.
+
+        Raises:
+            EmptyGraphError: Kursseja ei ole.
+            CycleError: Kurssit ovat keskenään riippuvia.
+            MaxCreditError: Jonkin kurssin opintopistemäärä ylittää ylärajan.
+
+        Returns:
+            Iterator[BatchResult]:
+                Opiskelijoiden aikataulut syötteen järjestyksessä sitä mukaa, kun ne valmistuvat.
+        """
+
+        scheduler = SchedulerService()
+        initialize_worker(graph, starting_period, max_credits, scheduler)
+
+        # Tyhjän osajoukon aikataulutus tarkistaa verkon syklien varalta.
+        scheduler.get_subset_schedule(0)
+
+        if self.processes == 1:
+            return (
+                schedule_student(scheduler, student, courses)
+                for student, courses in enumerate(students)
+            )
+
+        return map_in_workers(
+            schedule_student,
+            enumerate(students),
+            graph,
+            starting_period,
+            max_credits,
+            self.processes,
+            chunksize=64,
+        )
+
+
+batch_service = BatchService()
@@ -0,0 +1,443 @@
+from collections.abc import Iterator
+from math import ceil
+from time import perf_counter
+from typing import NamedTuple
+
+from config import OPTIMIZER_TIME_BUDGET, PERIODS_PER_YEAR
+from entities.course import Course
+from services.scheduler_service import SchedulerService
+
+
+class OptimizedSchedule(NamedTuple):
+    """Optimoinnin tulos.
+
+    Attributes:
+        schedule (list[list[Course]]):
+            Lyhin löydetty aikataulu samassa muodossa kuin SchedulerService palauttaa.
+        lower_bound (int): Alaraja aikataulun periodien määrälle.
+        gap (int):
+            Löydetyn aikataulun ja alarajan periodimäärien erotus.
+            Nolla, jos aikataulu on todistetusti lyhin mahdollinen.
+    """
+
+    schedule: list[list[Course]]
+    lower_bound: int
+    gap: int
+
+
+class OptimizationProblem:
+    """Luokka, joka kuvaa optimoitavan aikataulun muuttumattomat tiedot.
+
+    Kurssit numeroidaan topologisessa järjestyksessä,
+    ja kurssijoukot esitetään bittimaskeina.
+
+    Attributes:
+        courses (list[Course]): Aikataulutettavat kurssit topologisessa järjestyksessä.
+        requirements (list[int]): Kurssien esitietovaatimukset bittimaskeina.
+        starting_period (int): Aloitusperiodi.
+        max_credits (int): Opintopisteyläraja periodille.
+        full (int): Bittimaski, jossa ovat kaikki kurssit.
+    """
+
+    def __init__(
+        self, courses: list[Course], starting_period: int, max_credits: int
+    ) -> None:
+        """Luokan konstruktori.
+
+        Args:
+            courses (list[Course]):
+                Aikataulutettavat kurssit. Jokaisen kurssin esitietovaatimusten
+                on oltava listassa ennen kurssia.
+            starting_period (int): Aloitusperiodi.
+            max_credits (int): Opintopisteyläraja periodille.
+        """
+
+        bits = {course.id: 1 << index for index, course in enumerate(courses)}
+
+        self.courses: list[Course] = courses
+        self.requirements: list[int] = [
+            sum(bits[requirement_id] for requirement_id in course.requirements)
+            for course in courses
+        ]
+        self.starting_period: int = starting_period
+        self.max_credits: int = max_credits
+        self.full: int = (1 << len(courses)) - 1
+
+    def get_period(self, i: int) -> int:
+        """Palauttaa periodin numeron periodilaskurin perusteella.
+
+        Args:
+            i (int): Kuluneiden periodien määrä aloitusperiodista alkaen.
+
+        Returns:
+            int: Periodin numero väliltä 1..PERIODS_PER_YEAR.
+        """
+
+        return (self.starting_period - 1 + i) % PERIODS_PER_YEAR + 1
+
+
+class SearchState:
+    """Luokka, joka kuvaa yhden optimointiajon muuttuvaa tilaa.
+
+    Attributes:
+        problem (OptimizationProblem): Optimoitava ongelma.
+        deadline (float): Hetki, jonka jälkeen haku lopetetaan.
+        best (list[int]): Lyhimmän löydetyn aikataulun periodit bittimaskeina.
+        visited (dict[tuple[int, int], int]):
+            Jokaiselle tilalle (lisätyt kurssit, periodi) pienin periodilaskuri,
+            jolla tilaan on päädytty.
+        expired (bool): Onko haku keskeytetty aikarajan vuoksi.
+    """
+
+    def __init__(
+        self, problem: OptimizationProblem, deadline: float, best: list[int]
+    ) -> None:
+        """Luokan konstruktori.
+
+        Args:
+            problem (OptimizationProblem): Optimoitava ongelma.
+            deadline (float): Hetki, jonka jälkeen haku lopetetaan.
+            best (list[int]): Lähtöratkaisun periodit bittimaskeina.
+        """
+
+        self.problem: OptimizationProblem = problem
+        self.deadline: float = deadline
+        self.best: list[int] = best
+        self.visited: dict[tuple[int, int], int] = {}
+        self.expired: bool = False
+
+
+class OptimizerService:
+    """Luokka, joka etsii aikataulun, jossa on mahdollisimman vähän periodeja.
+
+    Haku on haarautuva ja rajoittava syvyyshaku periodi kerrallaan.
+    Lähtöratkaisuna käytetään SchedulerService-luokan ahnetta aikataulua,
+    ja haku palauttaa parhaan löydetyn ratkaisun, kun aikaraja täyttyy.
+    Periodin kurssijoukoiksi kokeillaan vain maksimaalisia joukkoja,
+    sillä kurssin siirtäminen aikaisempaan periodiin ei koskaan pidennä aikataulua.
+    """
+
+    def __init__(self, time_budget: float = OPTIMIZER_TIME_BUDGET) -> None:
+        """Luokan konstruktori.
+
+        Args:
+            time_budget (float, optional):
+                Oletusaikaraja sekunteina. Oletukseltaan OPTIMIZER_TIME_BUDGET.
+        """
+
+        self.time_budget: float = time_budget
+
+    def optimize(
+        self,
+        courses: list[Course],
+        starting_period: int,
+        max_credits: int,
+        time_budget: float | None = None,
+    ) -> OptimizedSchedule:
+        """Etsii lyhimmän aikataulun annetussa ajassa.
+
+        Aikaraja lasketaan kutsun alusta, joten ahneen lähtöratkaisun
+        ja ensimmäisen alarajan laskeminen vähennetään haun ajasta.
+        Ne lasketaan aina, sillä ilman niitä ei ole palautettavaa tulosta,
+        mutta hakua ei aloiteta, jos aikaraja on ylittynyt niiden aikana.
+        Haun aikana aikaraja tarkistetaan jokaisen kurssijoukon välissä,
+        joten kokonaisaika ylittää aikarajan enintään lähtöratkaisun,
+        yhden hakuaskeleen ja tuloksen muodostamisen verran.
+
+        Args:
+            courses (list[Course]): Aikataulutettavat kurssit.
+            starting_period (int): Aloitusperiodi.
+            max_credits (int): Opintopisteyläraja periodille.
+            time_budget (float | None, optional):
+                Aikaraja sekunteina. Oletukseltaan None, jolloin käytetään oletusaikarajaa.
+
+        Raises:
+            EmptyGraphError: Kursseja ei ole.
+            CycleError: Kurssit ovat keskenään riippuvia.
+            MaxCreditError: Jonkin kurssin opintopistemäärä ylittää ylärajan.
+
+        Returns:
+            OptimizedSchedule: Lyhin löydetty aikataulu, alaraja ja optimaalisuusväli.
+        """
+
+        if time_budget is None:
+            time_budget = self.time_budget
+
+        deadline = perf_counter() + time_budget
+        greedy = SchedulerService(courses, starting_period, max_credits).get_schedule()
+        problem = OptimizationProblem(
+            [course for period in greedy for course in period],
+            starting_period,
+            max_credits,
+        )
+
+        position = {course.id: index for index, course in enumerate(problem.courses)}
+        state = SearchState(
+            problem,
+            deadline,
+            [sum(1 << position[course.id] for course in period) for period in greedy],
+        )
+
+        lower_bound = self.__get_lower_bound(problem, 0, 0)
+
+        if perf_counter() > deadline:
+            state.expired = True
+        elif lower_bound < len(state.best):
+            self.__search(state)
+
+        if not state.expired:
+            lower_bound = len(state.best)
+
+        return OptimizedSchedule(
+            self.__get_schedule(problem, state.best),
+            lower_bound,
+            len(state.best) - lower_bound,
+        )
+
+    def __search(self, state: SearchState) -> None:
+        """Käy läpi aikataulut syvyyshaulla, kunnes haku on valmis tai aikaraja täyttyy.
+        Pinossa on jokaiselle avoimelle periodille sen vielä kokeilemattomat kurssijoukot.
+
+        Args:
+            state (SearchState): Optimointiajon tila.
+        """
+
+        problem = state.problem
+        path = [0]
+        stack = [self.__get_period_sets(state, 0, 0)]
+
+        while stack:
+            chosen = next(stack[-1], None)
+
+            if state.expired:
+                return
+
+            if chosen is None:
+                stack.pop()
+                path.pop()
+                continue
+
+            placed = path[-1] | chosen
+            i = len(stack)
+
+            if placed == problem.full:
+                if i < len(state.best):
+                    state.best = [b ^ a for a, b in zip(path, path[1:] + [placed])]
+
+                continue
+
+            if self.__is_pruned(state, placed, i):
+                continue
+
+            path.append(placed)
+            stack.append(self.__get_period_sets(state, placed, i))
+
+    def __is_pruned(self, state: SearchState, placed: int, i: int) -> bool:
+        """Tarkistaa, voiko tilasta löytyä parasta ratkaisua lyhyempää aikataulua.
+
+        Args:
+            state (SearchState): Optimointiajon tila.
+            placed (int): Lisätyt kurssit bittimaskina.
+            i (int): Seuraavan periodin periodilaskuri.
+
+        Returns:
+            bool: True, jos tila voidaan ohittaa, muulloin False.
+        """
+
+        key = (placed, i % PERIODS_PER_YEAR)
+
+        if state.visited.get(key, i + 1) <= i:
+            return True
+
+        state.visited[key] = i
+
+        return self.__get_lower_bound(state.problem, placed, i) >= len(state.best)
+
+    def __get_period_sets(
+        self, state: SearchState, placed: int, i: int
+    ) -> Iterator[int]:
+        """Tuottaa periodiin mahtuvat maksimaaliset kurssijoukot.
+        Kurssi voi olla samassa periodissa kuin sen esitietokurssi,
+        kuten ahneessa aikataulutuksessa.
+        Lopettaa ja merkitsee haun keskeytetyksi, kun aikaraja täyttyy.
+
+        Args:
+            state (SearchState): Optimointiajon tila.
+            placed (int): Aiemmin lisätyt kurssit bittimaskina.
+            i (int): Periodilaskuri.
+
+        Yields:
+            int: Kurssijoukko bittimaskina.
+        """
+
+        problem = state.problem
+        candidates = self.__get_candidates(problem, placed, problem.get_period(i))
+        stack = [(0, 0, 0)]
+
+        while stack:
+            if perf_counter() > state.deadline:
+                state.expired = True
+                return
+
+            position, chosen, total = stack.pop()
+
+            if position == len(candidates):
+                if self.__is_maximal(problem, candidates, placed | chosen, total):
+                    yield chosen
+
+                continue
+
+            index = candidates[position]
+            course = problem.courses[index]
+
+            stack.append((position + 1, chosen, total))
+
+            if (
+                total + course.credits <= problem.max_credits
+                and problem.requirements[index] & ~(placed | chosen) == 0
+            ):
+                stack.append(
+                    (position + 1, chosen | 1 << index, total + course.credits)
+                )
+
+    def __get_candidates(
+        self, problem: OptimizationProblem, placed: int, period: int
+    ) -> list[int]:
+        """Palauttaa kurssit, jotka voidaan mahdollisesti lisätä periodiin.
+
+        Args:
+            problem (OptimizationProblem): Optimoitava ongelma.
+            placed (int): Aiemmin lisätyt kurssit bittimaskina.
+            period (int): Periodin numero.
+
+        Returns:
+            list[int]: Kurssien indeksit topologisessa järjestyksessä.
+        """
+
+        candidates = []
+        available = placed
+
+        for index, course in enumerate(problem.courses):
+            bit = 1 << index
+
+            if (
+                not placed & bit
+                and period in course.timing
+                and problem.requirements[index] & ~available == 0
+            ):
+                candidates.append(index)
+                available |= bit
+
+        return candidates
+
+    def __is_maximal(
+        self,
+        problem: OptimizationProblem,
+        candidates: list[int],
+        placed: int,
+        total: int,
+    ) -> bool:
+        """Tarkistaa, ettei periodiin mahdu enää yhtään kurssia.
+
+        Args:
+            problem (OptimizationProblem): Optimoitava ongelma.
+            candidates (list[int]): Periodin mahdolliset kurssit.
+            placed (int): Lisätyt kurssit periodi mukaan lukien bittimaskina.
+            total (int): Periodin opintopistemäärä.
+
+        Returns:
+            bool: True, jos periodiin ei voi lisätä kurssia, muulloin False.
+        """
+
+        for index in candidates:
+            if (
+                not placed & 1 << index
+                and total + problem.courses[index].credits <= problem.max_credits
+                and problem.requirements[index] & ~placed == 0
+            ):
+                return False
+
+        return True
+
+    def __get_lower_bound(
+        self, problem: OptimizationProblem, placed: int, i: int
+    ) -> int:
+        """Laskee alarajan aikataulun periodien määrälle.
+        Alaraja on suurempi kriittisen polun aikaisimmista aloitusperiodeista
+        ja jäljellä olevien opintopisteiden vaatimasta periodimäärästä.
+
+        Args:
+            problem (OptimizationProblem): Optimoitava ongelma.
+            placed (int): Lisätyt kurssit bittimaskina.
+            i (int): Seuraavan periodin periodilaskuri.
+
+        Returns:
+            int: Alaraja periodien määrälle.
+        """
+
+        earliest: dict[int, int] = {}
+        remaining_credits = 0
+        bound = i
+
+        for index, course in enumerate(problem.courses):
+            if placed & 1 << index:
+                continue
+
+            start = max(
+                [i]
+                + [
+                    earliest[requirement_id]
+                    for requirement_id in course.requirements
+                    if requirement_id in earliest
+                ]
+            )
+            period = problem.get_period(start)
+            start += min((item - period) % PERIODS_PER_YEAR for item in course.timing)
+
+            earliest[course.id] = start
+            remaining_credits += course.credits
+            bound = max(bound, start + 1)
+
+        if problem.max_credits > 0:
+            bound = max(bound, i + ceil(remaining_credits / problem.max_credits))
+
+        return bound
+
+    def __get_schedule(
+        self, problem: OptimizationProblem, periods: list[int]
+    ) -> list[list[Course]]:
+        """Muuntaa bittimaskeina esitetyt periodit kurssilistoiksi.
+
+        Args:
+            problem (OptimizationProblem): Optimoitava ongelma.
+            periods (list[int]): Periodit bittimaskeina.
+
+        Returns:
+            list[list[Course]]: Kurssit periodeittain opintopisteiden ja id:n mukaan järjestettynä.
+        """
+
+        return [
+            sorted(
+                (problem.courses[index] for index in self.__get_indices(period)),
+                key=lambda course: (course.credits, course.id),
+            )
+            for period in periods
+        ]
+
+    def __get_indices(self, mask: int) -> Iterator[int]:
+        """Tuottaa bittimaskin kurssien indeksit käymättä läpi kaikkia kursseja.
+
+        Args:
+            mask (int): Kurssijoukko bittimaskina.
+
+        Yields:
+            int: Kurssin indeksi.
+        """
+
+        while mask:
+            lowest = mask & -mask
+            yield lowest.bit_length() - 1
+            mask ^= lowest
+
+
+optimizer_service = OptimizerService()
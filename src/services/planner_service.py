@@ -1,35 +1,55 @@
-from config import PERIODS_PER_YEAR
+from collections.abc import Callable, Iterable, Iterator
+
+from config import DATABASE_FILE_PATH, PERIODS_PER_YEAR, SCHEDULE_CACHE_SIZE
 from entities.course import Course
+from entities.course_graph import CourseGraph
+from entities.course_metrics import CourseMetrics
+from entities.feasibility import UnschedulableCourse
+from entities.reachability_index import ReachabilityIndex
+from lib.database import Database
+from lib.lru_cache import CacheInfo, LRUCache
 from repositories.course_repository import CourseRepository
 from repositories.course_repository import (
     course_repository as default_course_repository,
 )
+from services.batch_service import BatchResult, BatchService, StudentCourses
+from services.batch_service import batch_service as default_batch_service
 from services.export_service import ExportService
 from services.export_service import export_service as default_export_service
 from services.import_service import ImportService
 from services.import_service import import_service as default_import_service
+from services.optimizer_service import OptimizedSchedule, OptimizerService
+from services.optimizer_service import optimizer_service as default_optimizer_service
 from services.scheduler_service import SchedulerService
 from services.scheduler_service import scheduler_service as default_scheduler_service
+from services.sweep_service import SweepResult, SweepService
+from services.sweep_service import sweep_service as default_sweep_service
 
 
 class TimingError(Exception):
     pass
 
 
-class PlannerService:
+class PlannerService:  # pylint: disable=too-many-instance-attributes
     """Luokka, joka vastaa sovelluksen logiikasta.
 
+    Valmiit aikataulut tallennetaan välimuistiin, jonka avaimena on
+    kurssivalikoiman tunniste, aloitusperiodi ja opintopisteyläraja.
+
     Attributes:
         starting_year (int): Opintojen aloitusvuosi.
         starting_period (int): Opintojen aloitusperiodi.
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         scheduler_service: SchedulerService = default_scheduler_service,
         course_repository: CourseRepository = default_course_repository,
         import_service: ImportService = default_import_service,
         export_service: ExportService = default_export_service,
+        optimizer_service: OptimizerService = default_optimizer_service,
+        sweep_service: SweepService = default_sweep_service,
+        batch_service: BatchService = default_batch_service,
     ) -> None:
         """Luokan konstruktori.
 
@@ -39,13 +59,30 @@ class PlannerService:
             course_repository (CourseRepository, optional):
                 Olio, joka vastaa kurssien tallentamisesta.
                 Oletukseltaan default_course_repository.
+            optimizer_service (OptimizerService, optional):
+                Olio, joka etsii lyhimmän aikataulun.
+                Oletukseltaan default_optimizer_service.
+            sweep_service (SweepService, optional):
+                Olio, joka vertailee aikatauluja eri parametreilla.
+                Oletukseltaan default_sweep_service.
+            batch_service (BatchService, optional):
+                Olio, joka aikatauluttaa usean opiskelijan kurssit.
+                Oletukseltaan default_batch_service.
         """
         self.__starting_year: int = 0
+        self.__synced: bool = False
+        self.__cache: LRUCache[
+            tuple[int, int, int], tuple[tuple[Course, ...], ...]
+        ] = LRUCache(SCHEDULE_CACHE_SIZE)
+        self.__metrics: tuple[int, CourseMetrics] | None = None
 
         self.__course_repository: CourseRepository = course_repository
         self.__scheduler: SchedulerService = scheduler_service
         self.__importer: ImportService = import_service
         self.__exporter: ExportService = export_service
+        self.__optimizer: OptimizerService = optimizer_service
+        self.__sweeper: SweepService = sweep_service
+        self.__batcher: BatchService = batch_service
 
     @property
     def starting_year(self) -> int:
@@ -53,7 +90,7 @@ class PlannerService:
 
     @property
     def starting_period(self) -> int:
-        return self.__starting_period
+        return self.__scheduler.starting_period
 
     @starting_year.setter
     def starting_year(self, year: int) -> None:
@@ -67,7 +104,7 @@ class PlannerService:
         if not 0 < period <= PERIODS_PER_YEAR:
             raise ValueError("Virheellinen aloitusperiodi.")
 
-        self.__starting_period = period
+        self.__scheduler.starting_period = period
 
     def initialize(
         self,
@@ -76,6 +113,7 @@ class PlannerService:
         max_credits: int,
     ) -> None:
         """Alustaa parametrit.
+        Kurssit luetaan aikatauluttajalle vain, jos se ei ole jo ajan tasalla.
 
         Args:
             starting_year (int): Aloitusvuosi.
@@ -86,9 +124,14 @@ class PlannerService:
         self.starting_year = starting_year
         self.starting_period = starting_period
 
+        if self.__synced:
+            self.__scheduler.max_credits = max_credits
+            return
+
         self.__scheduler.initialize(
             self.get_all_courses(), self.starting_period, max_credits
         )
+        self.__synced = True
 
     def get_course(self, course_id: int) -> Course | None:
         """Palauttaa id:tä vastaavan kurssin.
@@ -110,12 +153,32 @@ class PlannerService:
 
         return self.__course_repository.find_all()
 
-    def create_course(self, course: Course) -> None:
+    def create_course(self, course: Course) -> Course:
         """Lisää kurssin tietokantaan.
 
         Args:
             course (Course): Lisättävä kurssi.
 
+        Raises:
+            ValueError: Kurssin nimi on tyhjä.
+            TimingError: Kurssilla ei ole ajoitusta.
+
+        Returns:
+            Course: Tallennettu kurssi. Uudella kurssilla on tietokannan antama id.
+        """
+
+        self.__validate_course(course)
+        course = self.__course_repository.create(course)
+        self.__update_scheduler(lambda: self.__scheduler.update_course(course))
+
+        return course
+
+    def __validate_course(self, course: Course) -> None:
+        """Tarkistaa, että kurssin voi tallentaa.
+
+        Args:
+            course (Course): Tarkistettava kurssi.
+
         Raises:
             ValueError: Kurssin nimi on tyhjä.
             TimingError: Kurssilla ei ole ajoitusta.
@@ -130,8 +193,6 @@ class PlannerService:
         ):
             raise TimingError("Kurssilla ei ole ajoitusta.")
 
-        self.__course_repository.create(course)
-
     def delete_course(self, course_id: int) -> None:
         """Poistaa id:tä vastaavan kurssin.
 
@@ -140,11 +201,30 @@ class PlannerService:
         """
 
         self.__course_repository.delete(course_id)
+        self.__update_scheduler(lambda: self.__scheduler.remove_course(course_id))
+
+    def __update_scheduler(self, change: Callable[[], None]) -> None:
+        """Päivittää ajan tasalla olevan aikatauluttajan kurssin muutoksella.
+        Jos päivitys epäonnistuu, aikatauluttaja muodostetaan kokonaan uudelleen
+        seuraavassa alustuksessa, sillä tietokanta on jo päivitetty.
+
+        Args:
+            change (Callable[[], None]): Aikatauluttajaa päivittävä funktio.
+        """
+
+        if not self.__synced:
+            return
+
+        try:
+            change()
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.__synced = False
 
     def delete_all_courses(self) -> None:
         """Poistaa kaikki kurssit tietokannasta."""
 
         self.__course_repository.delete_all()
+        self.__synced = False
 
     def get_schedule(self) -> list[list[Course]]:
         """Palauttaa aikataulun.
@@ -156,19 +236,235 @@ class PlannerService:
                 ja kuvaa kuluneiden periodien määrää aloitusperiodista alkaen.
         """
 
-        return self.__scheduler.get_schedule()
+        if not self.__synced:
+            return self.__scheduler.get_schedule()
+
+        key = self.__get_cache_key()
+        schedule = self.__cache.get(key)
+
+        if schedule is None:
+            schedule = tuple(
+                tuple(period) for period in self.__scheduler.get_schedule()
+            )
+            self.__cache.put(key, schedule)
+
+        return [list(period) for period in schedule]
+
+    def iter_schedule(self) -> Iterator[list[Course]]:
+        """Palauttaa aikataulun periodi kerrallaan sitä mukaa, kun periodit valmistuvat.
+        Välimuistissa oleva aikataulu käytetään sellaisenaan,
+        ja loppuun asti luettu aikataulu lisätään välimuistiin.
+
+        Returns:
+            Iterator[list[Course]]: Periodien kurssit samassa järjestyksessä kuin get_schedule.
+        """
+
+        if not self.__synced:
+            return self.__scheduler.iter_schedule()
+
+        key = self.__get_cache_key()
+        schedule = self.__cache.get(key)
+
+        if schedule is not None:
+            return (list(period) for period in schedule)
+
+        return self.__cache_periods(key, self.__scheduler.iter_schedule())
+
+    def __cache_periods(
+        self, key: tuple[int, int, int], periods: Iterator[list[Course]]
+    ) -> Iterator[list[Course]]:
+        """Kerää periodit ja lisää aikataulun välimuistiin, kun periodit on käyty läpi.
+        Aikataulua ei lisätä, jos välimuistiavain on muuttunut läpikäynnin aikana.
+
+        Args:
+            key (tuple[int, int, int]): Aikataulun välimuistiavain läpikäynnin alussa.
+            periods (Iterator[list[Course]]): Aikatauluttajan tuottamat periodit.
+
+        Yields:
+            list[Course]: Periodin kurssit.
+        """
+
+        schedule = []
+
+        for period in periods:
+            schedule.append(tuple(period))
+            yield period
+
+        if self.__synced and key == self.__get_cache_key():
+            self.__cache.put(key, tuple(schedule))
+
+    def get_optimized_schedule(
+        self, time_budget: float | None = None
+    ) -> OptimizedSchedule:
+        """Etsii aikataulun, jossa on mahdollisimman vähän periodeja.
+
+        Args:
+            time_budget (float | None, optional):
+                Aikaraja sekunteina. Oletukseltaan None, jolloin käytetään
+                OPTIMIZER_TIME_BUDGET-asetusta.
+
+        Returns:
+            OptimizedSchedule: Lyhin annetussa ajassa löydetty aikataulu ja optimaalisuusväli.
+        """
+
+        return self.__optimizer.optimize(
+            self.get_all_courses(),
+            self.starting_period,
+            self.__scheduler.max_credits,
+            time_budget,
+        )
+
+    def sweep(
+        self, max_credits: Iterable[int], starting_periods: Iterable[int] | None = None
+    ) -> list[SweepResult]:
+        """Laskee aikataulujen pituudet ja opintopisteprofiilit parametriyhdistelmille.
+        Kaikki yhdistelmät lasketaan samasta kurssivalikoiman tilannekuvasta.
+
+        Args:
+            max_credits (Iterable[int]): Kokeiltavat opintopisteylärajat.
+            starting_periods (Iterable[int] | None, optional):
+                Kokeiltavat aloitusperiodit. Oletukseltaan None, jolloin kokeillaan kaikkia.
+
+        Returns:
+            list[SweepResult]: Tulokset aloitusperiodin ja opintopisterajan mukaan järjestettynä.
+        """
+
+        return self.__sweeper.sweep(
+            self.get_all_courses(), max_credits, starting_periods
+        )
+
+    def schedule_students(
+        self, students: Iterable[tuple[Iterable[int], Iterable[int]]]
+    ) -> Iterator[BatchResult]:
+        """Aikatauluttaa usean opiskelijan kurssit samasta kurssivalikoimasta.
+        Valikoima luetaan ja sen verkko muodostetaan vain kerran.
+
+        Args:
+            students (Iterable[tuple[Iterable[int], Iterable[int]]]):
+                Jokaiselle opiskelijalle suunniteltujen ja suoritettujen kurssien id:t.
+
+        Returns:
+            Iterator[BatchResult]: Opiskelijoiden aikataulut syötteen järjestyksessä.
+        """
+
+        graph = CourseGraph(self.get_all_courses())
+
+        return self.__batcher.schedule(
+            graph,
+            (
+                StudentCourses(graph.mask(planned), graph.mask(completed))
+                for planned, completed in students
+            ),
+            self.starting_period,
+            self.__scheduler.max_credits,
+        )
+
+    def get_course_metrics(self) -> CourseMetrics:
+        """Palauttaa kurssivalikoiman riippuvuusverkon tunnusluvut.
+        Tunnusluvut lasketaan uudelleen vain, kun kurssivalikoima on muuttunut.
+
+        Raises:
+            ValueError: Kurssit ovat keskenään riippuvia.
+
+        Returns:
+            CourseMetrics: Ketjujen pituudet, aikaisimmat periodit ja riippuvien kurssien määrät.
+        """
+
+        fingerprint = self.__course_repository.fingerprint
+
+        if self.__metrics is None or self.__metrics[0] != fingerprint:
+            graph = CourseGraph(self.get_all_courses())
+            self.__metrics = (fingerprint, CourseMetrics(graph))
+
+        return self.__metrics[1]
+
+    def get_unschedulable_courses(self) -> list[UnschedulableCourse]:
+        """Palauttaa kurssit, jotka jäävät aikataulun ulkopuolelle, sekä syyt.
+        Vaatii, että initialize on kutsuttu.
+
+        Returns:
+            list[UnschedulableCourse]: Aikataulutuskelvottomat kurssit.
+        """
+
+        return self.__scheduler.find_unschedulable()
+
+    def get_reachability_index(self) -> ReachabilityIndex:
+        """Palauttaa kurssien välillisten esitietosuhteiden hakemiston.
+        Hakemisto päivittyy kurssien muuttuessa.
+
+        Returns:
+            ReachabilityIndex: Hakemisto, josta voi kysyä kurssin välilliset esitiedot
+            ja siitä riippuvat kurssit.
+        """
+
+        return self.__course_repository.reachability
+
+    def get_valid_requirements(self, course_id: int) -> list[Course]:
+        """Palauttaa kurssit, jotka voi lisätä kurssin esitiedoiksi muodostamatta sykliä.
+
+        Args:
+            course_id (int): Kurssin id tai -1, jos kurssia ei ole vielä tallennettu.
+
+        Returns:
+            list[Course]: Kelvolliset esitietokurssit id-järjestyksessä.
+        """
+
+        valid_ids = self.__course_repository.reachability.get_valid_requirements(
+            course_id
+        )
+
+        return [course for course in self.get_all_courses() if course.id in valid_ids]
+
+    def __get_cache_key(self) -> tuple[int, int, int]:
+        """Palauttaa aikataulun välimuistiavaimen.
+
+        Returns:
+            tuple[int, int, int]:
+                Kurssivalikoiman sormenjälki, aloitusperiodi ja opintopisteyläraja.
+        """
+
+        return (
+            self.__course_repository.fingerprint,
+            self.starting_period,
+            self.__scheduler.max_credits,
+        )
+
+    def cache_info(self) -> CacheInfo:
+        """Palauttaa aikatauluvälimuistin tilastot.
+
+        Returns:
+            CacheInfo: Osumat, ohiosumat, enimmäiskoko ja nykyinen koko.
+        """
+
+        return self.__cache.info()
 
     def import_courses(self, path: str) -> None:
         """Poistaa kaikki jo olevat kurssit ja lukee kurssit tiedostosta.
+        Kaikki kurssit tarkistetaan ennen tallentamista, ja tallennus tehdään yhdessä
+        transaktiossa, joten virheen sattuessa jo olevat kurssit säilyvät.
 
         Args:
             path (str): Tiedoston polku.
+
+        Raises:
+            ValueError: Kurssin nimi on tyhjä tai sama id esiintyy useasti.
+            TimingError: Kurssilla ei ole ajoitusta.
         """
 
-        self.delete_all_courses()
+        courses = self.__importer.read(path)
+        course_ids = set()
+
+        for course in courses:
+            self.__validate_course(course)
+
+            if course.id in course_ids:
+                raise ValueError(f"Kurssin id {course.id} esiintyy useasti.")
 
-        for course in self.__importer.read(path):
-            self.create_course(course)
+            if course.id != -1:
+                course_ids.add(course.id)
+
+        self.__course_repository.replace_all(courses)
+        self.__synced = False
 
     def export_courses(self, path: str) -> None:
         """Kirjoittaa kurssit tiedostoon.
@@ -180,4 +476,24 @@ class PlannerService:
         self.__exporter.write(self.get_all_courses(), path)
 
 
+def create_planner_service(database_path: str = DATABASE_FILE_PATH) -> PlannerService:
+    """Luo sovelluslogiikan, jolla on oma tietokanta ja oma aikatauluttaja.
+    Tietokantaan ei kosketa ennen ensimmäistä käyttökertaa, joten esimerkiksi
+    komentorivityökalut ja työprosessit voivat luoda sovelluslogiikan nopeasti.
+
+    Args:
+        database_path (str, optional):
+            Tietokantatiedoston polku tai ":memory:".
+            Oletukseltaan konfiguraation DATABASE_FILE_PATH.
+
+    Returns:
+        PlannerService: Uusi sovelluslogiikka.
+    """
+
+    return PlannerService(
+        scheduler_service=SchedulerService(),
+        course_repository=CourseRepository(Database(database_path)),
+    )
+
+
 planner_service = PlannerService()
@@ -1,11 +1,33 @@
-from heapq import heappop, heappush
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterator
+from heapq import heapify, heappop, heappush
+from time import perf_counter
 
 from config import PERIODS_PER_YEAR
 from entities.course import Course
+from entities.course_graph import CourseGraph
+from entities.cycles import find_cycle
+from entities.feasibility import (
+    UnschedulableCourse,
+    UnschedulableReason,
+    find_unschedulable,
+)
+from entities.schedule_state import ScheduleState
+from entities.scheduler_stats import SchedulerStats
 
 
 class CycleError(Exception):
-    pass
+    """Virhe, joka kuvaa kurssien välistä syklistä riippuvuutta.
+
+    Attributes:
+        cycle (list[int]): Syklin muodostavien kurssien id:t riippuvuusjärjestyksessä.
+    """
+
+    def __init__(self, message: str, cycle: list[int] | None = None) -> None:
+        super().__init__(message)
+
+        self.cycle: list[int] = cycle or []
 
 
 class EmptyGraphError(Exception):
@@ -16,14 +38,41 @@ class MaxCreditError(ValueError):
     pass
 
 
-class SchedulerService:
-    """Luokka, joka vastaa kurssien aikataulutuksesta."""
+class UnschedulableError(ValueError):
+    """Virhe, joka kuvaa tilannetta, jossa yhtäkään kurssia ei voi aikatauluttaa.
+
+    Attributes:
+        courses (list[UnschedulableCourse]): Aikataulutuskelvottomat kurssit ja syyt.
+    """
+
+    def __init__(
+        self, message: str, courses: list[UnschedulableCourse] | None = None
+    ) -> None:
+        super().__init__(message)
+
+        self.courses: list[UnschedulableCourse] = courses or []
+
+
+class SchedulerService:  # pylint: disable=too-many-instance-attributes
+    """Luokka, joka vastaa kurssien aikataulutuksesta.
+
+    Kurssien verkko muodostetaan kerran alustuksessa,
+    ja jokainen aikataulutus käyttää siitä kopioitua ajokohtaista tilaa.
+    Viimeisin aikataulu säilytetään, jotta yksittäisen kurssin muutoksen jälkeen
+    voidaan laskea uudelleen vain muutoksen jälkeiset periodit.
+
+    Attributes:
+        instrumented (bool):
+            Kerätäänkö jokaisesta ajosta tunnusluvut. Pois päältä ollessaan
+            aikataulutus ei tee mittauksia.
+    """
 
     def __init__(
         self,
         courses: list[Course] | None = None,
         starting_period: int = 1,
         max_credits: int = 15,
+        instrumented: bool = False,
     ) -> None:
         """Luokan konstruktori.
 
@@ -34,39 +83,51 @@ class SchedulerService:
                 Aloitusperiodi. Oletukseltaan 1.
             max_credits (int, optional):
                 Opintopisteyläraja periodeille. Oletukseltaan 15.
+            instrumented (bool, optional):
+                Kerätäänkö ajojen tunnusluvut. Oletukseltaan False.
         """
-        self.__starting_period: int = starting_period
+        self.starting_period: int = starting_period
+        self.instrumented: bool = instrumented
         self.__max_credits: int = max_credits
-        self.__courses: dict[int, Course] = {}
-        self.__in_degrees: dict[int, int] = {}
-        self.__heaps: list[list[tuple[int, int]]] = []
-        self.__schedule: dict[int, list[Course]] = {}
+        self.__graph: CourseGraph = CourseGraph()
+        self.__checked_graph: CourseGraph | None = None
+        self.__state: ScheduleState | None = None
+        self.__timings: dict[str, float] = {"graph": 0.0, "validation": 0.0}
+        self.__stats: SchedulerStats | None = None
+        self.__unschedulable: tuple[
+            CourseGraph, list[UnschedulableCourse]
+        ] | None = None
 
         self.initialize(courses or [], starting_period, max_credits)
 
     def __repr__(self) -> str:
         return ",".join(
             [
-                f"SchedulerService({list(self.__courses.values())}",
-                f"{self.__starting_period}",
+                f"SchedulerService({list(self.__graph.courses)}",
+                f"{self.starting_period}",
                 f"{self.__max_credits})",
             ]
         )
 
+    @property
+    def graph(self) -> CourseGraph:
+        return self.__graph
+
+    @property
+    def stats(self) -> SchedulerStats | None:
+        """Viimeisimmän aikataulutusajon tunnusluvut.
+        None, jos instrumentointi ei ole ollut päällä ajon aikana.
+        """
+
+        return self.__stats
+
     @property
     def max_credits(self) -> int:
         return self.__max_credits
 
     @max_credits.setter
     def max_credits(self, max_credits: int) -> None:
-        if max_credits <= 0:
-            raise MaxCreditError("Opintopisteyläraja ei voi olla ei-positiivinen.")
-
-        for course in self.__courses.values():
-            if course.credits > max_credits:
-                raise MaxCreditError(
-                    "Opintopisteyläraja on pienempi kuin suurin kurssin laajuus."
-                )
+        self.__validate_max_credits(self.__graph, max_credits)
 
         self.__max_credits = max_credits
 
@@ -76,7 +137,7 @@ class SchedulerService:
         starting_period: int,
         max_credits: int,
     ) -> None:
-        """Alustaa parametrit.
+        """Alustaa parametrit ja muodostaa kurssien verkon.
 
         Args:
             courses (list[Course]): Lista kursseista
@@ -84,22 +145,38 @@ class SchedulerService:
             max_credits (int): Opintopisteyläraja
         """
 
-        self.starting_period = starting_period
-        self.max_credits = max_credits
-        self.__courses: dict[int, Course] = {course.id: course for course in courses}
-
-        self.__in_degrees: dict[int, int] = {
-            course.id: len(course.requirements) for course in courses
-        }
-        self.__heaps: list[list[tuple[int, int]]] = [
-            [] for i in range(PERIODS_PER_YEAR + 1)
-        ]
-        self.__schedule: dict[int, list[Course]] = {}
+        started = perf_counter()
+        graph = CourseGraph(courses)
+        elapsed = perf_counter() - started
 
-        self.__initialize_heaps(courses)
+        self.initialize_graph(graph, starting_period, max_credits)
+        self.__timings["graph"] = elapsed
+
+    def initialize_graph(
+        self,
+        graph: CourseGraph,
+        starting_period: int,
+        max_credits: int,
+    ) -> None:
+        """Alustaa parametrit valmiilla kurssien verkolla.
+        Samaa verkkoa voi käyttää useassa aikatauluttajassa, sillä verkkoa ei muuteta.
+
+        Args:
+            graph (CourseGraph): Kurssien verkko.
+            starting_period (int): Aloitusperiodi
+            max_credits (int): Opintopisteyläraja
+        """
+
+        self.__validate_max_credits(graph, max_credits)
+
+        self.__graph = graph
+        self.starting_period = starting_period
+        self.__max_credits = max_credits
+        self.__timings["graph"] = 0.0
 
     def get_schedule(self) -> list[list[Course]]:
         """Palauttaa aikataulun.
+        Ei muuta alustettua tilaa, joten metodia voi kutsua toistuvasti.
 
         Returns:
             list[list[Course]]:
@@ -108,187 +185,777 @@ class SchedulerService:
                 ja kuvaa kuluneiden periodien määrää aloitusperiodista alkaen.
         """
 
-        graph = self.__get_graph()
+        graph = self.__graph
+        state = self.__state
+
+        if not self.__is_current(state):
+            self.__check_graph(graph)
+            self.__check_feasibility(graph)
+
+            state = ScheduleState(graph, self.starting_period, self.__max_credits)
+            self.__generate_schedule(state)
+            self.__state = state
+
+        max_period = max(state.schedule.keys())
+
+        return [list(state.schedule.get(i, [])) for i in range(max_period + 1)]
+
+    def iter_schedule(self) -> Iterator[list[Course]]:
+        """Palauttaa aikataulun periodi kerrallaan.
+        Ahne algoritmi ei palaa aiempiin periodeihin, joten periodi tuotetaan heti,
+        kun periodilaskuri siirtyy sen ohi. Verkko tarkistetaan heti kutsuttaessa.
+        Kun iteraattori on käyty loppuun, aikataulu säilytetään kuten get_schedule-metodissa,
+        joten seuraava kutsu ja inkrementaalinen päivitys voivat käyttää sitä.
+
+        Raises:
+            CycleError: Verkossa on sykli.
+            EmptyGraphError: Verkko on tyhjä.
+            MaxCreditError: Jokin kurssi on laajempi kuin opintopisteyläraja.
+
+        Returns:
+            Iterator[list[Course]]:
+                Periodien kurssit samassa järjestyksessä kuin get_schedule,
+                välissä olevat tyhjät periodit mukaan lukien.
+        """
+
+        graph = self.__graph
+        state = self.__state
+
+        if self.__is_current(state):
+            return self.__iter_periods(iter(sorted(state.schedule.items())))
+
+        self.__check_graph(graph)
+        self.__check_feasibility(graph)
+
+        state = ScheduleState(graph, self.starting_period, self.__max_credits)
+
+        return self.__iter_periods(self.__record_periods(state))
+
+    def get_subset_schedule(
+        self, planned: int, completed: int = 0
+    ) -> list[list[Course]]:
+        """Palauttaa aikataulun verkon kurssien osajoukolle.
+        Verkkoa ei muodosteta uudelleen, joten samaa verkkoa voi käyttää usean opiskelijan
+        aikataulutukseen. Suoritettujen kurssien esitietovaatimukset katsotaan täytetyiksi.
+        Kurssia ei aikatauluteta, jos jokin sen esitiedoista ei ole suunniteltu tai suoritettu.
+
+        Args:
+            planned (int): Aikataulutettavien kurssien indeksit bittimaskina.
+            completed (int, optional): Suoritettujen kurssien indeksit bittimaskina.
+                Oletukseltaan 0.
+
+        Returns:
+            list[list[Course]]:
+                Kurssit jaettuna sopiviin periodeihin samassa muodossa kuin get_schedule.
+                Tyhjä lista, jos yhtään kurssia ei voi aikatauluttaa.
+        """
+
+        graph = self.__graph
+
+        self.__check_graph(graph)
+
+        state = ScheduleState(graph, self.starting_period, self.__max_credits)
+        self.__restrict_state(state, planned & ~completed, completed)
+        self.__generate_schedule(state)
+
+        max_period = max(state.schedule.keys(), default=-1)
+
+        return [list(state.schedule.get(i, [])) for i in range(max_period + 1)]
+
+    def find_unschedulable(self) -> list[UnschedulableCourse]:
+        """Palauttaa kurssit, joita ei voi aikatauluttaa, sekä syyt.
+        Mukana ovat myös kurssit, joiden ajoituksesta osa jätetään huomiotta.
+        Tulos lasketaan lineaarisessa ajassa kerran verkkoa kohden.
+
+        Returns:
+            list[UnschedulableCourse]: Kurssit, jotka jäävät aikataulun ulkopuolelle.
+        """
+
+        return list(self.__find_unschedulable(self.__graph))
+
+    def update_course(self, course: Course) -> None:
+        """Lisää kurssin tai korvaa saman id:n kurssin.
+        Jos aikataulu on jo laskettu, lasketaan uudelleen vain periodit
+        siitä periodista alkaen, johon muutos voi ensimmäisenä vaikuttaa.
+
+        Args:
+            course (Course): Lisättävä tai muokattu kurssi.
+        """
+
+        graph = self.__graph
+        index = graph.index(course.id)
+        touched = [course]
+
+        if index is not None:
+            touched.append(graph.courses[index])
+
+        started = perf_counter()
+        new_graph = graph.replace_course(course)
+        self.__timings["graph"] = perf_counter() - started
+
+        self.__apply_change(new_graph, touched, course.id)
+
+    def remove_course(self, course_id: int) -> None:
+        """Poistaa kurssin ja siihen viittaavat esitietovaatimukset.
+        Id voi olla myös pelkkä puuttuva esitietovaatimus, kuten tietokannassa.
+        Jos aikataulu on jo laskettu, lasketaan uudelleen vain periodit
+        siitä periodista alkaen, johon muutos voi ensimmäisenä vaikuttaa.
+
+        Args:
+            course_id (int): Poistettavan kurssin id.
+        """
+
+        graph = self.__graph
+        index = graph.index(course_id)
+        dependents = graph.dependents(course_id)
+
+        if index is None and not dependents:
+            return
+
+        started = perf_counter()
+        new_graph = graph.remove_course(course_id)
+        self.__timings["graph"] = perf_counter() - started
+        touched = [] if index is None else [graph.courses[index]]
+
+        for neighbor in dependents:
+            new_index = new_graph.index(graph.courses[neighbor].id)
+
+            # Itseään vaativa kurssi on oma naapurinsa, mutta sitä ei ole enää verkossa.
+            if neighbor != index and new_index is not None:
+                touched.append(new_graph.courses[new_index])
+
+        self.__apply_change(new_graph, touched, None)
+
+    def __is_current(self, state: ScheduleState | None) -> bool:
+        """Tarkistaa, vastaako laskettu aikataulu nykyistä verkkoa ja parametreja.
+
+        Args:
+            state (ScheduleState | None): Viimeisimmän aikataulutuksen tila.
+
+        Returns:
+            bool: True, jos aikataulua voidaan käyttää sellaisenaan. Muulloin False.
+        """
+
+        return (
+            state is not None
+            and state.graph is self.__graph
+            and state.starting_period == self.starting_period
+            and state.max_credits == self.__max_credits
+        )
+
+    def __check_graph(self, graph: CourseGraph) -> None:
+        """Tarkistaa verkon kerran ennen ensimmäistä aikataulutusta.
+
+        Args:
+            graph (CourseGraph): Tarkistettava verkko.
+
+        Raises:
+            CycleError: Verkossa on sykli.
+            EmptyGraphError: Verkko on tyhjä.
+            MaxCreditError: Jokin kurssi on laajempi kuin opintopisteyläraja.
+        """
+
+        if self.__checked_graph is graph:
+            self.__timings["validation"] = 0.0
+            return
+
+        started = perf_counter()
 
         self.__check(graph)
-        self.__generate_schedule(graph)
+        self.__validate_max_credits(graph, self.__max_credits)
+        self.__checked_graph = graph
+        self.__timings["validation"] = perf_counter() - started
 
-        max_period = max(self.__schedule.keys())
+    def __find_unschedulable(self, graph: CourseGraph) -> list[UnschedulableCourse]:
+        """Palauttaa verkon aikataulutuskelvottomat kurssit välimuistista tai laskee ne.
 
-        return [self.__schedule.get(i, []) for i in range(max_period + 1)]
+        Args:
+            graph (CourseGraph): Kurssien verkko.
 
-    def __initialize_heaps(self, courses: list[Course]) -> None:
-        """Lisää kekoihin keot.
+        Returns:
+            list[UnschedulableCourse]: Aikataulutuskelvottomat kurssit.
+        """
+
+        if self.__unschedulable is None or self.__unschedulable[0] is not graph:
+            self.__unschedulable = (graph, find_unschedulable(graph))
+
+        return self.__unschedulable[1]
+
+    def __check_feasibility(self, graph: CourseGraph) -> None:
+        """Tarkistaa ennen aikataulutusta, että ainakin yhden kurssin voi aikatauluttaa.
 
         Args:
-            courses (list[Course]): Lista kursseista.
+            graph (CourseGraph): Tarkistettava verkko.
+
+        Raises:
+            UnschedulableError: Yhtäkään kurssia ei voi aikatauluttaa.
         """
 
-        for course in courses:
-            if self.__in_degrees[course.id] == 0:
-                self.__add_course_to_heaps(course)
+        unschedulable = [
+            course
+            for course in self.__find_unschedulable(graph)
+            if course.reason is not UnschedulableReason.INVALID_PERIODS
+        ]
 
-    def __check(
-        self,
-        graph: dict[int, list[int]],
-        node: int | None = None,
-        states: dict[int, int] | None = None,
+        if len(unschedulable) < len(graph):
+            return
+
+        report = "; ".join(str(course) for course in unschedulable[:10])
+
+        if len(unschedulable) > 10:
+            report += f"; ja {len(unschedulable) - 10} muuta"
+
+        raise UnschedulableError(
+            f"Yhtäkään kurssia ei voi aikatauluttaa: {report}.", unschedulable
+        )
+
+    def __apply_change(
+        self, graph: CourseGraph, touched: list[Course], course_id: int | None
+    ) -> None:
+        """Ottaa käyttöön muutetun verkon ja päivittää aikataulun inkrementaalisesti,
+        jos edellinen aikataulu on voimassa ja muutos säilyttää verkon kelvollisena.
+
+        Args:
+            graph (CourseGraph): Muutettu verkko.
+            touched (list[Course]):
+                Kurssit, joiden tila muuttui, sekä vanhoina että uusina versioina.
+            course_id (int | None):
+                Lisätyn tai muokatun kurssin id tai None, jos kurssi poistettiin.
+        """
+
+        state = self.__state
+        valid = self.__is_current(state) and self.__checked_graph is self.__graph
+
+        self.__graph = graph
+        self.__state = None
+
+        if (
+            not valid
+            or len(graph) == 0
+            or any(course.credits > self.__max_credits for course in touched)
+        ):
+            return
+
+        started = perf_counter()
+
+        if course_id is not None and self.__creates_cycle(
+            graph, graph.index(course_id)
+        ):
+            return
+
+        self.__timings["validation"] = perf_counter() - started
+
+        self.__checked_graph = graph
+        state = self.__reschedule(state, graph, touched)
+
+        if state.schedule:
+            self.__state = state
+
+    def __creates_cycle(self, graph: CourseGraph, index: int) -> bool:
+        """Tarkistaa, kulkeeko verkossa sykli annetun kurssin kautta.
+        Muokkaus voi luoda syklin vain muokatun kurssin kautta,
+        joten riittää käydä läpi siitä riippuvat kurssit.
+
+        Args:
+            graph (CourseGraph): Tarkistettava verkko.
+            index (int): Muokatun kurssin indeksi.
+
+        Returns:
+            bool: True, jos kurssi riippuu itsestään. Muulloin False.
+        """
+
+        visited = {index}
+        stack = [index]
+
+        while stack:
+            for neighbor in graph.neighbors(stack.pop()):
+                if neighbor == index:
+                    return True
+
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    stack.append(neighbor)
+
+        return False
+
+    def __reschedule(
+        self, previous: ScheduleState, graph: CourseGraph, touched: list[Course]
+    ) -> ScheduleState:
+        """Laskee aikataulun uudelleen ensimmäisestä periodista alkaen,
+        johon muutetut kurssit voivat vaikuttaa, ja käyttää aiemmat periodit sellaisenaan.
+
+        Args:
+            previous (ScheduleState): Edellisen aikataulutuksen tila.
+            graph (CourseGraph): Muutettu verkko.
+            touched (list[Course]): Kurssit, joiden tila muuttui.
+
+        Returns:
+            ScheduleState: Päivitetyn aikataulutuksen tila.
+        """
+
+        start = self.__get_affected_index(previous, touched)
+        state = ScheduleState(graph, previous.starting_period, previous.max_credits)
+
+        for i, courses in previous.schedule.items():
+            if i < start:
+                state.schedule[i] = courses
+
+                for course in courses:
+                    state.positions[graph.index(course.id)] = i
+
+        self.__restore_heaps(state)
+        self.__generate_schedule(state, start)
+
+        return state
+
+    def __restore_heaps(self, state: ScheduleState) -> None:
+        """Muodostaa tilan in-degreet ja keot aikataulun jo lasketun alkuosan perusteella.
+        Vain alkuosan ulkopuoliset kurssit käsitellään,
+        joten alkuosan kursseja ei lisätä kekoihin turhaan.
+
+        Args:
+            state (ScheduleState): Tila, johon on merkitty alkuosan kurssien periodilaskurit.
+        """
+
+        graph = state.graph
+        heaps: list[list[tuple[int, int]]] = [[] for _ in state.heaps]
+
+        for index, position in enumerate(state.positions):
+            if position >= 0:
+                continue
+
+            course = graph.courses[index]
+
+            for requirement_id in course.requirements:
+                requirement_index = graph.index(requirement_id)
+
+                if (
+                    requirement_index is not None
+                    and state.positions[requirement_index] >= 0
+                ):
+                    state.in_degrees[index] -= 1
+
+            if state.in_degrees[index] == 0:
+                for period in graph.periods(index):
+                    heaps[period].append((course.credits, index))
+
+        for heap in heaps:
+            heapify(heap)
+
+        state.heaps = heaps
+        state.periods = [period for period, heap in enumerate(heaps) if heap]
+
+    def __restrict_state(
+        self, state: ScheduleState, planned: int, completed: int
     ) -> None:
+        """Rajaa tilan kurssien osajoukkoon.
+        Osajoukon ulkopuolisten kurssien in-degree asetetaan niin suureksi,
+        ettei niitä koskaan lisätä kekoihin, joten vain suunnitellut kurssit käsitellään.
+
+        Args:
+            state (ScheduleState): Rajattava tila.
+            planned (int): Aikataulutettavien kurssien indeksit bittimaskina.
+            completed (int): Suoritettujen kurssien indeksit bittimaskina.
+        """
+
+        graph = state.graph
+        heaps: list[list[tuple[int, int]]] = [[] for _ in state.heaps]
+
+        state.in_degrees = array("i", [len(graph) + 1]) * len(graph)
+
+        while planned:
+            bit = planned & -planned
+            planned ^= bit
+            index = bit.bit_length() - 1
+            course = graph.courses[index]
+            in_degree = len(course.requirements)
+
+            for requirement_id in course.requirements:
+                requirement_index = graph.index(requirement_id)
+
+                if requirement_index is not None and completed >> requirement_index & 1:
+                    in_degree -= 1
+
+            state.in_degrees[index] = in_degree
+
+            if in_degree == 0:
+                for period in graph.periods(index):
+                    heaps[period].append((course.credits, index))
+
+        for heap in heaps:
+            heapify(heap)
+
+        state.heaps = heaps
+        state.periods = [period for period, heap in enumerate(heaps) if heap]
+
+    def __get_affected_index(
+        self, previous: ScheduleState, touched: list[Course]
+    ) -> int:
+        """Palauttaa ensimmäisen periodilaskurin, johon muutetut kurssit voivat vaikuttaa.
+        Kurssi voi vaikuttaa aikatauluun aikaisintaan sillä periodilla,
+        jolla sen viimeinen esitietokurssi lisättiin aikatauluun edellisessä aikataulussa.
+
+        Args:
+            previous (ScheduleState): Edellisen aikataulutuksen tila.
+            touched (list[Course]): Kurssit, joiden tila muuttui.
+
+        Returns:
+            int: Ensimmäinen uudelleen laskettava periodilaskuri.
+        """
+
+        start = max(previous.schedule.keys(), default=-1) + 1
+
+        for course in touched:
+            available = 0
+
+            for requirement_id in course.requirements:
+                index = previous.graph.index(requirement_id)
+                position = -1 if index is None else previous.positions[index]
+
+                if position < 0:
+                    available = start
+                    break
+
+                available = max(available, position)
+
+            start = min(start, available)
+
+        return start
+
+    def __validate_max_credits(self, graph: CourseGraph, max_credits: int) -> None:
+        """Tarkistaa, että opintopisteyläraja kelpaa verkon kursseille.
+
+        Args:
+            graph (CourseGraph): Kurssien verkko.
+            max_credits (int): Tarkistettava opintopisteyläraja.
+
+        Raises:
+            MaxCreditError: Yläraja ei ole positiivinen tai on pienempi kuin jonkin kurssin laajuus.
+        """
+
+        if max_credits <= 0:
+            raise MaxCreditError("Opintopisteyläraja ei voi olla ei-positiivinen.")
+
+        for course in graph.courses:
+            if course.credits > max_credits:
+                raise MaxCreditError(
+                    "Opintopisteyläraja on pienempi kuin suurin kurssin laajuus."
+                )
+
+    def __check(self, graph: CourseGraph) -> None:
         """Tarkistaa, että aikataulu voidaan muodostaa.
 
         Args:
-            graph (dict[int, list[int]]): Tarkistettava verkko.
-            node (int | None, optional): Solmu, josta aloitetaan syvyyshaku. Oletukseltaan None.
-            states (dict[int, int] | None, optional): Solmujen tilat. Oletukseltaan None.
+            graph (CourseGraph): Tarkistettava verkko.
 
         Raises:
             CycleError: Verkossa on sykli.
             EmptyGraphError: Verkko on tyhjä.
         """
 
-        if not graph:
+        if len(graph) == 0:
             raise EmptyGraphError("Verkko on tyhjä.")
 
-        node = node or next(iter(graph.keys()))
-        states = states or {node: 0 for node in graph}
+        cycle = [graph.courses[index].id for index in find_cycle(graph)]
+
+        if cycle:
+            path = " -> ".join(str(course_id) for course_id in cycle + cycle[:1])
 
-        for neighbor in graph[node]:
-            if states[neighbor] == 1:
-                raise CycleError("Kurssit ovat keskenään riippuvia.")
+            raise CycleError(f"Kurssit ovat keskenään riippuvia: {path}.", cycle)
 
-            if states[neighbor] == 0:
-                states[neighbor] = 1
+    def __iter_periods(
+        self, periods: Iterator[tuple[int, list[Course]]]
+    ) -> Iterator[list[Course]]:
+        """Täydentää ei-tyhjien periodien väliin tyhjät periodit.
 
-                self.__check(graph, neighbor, states)
+        Args:
+            periods (Iterator[tuple[int, list[Course]]]):
+                Periodilaskurit ja niiden kurssit kasvavassa järjestyksessä.
 
-        states[node] = 2
+        Yields:
+            list[Course]: Periodin kurssit.
+        """
 
-    def __generate_schedule(self, graph: dict[int, list[int]]) -> None:
-        """Luo aikataulun.
+        previous = -1
 
-        Returns:
-            dict[int, list[Course]]: Aikataulu ilman tyhjiä periodeja.
+        for i, courses in periods:
+            if not courses:
+                continue
+
+            for _ in range(i - previous - 1):
+                yield []
+
+            yield list(courses)
+            previous = i
+
+    def __record_periods(
+        self, state: ScheduleState
+    ) -> Iterator[tuple[int, list[Course]]]:
+        """Tallentaa periodit tilaan sitä mukaa, kun ne valmistuvat,
+        ja ottaa tilan käyttöön, kun aikataulu on valmis.
+        Tilaa ei oteta käyttöön, jos verkko tai parametrit ovat muuttuneet ajon aikana.
+
+        Args:
+            state (ScheduleState): Aikataulutusajon tila.
+
+        Yields:
+            tuple[int, list[Course]]: Käsitelty periodilaskuri ja sen kurssit.
         """
 
-        remaining_credits = self.__max_credits
-        i = 0
-        processed = set()
+        for i, courses in self.__get_periods(state):
+            if courses:
+                state.schedule[i] = courses
 
-        while self.__check_heaps():
-            period = self.__get_period(i)
-            heap = self.__heaps[period]
-            course = self.__get_next_course(heap)
+            yield i, courses
 
-            if not course:
-                i += 1
-                remaining_credits = self.__max_credits
-                continue
+        if state.schedule and self.__is_current(state):
+            self.__state = state
 
-            if course.id in processed:
-                continue
+    def __generate_schedule(self, state: ScheduleState, start: int = 0) -> None:
+        """Luo aikataulun tilaan.
 
-            if course.credits > remaining_credits:
-                i += 1
-                remaining_credits = self.__max_credits
-                heappush(heap, (course.credits, course.id))
-                continue
+        Args:
+            state (ScheduleState): Aikataulutusajon tila.
+            start (int, optional): Periodilaskuri, josta aloitetaan. Oletukseltaan 0.
+        """
 
-            self.__add_course_to_schedule(graph, course, i, processed)
-            remaining_credits -= course.credits
+        for i, courses in self.__get_periods(state, start):
+            if courses:
+                state.schedule[i] = courses
 
-    def __check_heaps(self) -> bool:
-        """Tarkistaa, ovatko jonot tyhjiä.
+    def __get_periods(
+        self, state: ScheduleState, start: int = 0
+    ) -> Iterator[tuple[int, list[Course]]]:
+        """Aloittaa aikataulutusajon ja mittaa sen, jos instrumentointi on päällä.
+
+        Args:
+            state (ScheduleState): Aikataulutusajon tila.
+            start (int, optional): Periodilaskuri, josta aloitetaan. Oletukseltaan 0.
 
         Returns:
-            bool: True, jos jonot eivät ole tyhjiä. Muulloin False.
+            Iterator[tuple[int, list[Course]]]: Käsitellyt periodilaskurit ja niiden kurssit.
         """
 
-        for heap in self.__heaps:
-            if heap:
-                return True
+        periods = self.__generate_periods(state, start)
 
-        return False
+        if not self.instrumented:
+            return periods
+
+        self.__stats = SchedulerStats(
+            self.__timings["graph"], self.__timings["validation"]
+        )
+
+        return self.__measure_periods(state, periods, start, self.__stats)
+
+    def __measure_periods(
+        self,
+        state: ScheduleState,
+        periods: Iterator[tuple[int, list[Course]]],
+        start: int,
+        stats: SchedulerStats,
+    ) -> Iterator[tuple[int, list[Course]]]:
+        """Kerää tunnusluvut aikataulutusajon periodeista.
+        Kurssi lisätään jokaiseen ajoitustaan vastaavaan kekoon kerran ja poistetaan
+        keoista ajon loppuun mennessä, joten lisäykset saadaan aikataulun kursseista
+        ja palautuksista. Periodin keko on käsittelyn jälkeen epätyhjä vain,
+        jos seuraava kurssi ei mahtunut ja se palautettiin kekoon.
+
+        Args:
+            state (ScheduleState): Aikataulutusajon tila.
+            periods (Iterator[tuple[int, list[Course]]]): Mitattavan ajon periodit.
+            start (int): Periodilaskuri, josta ajo aloitettiin.
+            stats (SchedulerStats): Päivitettävät tunnusluvut.
+
+        Yields:
+            tuple[int, list[Course]]: Käsitelty periodilaskuri ja sen kurssit.
+        """
+
+        graph = state.graph
+        previous = start - 1
+        placed = 0
+
+        while True:
+            started = perf_counter()
+            item = next(periods, None)
+            stats.loop_time += perf_counter() - started
+
+            if item is None:
+                break
+
+            i, courses = item
+            stats.skipped_periods += i - previous - 1
+            previous = i
+            placed += len(courses)
+
+            if state.heaps[self.__get_period(i, state.starting_period)]:
+                stats.repushes += 1
+
+            for course in courses:
+                stats.pushes += len(graph.periods(graph.index(course.id)))
+
+            yield item
+
+        stats.pushes += stats.repushes
+        stats.pops = stats.pushes
+        stats.stale_pops = stats.pops - placed - stats.repushes
 
-    def __get_graph(self) -> dict[int, list[int]]:
-        """Palauttaa suunnatun verkon kurssien riippuviksista.
+    def __generate_periods(
+        self, state: ScheduleState, start: int = 0
+    ) -> Iterator[tuple[int, list[Course]]]:
+        """Aikatauluttaa kurssit ja tuottaa jokaisen käsitellyn periodin heti,
+        kun periodilaskuri siirtyy sen ohi.
+        Periodilaskuri hyppää suoraan seuraavaan periodiin, jolla on tarjolla kursseja,
+        joten tyhjät periodit eivät vaikuta aikavaativuuteen.
+
+        Args:
+            state (ScheduleState): Aikataulutusajon tila.
+            start (int, optional): Periodilaskuri, josta aloitetaan. Oletukseltaan 0.
+
+        Yields:
+            tuple[int, list[Course]]:
+                Periodilaskuri ja periodin kurssit. Lista voi olla tyhjä,
+                jos periodin keossa oli vain jo aikataulutettuja kursseja.
+        """
+
+        i = start
+
+        while state.periods:
+            yield i, self.__fill_period(state, i)
+
+            if state.periods:
+                i = self.__get_next_index(state, i)
+
+    def __fill_period(self, state: ScheduleState, i: int) -> list[Course]:
+        """Lisää periodille kursseja, kunnes keko on tyhjä
+        tai seuraava kurssi ei mahdu opintopisterajaan.
+
+        Args:
+            state (ScheduleState): Aikataulutusajon tila.
+            i (int): Periodilaskuri, jolle kursseja lisätään.
 
         Returns:
-            dict[int, list[int]]: Suunnattu verkko kurssien riippuvuuksista.
+            list[Course]: Periodille lisätyt kurssit.
         """
 
-        courses = self.__courses.values()
-        graph = {course.id: [] for course in courses}
+        period = self.__get_period(i, state.starting_period)
+        remaining_credits = state.max_credits
+        courses: list[Course] = []
 
-        for course in courses:
-            for requirement_id in course.requirements:
-                if requirement_id not in graph:
-                    continue
+        while state.heaps[period]:
+            index = self.__get_next_course(state, period)
+
+            if state.positions[index] >= 0:
+                continue
+
+            course = state.graph.courses[index]
+
+            if course.credits > remaining_credits:
+                self.__push_course(state, period, index)
+                break
+
+            self.__add_course_to_schedule(state, index, i)
+            courses.append(course)
+            remaining_credits -= course.credits
 
-                graph[requirement_id].append(course.id)
+        return courses
 
-        return graph
+    def __get_next_index(self, state: ScheduleState, i: int) -> int:
+        """Palauttaa seuraavan periodilaskurin arvon,
+        jonka periodilla on tarjolla kursseja.
 
-    def __get_period(self, i: int) -> int:
+        Args:
+            state (ScheduleState): Aikataulutusajon tila.
+            i (int): Nykyinen periodilaskuri.
+
+        Returns:
+            int: Seuraava periodilaskuri, jonka keko ei ole tyhjä.
+        """
+
+        period = self.__get_period(i, state.starting_period)
+        position = bisect_right(state.periods, period)
+
+        if position < len(state.periods):
+            return i + state.periods[position] - period
+
+        return i + state.periods[0] + PERIODS_PER_YEAR - period
+
+    def __get_period(self, i: int, starting_period: int) -> int:
         """Palauttaa laskuria vastaavan periodin.
 
         Args:
             i (int): Periodilaskuri
+            starting_period (int): Aloitusperiodi.
 
         Returns:
             int: Laskuria vastaava periodi.
         """
 
-        return (i + self.starting_period - 1) % PERIODS_PER_YEAR + 1
+        return (i + starting_period - 1) % PERIODS_PER_YEAR + 1
 
-    def __get_next_course(self, heap: list[tuple[int, int]]) -> Course | None:
-        """Palauttaa seuraavan kurssin keosta.
+    def __get_next_course(self, state: ScheduleState, period: int) -> int:
+        """Poistaa ja palauttaa seuraavan kurssin periodin keosta.
 
         Args:
-            heap (list[tuple[int, int]]): Keko, josta haetaan seuraava kurssi.
+            state (ScheduleState): Aikataulutusajon tila.
+            period (int): Periodi, jonka keosta haetaan seuraava kurssi.
 
         Returns:
-            Course | None: Seuraava kurssi tai None, jos keko on tyhjä.
+            int: Seuraavan kurssin indeksi.
         """
 
-        if heap:
-            course_id = heappop(heap)[1]
-            return self.__courses[course_id]
+        heap = state.heaps[period]
+        index = heappop(heap)[1]
 
-        return None
+        if not heap:
+            del state.periods[bisect_left(state.periods, period)]
 
-    def __add_course_to_heaps(self, course: Course) -> None:
-        """Lisää kurssin ajoitusta vastaaviin kekoihin.
+        return index
+
+    def __push_course(self, state: ScheduleState, period: int, index: int) -> None:
+        """Lisää kurssin periodin kekoon.
 
         Args:
-            course (Course): Lisättävä kurssi.
+            state (ScheduleState): Aikataulutusajon tila.
+            period (int): Periodi, jonka kekoon kurssi lisätään.
+            index (int): Lisättävän kurssin indeksi.
         """
 
-        for period in course.timing:
-            heap = self.__heaps[period]
+        heap = state.heaps[period]
+
+        if not heap:
+            insort(state.periods, period)
 
-            heappush(heap, (course.credits, course.id))
+        heappush(heap, (state.graph.courses[index].credits, index))
+
+    def __add_course_to_heaps(self, state: ScheduleState, index: int) -> None:
+        """Lisää kurssin ajoitusta vastaaviin kekoihin.
+
+        Args:
+            state (ScheduleState): Aikataulutusajon tila.
+            index (int): Lisättävän kurssin indeksi.
+        """
+
+        for period in state.graph.periods(index):
+            self.__push_course(state, period, index)
 
     def __add_course_to_schedule(
-        self, graph: dict[int, list[int]], course: Course, i: int, processed: set[int]
+        self, state: ScheduleState, index: int, i: int
     ) -> None:
-        """Lisää kurssin aikatauluun ja päivittää naapureiden tilat.
+        """Merkitsee kurssin aikatauluun ja päivittää naapureiden tilat.
 
         Args:
-            course (Course): Aikatauluun lisättävä kurssi.
+            state (ScheduleState): Aikataulutusajon tila.
+            index (int): Aikatauluun lisättävän kurssin indeksi.
+            i (int): Periodilaskuri, jolle kurssi lisätään.
         """
 
-        for neighbor_id in graph[course.id]:
-            self.__in_degrees[neighbor_id] -= 1
-
-            if self.__in_degrees[neighbor_id] == 0:
-                neighbor = self.__courses[neighbor_id]
-                self.__add_course_to_heaps(neighbor)
+        for neighbor in state.graph.neighbors(index):
+            state.in_degrees[neighbor] -= 1
 
-        if i not in self.__schedule:
-            self.__schedule[i] = []
+            if state.in_degrees[neighbor] == 0:
+                self.__add_course_to_heaps(state, neighbor)
 
-        self.__schedule[i].append(course)
-        processed.add(course.id)
+        state.positions[index] = i
 
 
 scheduler_service = SchedulerService()
@@ -0,0 +1,139 @@
+from collections.abc import Iterable
+from math import ceil
+from typing import NamedTuple
+
+from config import PERIODS_PER_YEAR
+from entities.course import Course
+from entities.course_graph import CourseGraph
+from services.scheduler_service import MaxCreditError, SchedulerService
+from services.worker_pool import get_process_count, initialize_worker, map_in_workers
+
+
+class SweepResult(NamedTuple):
+    """Yhden parametriyhdistelmän tulos.
+
+    Attributes:
+        starting_period (int): Aloitusperiodi.
+        max_credits (int): Opintopisteyläraja periodille.
+        periods (int | None):
+            Aikataulun periodien määrä tai None, jos yläraja on pienempi
+            kuin jonkin kurssin laajuus.
+        credits (tuple[int, ...]): Opintopisteiden määrät periodeittain.
+    """
+
+    starting_period: int
+    max_credits: int
+    periods: int | None
+    credits: tuple[int, ...]
+
+
+def evaluate(
+    scheduler: SchedulerService, starting_period: int, max_credits: int
+) -> SweepResult:
+    """Laskee yhden parametriyhdistelmän tuloksen.
+
+    Args:
+        scheduler (SchedulerService): Aikatauluttaja, jolle verkko on alustettu.
+        starting_period (int): Aloitusperiodi.
+        max_credits (int): Opintopisteyläraja periodille.
+
+    Raises:
+        EmptyGraphError: Kursseja ei ole.
+        CycleError: Kurssit ovat keskenään riippuvia.
+
+    Returns:
+        SweepResult: Parametriyhdistelmän tulos.
+    """
+
+    scheduler.starting_period = starting_period
+
+    try:
+        scheduler.max_credits = max_credits
+    except MaxCreditError:
+        return SweepResult(starting_period, max_credits, None, ())
+
+    schedule = scheduler.get_schedule()
+
+    return SweepResult(
+        starting_period,
+        max_credits,
+        len(schedule),
+        tuple(sum(course.credits for course in period) for period in schedule),
+    )
+
+
+class SweepService:
+    """Luokka, joka vertailee aikatauluja usealla parametriyhdistelmällä.
+
+    Kurssien verkko muodostetaan kerran ja lähetetään jokaiselle prosessille
+    vain kerran prosessin alustuksessa, joten tehtävinä välitetään pelkät parametrit.
+    """
+
+    def __init__(self, processes: int | None = None) -> None:
+        """Luokan konstruktori.
+
+        Args:
+            processes (int | None, optional):
+                Prosessien määrä. Oletukseltaan None, jolloin käytetään kaikkia suorittimia.
+        """
+
+        self.processes: int = get_process_count(processes)
+
+    def sweep(
+        self,
+        courses: list[Course],
+        max_credits: Iterable[int],
+        starting_periods: Iterable[int] | None = None,
+    ) -> list[SweepResult]:
+        """Laskee aikataulut jokaiselle aloitusperiodin ja opintopisterajan yhdistelmälle.
+
+        Args:
+            courses (list[Course]): Kurssivalikoima.
+            max_credits (Iterable[int]): Kokeiltavat opintopisteylärajat.
+            starting_periods (Iterable[int] | None, optional):
+                Kokeiltavat aloitusperiodit. Oletukseltaan None, jolloin kokeillaan kaikkia.
+
+        Raises:
+            EmptyGraphError: Kursseja ei ole.
+            CycleError: Kurssit ovat keskenään riippuvia.
+
+        Returns:
+            list[SweepResult]:
+                Tulokset aloitusperiodin ja opintopisterajan mukaan järjestettynä.
+        """
+
+        if starting_periods is None:
+            starting_periods = range(1, PERIODS_PER_YEAR + 1)
+
+        graph = CourseGraph(courses)
+        max_credits = sorted(max_credits)
+        grid = [
+            (starting_period, credit_limit)
+            for starting_period in sorted(starting_periods)
+            for credit_limit in max_credits
+        ]
+
+        # Parametrit asetetaan tehtäväkohtaisesti, joten alustukseen kelpaa mikä tahansa
+        # yläraja, joka ei ole pienempi kuin yhdenkään kurssin laajuus.
+        credit_limit = max([1, *(course.credits for course in courses)])
+
+        if self.processes == 1 or len(grid) <= 1:
+            scheduler = SchedulerService()
+            initialize_worker(graph, 1, credit_limit, scheduler)
+
+            return [evaluate(scheduler, *parameters) for parameters in grid]
+
+        return list(
+            map_in_workers(
+                evaluate,
+                grid,
+                graph,
+                1,
+                credit_limit,
+                self.processes,
+                chunksize=ceil(len(grid) / (self.processes * 4)),
+            )
+        )
+
+
+sweep_service = SweepService()
@@ -0,0 +1,95 @@
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, TypeVar
+
+from entities.course_graph import CourseGraph
+from services.scheduler_service import SchedulerService
+
+T = TypeVar("T")
+
+worker_scheduler = SchedulerService()
+
+
+def get_process_count(processes: int | None) -> int:
+    """Palauttaa käytettävien prosessien määrän.
+
+    Args:
+        processes (int | None): Prosessien määrä tai None, jolloin käytetään kaikkia suorittimia.
+
+    Returns:
+        int: Prosessien määrä.
+    """
+
+    return processes or os.cpu_count() or 1
+
+
+def initialize_worker(
+    graph: CourseGraph,
+    starting_period: int,
+    max_credits: int,
+    scheduler: SchedulerService = worker_scheduler,
+) -> None:
+    """Alustaa aikatauluttajan verkolla. Prosessissa kutsutaan kerran prosessia kohden.
+
+    Args:
+        graph (CourseGraph): Kurssivalikoiman verkko.
+        starting_period (int): Aloitusperiodi.
+        max_credits (int): Opintopisteyläraja periodille.
+        scheduler (SchedulerService, optional):
+            Alustettava aikatauluttaja. Oletukseltaan prosessin worker_scheduler.
+    """
+
+    scheduler.initialize_graph(graph, starting_period, max_credits)
+
+
+def call_in_worker(function: Callable[..., T], task: tuple[Any, ...]) -> T:
+    """Kutsuu funktiota prosessin aikatauluttajalla ja tehtävän argumenteilla.
+
+    Args:
+        function (Callable[..., T]): Funktio, jonka ensimmäinen argumentti on aikatauluttaja.
+        task (tuple[Any, ...]): Funktion muut argumentit.
+
+    Returns:
+        T: Funktion tulos.
+    """
+
+    return function(worker_scheduler, *task)
+
+
+def map_in_workers(  # pylint: disable=too-many-arguments
+    function: Callable[..., T],
+    tasks: Iterable[tuple[Any, ...]],
+    graph: CourseGraph,
+    starting_period: int,
+    max_credits: int,
+    processes: int,
+    chunksize: int = 1,
+) -> Iterator[T]:
+    """Laskee tehtävät prosessipoolissa, jonka jokaisen prosessin aikatauluttaja
+    alustetaan verkolla kerran. Tehtävinä välitetään vain argumentit.
+
+    Args:
+        function (Callable[..., T]):
+            Moduulitason funktio, jonka ensimmäinen argumentti on aikatauluttaja.
+        tasks (Iterable[tuple[Any, ...]]): Funktion muut argumentit tehtävittäin.
+        graph (CourseGraph): Kurssivalikoiman verkko.
+        starting_period (int): Aikatauluttajan aloitusperiodi.
+        max_credits (int): Aikatauluttajan opintopisteyläraja periodille.
+        processes (int): Prosessien määrä.
+        chunksize (int, optional): Kerralla prosessille välitettävien tehtävien määrä.
+            Oletukseltaan 1.
+
+    Yields:
+        T: Tehtävien tulokset syötteen järjestyksessä.
+    """
+
+    with ProcessPoolExecutor(
+        processes,
+        initializer=initialize_worker,
+        initargs=(graph, starting_period, max_credits),
+    ) as executor:
+        yield from executor.map(
+            partial(call_in_worker, function), tasks, chunksize=chunksize
+        )
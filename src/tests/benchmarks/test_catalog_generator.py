@@ -0,0 +1,46 @@
+import unittest
+
+from benchmarks.catalog_generator import CatalogOptions, generate_catalog
+from entities.course_graph import CourseGraph
+from entities.course_metrics import CourseMetrics
+
+
+class TestCatalogGenerator(unittest.TestCase):
+    def setUp(self):
+        self.options = CatalogOptions(size=200, depth=8, fan_in=3, seed=1)
+
+    def test_generate_catalog_is_deterministic(self):
+        self.assertEqual(generate_catalog(self.options), generate_catalog(self.options))
+        self.assertNotEqual(
+            generate_catalog(self.options),
+            generate_catalog(self.options._replace(seed=2)),
+        )
+
+    def test_generate_catalog_creates_requested_number_of_courses(self):
+        courses = generate_catalog(self.options)
+
+        self.assertEqual([course.id for course in courses], list(range(1, 201)))
+
+    def test_generate_catalog_respects_depth_and_fan_in(self):
+        courses = generate_catalog(self.options)
+        metrics = CourseMetrics(CourseGraph(courses))
+
+        self.assertEqual(max(metrics.heights), 7)
+
+        for course in courses:
+            self.assertLessEqual(len(course.requirements), 3)
+            self.assertTrue(all(item < course.id for item in course.requirements))
+
+    def test_generate_catalog_uses_distributions(self):
+        courses = generate_catalog(self.options._replace(credits=(5,), timings=(2,)))
+
+        for course in courses:
+            self.assertEqual(course.credits, 5)
+            self.assertEqual(len(course.timing), 2)
+
+    def test_generate_catalog_with_invalid_options_raises_error(self):
+        with self.assertRaises(ValueError):
+            generate_catalog(self.options._replace(size=0))
+
+        with self.assertRaises(ValueError):
+            generate_catalog(self.options._replace(credits=()))
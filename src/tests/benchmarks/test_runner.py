@@ -0,0 +1,95 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from benchmarks.catalog_generator import CatalogOptions
+from benchmarks.runner import *
+from entities.course import Course
+
+
+class TestRunner(unittest.TestCase):
+    def setUp(self):
+        self.baseline = {
+            "stages": {
+                "import": {"time": 1.0, "memory": 100},
+                "schedule": {"time": 2.0, "memory": 0},
+            }
+        }
+
+    def test_measure_returns_time_and_memory(self):
+        calls = []
+
+        result = measure(lambda: calls.append([0] * 1000), calls.clear, repeats=2)
+
+        self.assertGreater(result.time, 0)
+        self.assertGreaterEqual(result.memory, 8000)
+        self.assertEqual(len(calls), 1)
+
+    def test_render_schedule(self):
+        a = Course("a", 5, {4}, course_id=1)
+        b = Course("b", 10, {1}, course_id=2)
+
+        rows = render_schedule([[a], [b]], 2023, 4)
+
+        self.assertEqual(
+            rows,
+            [
+                "2023, 5 op",
+                "4. periodi, 5 op",
+                str(a),
+                "2024, 10 op",
+                "1. periodi, 10 op",
+                str(b),
+            ],
+        )
+
+    def test_run_benchmark_measures_every_stage(self):
+        with TemporaryDirectory() as directory:
+            results = run_benchmark(CatalogOptions(size=50), directory, repeats=1)
+
+        self.assertEqual(
+            set(results["stages"]),
+            {
+                "import",
+                "repository_create",
+                "repository_replace_all",
+                "repository_find_all",
+                "repository_find_all_cached",
+                "schedule",
+                "export",
+                "render",
+            },
+        )
+        self.assertEqual(results["options"]["size"], 50)
+        self.assertGreater(results["scheduler"]["pops"], 0)
+
+    def test_results_can_be_written_and_read(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+
+            write_results(self.baseline, path)
+
+            self.assertEqual(read_results(path), self.baseline)
+
+    def test_compare_results_detects_regression(self):
+        current = {
+            "stages": {
+                "import": {"time": 1.05, "memory": 200},
+                "schedule": {"time": 1.0, "memory": 0},
+            }
+        }
+
+        comparisons = compare_results(self.baseline, current, 0.1)
+        regressed = {
+            (item.stage, item.metric) for item in comparisons if item.regressed
+        }
+
+        self.assertEqual(len(comparisons), 4)
+        self.assertEqual(regressed, {("import", "memory")})
+
+    def test_compare_results_ignores_missing_stages(self):
+        current = {"stages": {"import": {"time": 1.0, "memory": 100}}}
+
+        comparisons = compare_results(self.baseline, current)
+
+        self.assertEqual({item.stage for item in comparisons}, {"import"})
@@ -80,8 +80,20 @@ class TestCourse(unittest.TestCase):
         self.assertEqual(str(course1), "200: Ohte, 5 op")
         self.assertEqual(str(course2), "10: OhJa, 5 op")
 
-    def test_setting_negative_id_raises_error(self):
+    def test_with_id_returns_copy_with_new_id(self):
+        course = Course("A", 3, {1}, {2}, course_id=-1)
+
+        self.assertEqual(course.with_id(5), Course("A", 3, {1}, {2}, course_id=5))
+        self.assertEqual(course.id, -1)
+
+    def test_with_negative_id_raises_error(self):
         course = Course("A", 3, course_id=1)
 
         with self.assertRaises(ValueError):
-            course.id = -10
+            course.with_id(-10)
+
+    def test_id_cannot_be_changed(self):
+        course = Course("A", 3, course_id=1)
+
+        with self.assertRaises(AttributeError):
+            course.id = 2
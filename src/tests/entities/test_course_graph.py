@@ -0,0 +1,52 @@
+import unittest
+
+from entities.course import Course
+from entities.course_graph import CourseGraph
+
+
+class TestCourseGraph(unittest.TestCase):
+    def setUp(self) -> None:
+        self.courses = [
+            Course("c", 10, {3}, {1, 2}, course_id=5),
+            Course("a", 5, {1, 2}, course_id=1),
+            Course("b", 5, {2}, {1, 99}, course_id=2),
+        ]
+        self.graph = CourseGraph(self.courses)
+
+    def test_empty_graph(self):
+        graph = CourseGraph()
+
+        self.assertEqual(len(graph), 0)
+        self.assertEqual(graph.courses, ())
+
+    def test_courses_are_indexed_in_id_order(self):
+        self.assertEqual([course.id for course in self.graph.courses], [1, 2, 5])
+        self.assertEqual(self.graph.index(1), 0)
+        self.assertEqual(self.graph.index(5), 2)
+
+    def test_index_returns_none_with_non_existing_course(self):
+        self.assertIsNone(self.graph.index(99))
+
+    def test_neighbors(self):
+        self.assertEqual(list(self.graph.neighbors(0)), [1, 2])
+        self.assertEqual(list(self.graph.neighbors(1)), [2])
+        self.assertEqual(list(self.graph.neighbors(2)), [])
+
+    def test_edges_are_stored_in_csr_format(self):
+        self.assertEqual(list(self.graph.offsets), [0, 2, 3, 3])
+        self.assertEqual(list(self.graph.targets), [1, 2, 2])
+
+    def test_timings_are_stored_as_bitmasks(self):
+        self.assertEqual(list(self.graph.timings), [0b110, 0b100, 0b1000])
+        self.assertEqual(self.graph.periods(0), (1, 2))
+
+    def test_in_degrees_count_all_requirements(self):
+        self.assertEqual(list(self.graph.in_degrees), [0, 2, 2])
+
+    def test_heaps_contain_courses_without_requirements(self):
+        self.assertEqual(self.graph.heaps[1], ((5, 0),))
+        self.assertEqual(self.graph.heaps[2], ((5, 0),))
+        self.assertEqual(self.graph.heaps[3], ())
+
+    def test_mask(self):
+        self.assertEqual(self.graph.mask([1, 5, 99]), 0b101)
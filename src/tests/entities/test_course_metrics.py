@@ -0,0 +1,90 @@
+import unittest
+
+from entities.course import Course
+from entities.course_graph import CourseGraph
+from entities.course_metrics import CourseMetrics
+
+
+class TestCourseMetrics(unittest.TestCase):
+    def setUp(self):
+        self.courses = [
+            Course("A", 5, {1}, course_id=1),
+            Course("B", 5, {3}, {1}, course_id=2),
+            Course("C", 5, {2}, {2}, course_id=3),
+            Course("D", 5, {1, 2}, {1}, course_id=4),
+            Course("E", 5, {1}, {10}, course_id=5),
+            Course("F", 5, {1}, {5}, course_id=6),
+        ]
+        self.metrics = CourseMetrics(CourseGraph(self.courses))
+
+    def test_height(self):
+        self.assertEqual(self.metrics.height(1), 2)
+        self.assertEqual(self.metrics.height(2), 1)
+        self.assertEqual(self.metrics.height(3), 0)
+        self.assertEqual(self.metrics.height(100), -1)
+
+    def test_dependent_count(self):
+        self.assertEqual(self.metrics.dependent_count(1), 3)
+        self.assertEqual(self.metrics.dependent_count(2), 1)
+        self.assertEqual(self.metrics.dependent_count(4), 0)
+        self.assertEqual(self.metrics.dependent_count(100), -1)
+
+    def test_dependent_count_counts_shared_dependents_once(self):
+        courses = [
+            Course("A", 5, {1}, course_id=1),
+            Course("B", 5, {1}, {1}, course_id=2),
+            Course("C", 5, {1}, {1}, course_id=3),
+            Course("D", 5, {1}, {2, 3}, course_id=4),
+        ]
+
+        metrics = CourseMetrics(CourseGraph(courses))
+
+        self.assertEqual(metrics.dependent_count(1), 3)
+
+    def test_dependent_count_matches_reachable_courses(self):
+        courses = [
+            Course(str(i), 5, {1}, {i // 2, i // 3} - {0}, course_id=i)
+            for i in range(1, 40)
+        ]
+        metrics = CourseMetrics(CourseGraph(courses))
+
+        for course in courses:
+            reachable = set()
+            stack = [course.id]
+
+            while stack:
+                current = stack.pop()
+
+                for other in courses:
+                    if current in other.requirements and other.id not in reachable:
+                        reachable.add(other.id)
+                        stack.append(other.id)
+
+            self.assertEqual(metrics.dependent_count(course.id), len(reachable))
+
+    def test_earliest_period(self):
+        self.assertEqual(self.metrics.earliest_period(1, 1), 0)
+        self.assertEqual(self.metrics.earliest_period(2, 1), 2)
+        self.assertEqual(self.metrics.earliest_period(3, 1), 5)
+        self.assertEqual(self.metrics.earliest_period(4, 1), 0)
+
+    def test_earliest_period_with_starting_period(self):
+        self.assertEqual(self.metrics.earliest_period(1, 2), 3)
+        self.assertEqual(self.metrics.earliest_period(4, 2), 3)
+
+    def test_earliest_period_is_negative_with_missing_requirement(self):
+        self.assertEqual(self.metrics.earliest_period(5, 1), -1)
+        self.assertEqual(self.metrics.earliest_period(6, 1), -1)
+
+    def test_order_is_topological(self):
+        position = {index: i for i, index in enumerate(self.metrics.order)}
+
+        for index in range(len(self.metrics.graph)):
+            for neighbor in self.metrics.graph.neighbors(index):
+                self.assertLess(position[index], position[neighbor])
+
+    def test_cycle_raises_error(self):
+        courses = [Course("A", 5, {1}, {2}, 1), Course("B", 5, {1}, {1}, 2)]
+
+        with self.assertRaises(ValueError):
+            CourseMetrics(CourseGraph(courses))
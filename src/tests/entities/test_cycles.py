@@ -0,0 +1,29 @@
+import unittest
+
+from entities.course import Course
+from entities.course_graph import CourseGraph
+from entities.cycles import find_cycle
+
+
+class TestCycles(unittest.TestCase):
+    def test_find_cycle_without_cycle(self):
+        graph = CourseGraph(
+            [Course("a", 5, {1}, course_id=1), Course("b", 5, {1}, {1}, course_id=2)]
+        )
+
+        self.assertEqual(find_cycle(graph), [])
+
+    def test_find_cycle_returns_cycle_in_edge_direction(self):
+        graph = CourseGraph(
+            [
+                Course("a", 5, {1}, course_id=1),
+                Course("b", 5, {1}, {1, 3}, course_id=2),
+                Course("c", 5, {1}, {2}, course_id=3),
+            ]
+        )
+
+        cycle = [graph.courses[index] for index in find_cycle(graph)]
+
+        self.assertCountEqual([course.id for course in cycle], [2, 3])
+        self.assertIn(cycle[0].id, cycle[1].requirements)
+        self.assertIn(cycle[1].id, cycle[0].requirements)
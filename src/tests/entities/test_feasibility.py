@@ -0,0 +1,96 @@
+import unittest
+
+from entities.course import Course
+from entities.course_graph import CourseGraph
+from entities.feasibility import *
+
+
+class TestFeasibility(unittest.TestCase):
+    def test_find_unschedulable_returns_empty_list_for_schedulable_courses(self):
+        courses = [
+            Course("A", 5, {1}, course_id=1),
+            Course("B", 5, {2}, {1}, course_id=2),
+        ]
+
+        self.assertEqual(find_unschedulable(CourseGraph(courses)), [])
+
+    def test_find_unschedulable_detects_invalid_timing(self):
+        courses = [
+            Course("A", 5, {0, 7}, course_id=1),
+            Course("B", 5, set(), course_id=2),
+            Course("C", 5, {1, 2}, course_id=3),
+        ]
+
+        self.assertEqual(
+            find_unschedulable(CourseGraph(courses)),
+            [
+                UnschedulableCourse(1, UnschedulableReason.TIMING, (0, 7)),
+                UnschedulableCourse(2, UnschedulableReason.TIMING, ()),
+            ],
+        )
+
+    def test_find_unschedulable_reports_invalid_periods_next_to_valid_period(self):
+        courses = [
+            Course("A", 5, {1, 7}, course_id=1),
+            Course("B", 5, {2}, {1}, course_id=2),
+        ]
+
+        self.assertEqual(
+            find_unschedulable(CourseGraph(courses)),
+            [UnschedulableCourse(1, UnschedulableReason.INVALID_PERIODS, (7,))],
+        )
+
+    def test_find_unschedulable_prefers_missing_requirements_over_invalid_periods(
+        self,
+    ):
+        courses = [Course("A", 5, {1, 7}, {10}, course_id=1)]
+
+        self.assertEqual(
+            find_unschedulable(CourseGraph(courses)),
+            [UnschedulableCourse(1, UnschedulableReason.MISSING_REQUIREMENTS, (10,))],
+        )
+
+    def test_find_unschedulable_detects_missing_requirements(self):
+        courses = [
+            Course("A", 5, {1}, course_id=1),
+            Course("B", 5, {2}, {1, 10, 11}, course_id=2),
+        ]
+
+        self.assertEqual(
+            find_unschedulable(CourseGraph(courses)),
+            [
+                UnschedulableCourse(
+                    2, UnschedulableReason.MISSING_REQUIREMENTS, (10, 11)
+                )
+            ],
+        )
+
+    def test_find_unschedulable_propagates_to_dependent_courses(self):
+        courses = [
+            Course("A", 5, {5}, course_id=1),
+            Course("B", 5, {1}, {1}, course_id=2),
+            Course("C", 5, {1}, {10}, course_id=3),
+            Course("D", 5, {2}, {2, 3}, course_id=4),
+            Course("E", 5, {3}, course_id=5),
+        ]
+
+        unschedulable = find_unschedulable(CourseGraph(courses))
+
+        self.assertEqual(
+            unschedulable,
+            [
+                UnschedulableCourse(1, UnschedulableReason.TIMING, (5,)),
+                UnschedulableCourse(
+                    2, UnschedulableReason.UNSCHEDULABLE_REQUIREMENTS, (1,)
+                ),
+                UnschedulableCourse(3, UnschedulableReason.MISSING_REQUIREMENTS, (10,)),
+                UnschedulableCourse(
+                    4, UnschedulableReason.UNSCHEDULABLE_REQUIREMENTS, (2, 3)
+                ),
+            ],
+        )
+
+    def test_unschedulable_course_str(self):
+        course = UnschedulableCourse(2, UnschedulableReason.MISSING_REQUIREMENTS, (3,))
+
+        self.assertEqual(str(course), "2: esitietoja puuttuu valikoimasta (3)")
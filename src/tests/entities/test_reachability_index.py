@@ -0,0 +1,88 @@
+import unittest
+
+from entities.course import Course
+from entities.reachability_index import ReachabilityIndex
+
+
+class TestReachabilityIndex(unittest.TestCase):
+    def setUp(self):
+        self.courses = [
+            Course("a", 5, {1}, course_id=1),
+            Course("b", 5, {2}, {1}, course_id=2),
+            Course("c", 5, {3}, {2}, course_id=3),
+            Course("d", 5, {4}, {1}, course_id=4),
+            Course("e", 5, {1}, course_id=5),
+        ]
+        self.index = ReachabilityIndex(self.courses)
+
+    def test_len_and_contains(self):
+        self.assertEqual(len(self.index), 5)
+        self.assertIn(3, self.index)
+        self.assertNotIn(6, self.index)
+
+    def test_ancestors(self):
+        self.assertEqual(self.index.ancestors(3), {1, 2})
+        self.assertEqual(self.index.ancestors(1), set())
+        self.assertEqual(self.index.ancestors(6), set())
+
+    def test_descendants(self):
+        self.assertEqual(self.index.descendants(1), {2, 3, 4})
+        self.assertEqual(self.index.descendants(3), set())
+
+    def test_requires(self):
+        self.assertTrue(self.index.requires(3, 1))
+        self.assertFalse(self.index.requires(1, 3))
+        self.assertFalse(self.index.requires(3, 5))
+
+    def test_creates_cycle(self):
+        self.assertTrue(self.index.creates_cycle(1, 3))
+        self.assertTrue(self.index.creates_cycle(2, 2))
+        self.assertFalse(self.index.creates_cycle(3, 4))
+
+    def test_get_valid_requirements(self):
+        self.assertEqual(self.index.get_valid_requirements(2), {1, 4, 5})
+        self.assertEqual(self.index.get_valid_requirements(-1), {1, 2, 3, 4, 5})
+
+    def test_add_course_updates_ancestors_of_dependents(self):
+        self.index.add_course(Course("b", 5, {2}, {5}, course_id=2))
+
+        self.assertEqual(self.index.ancestors(3), {2, 5})
+        self.assertEqual(self.index.descendants(1), {4})
+        self.assertEqual(self.index.descendants(5), {2, 3})
+
+    def test_add_course_resolves_missing_requirement(self):
+        self.index.add_course(Course("g", 5, {1}, {6}, course_id=7))
+        self.index.add_course(Course("f", 5, {1}, {3}, course_id=6))
+
+        self.assertEqual(self.index.ancestors(7), {1, 2, 3, 6})
+        self.assertEqual(self.index.descendants(2), {3, 6, 7})
+
+    def test_remove_course_removes_requirements_to_it(self):
+        self.index.remove_course(2)
+
+        self.assertNotIn(2, self.index)
+        self.assertEqual(self.index.ancestors(3), set())
+        self.assertEqual(self.index.descendants(1), {4})
+
+    def test_remove_course_with_non_existing_course(self):
+        self.index.remove_course(6)
+
+        self.assertEqual(len(self.index), 5)
+
+    def test_removed_slot_is_reused(self):
+        self.index.remove_course(2)
+        self.index.add_course(Course("f", 5, {1}, {3}, course_id=6))
+
+        self.assertEqual(self.index.ancestors(6), {3})
+        self.assertEqual(self.index.get_valid_requirements(3), {1, 4, 5})
+
+    def test_cycle_is_resolved_after_removing_requirement(self):
+        self.index.add_course(Course("a", 5, {1}, {3}, course_id=1))
+
+        self.assertTrue(self.index.requires(1, 1))
+        self.assertEqual(self.index.ancestors(2), {1, 2, 3})
+
+        self.index.add_course(Course("a", 5, {1}, course_id=1))
+
+        self.assertEqual(self.index.ancestors(1), set())
+        self.assertEqual(self.index.ancestors(3), {1, 2})
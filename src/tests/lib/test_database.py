@@ -1,6 +1,18 @@
+import os
+import time
 import unittest
+from sqlite3 import DatabaseError, connect
+from tempfile import TemporaryDirectory
 
-from lib.database import database
+from config import (
+    DATABASE_CACHE_SIZE,
+    DATABASE_JOURNAL_MODE,
+    DATABASE_SYNCHRONOUS,
+    DATABASE_TEMP_STORE,
+)
+from lib.database import Database, database
+from lib.migrations import MIGRATIONS
+from lib.packing import unpack_requirements, unpack_timing
 
 
 class TestDatabase(unittest.TestCase):
@@ -10,6 +22,9 @@ class TestDatabase(unittest.TestCase):
 
         database.drop_tables()
 
+    def tearDown(self):
+        database.initialize()
+
     def test_create_tables(self):
         database.create_tables()
 
@@ -53,4 +68,191 @@ class TestDatabase(unittest.TestCase):
 
         tables = {row["name"] for row in rows}
 
-        self.assertEqual(tables, {"Courses", "Requirements", "Periods"})
+        self.assertEqual(tables, {"Courses"})
+
+    def test_initialize_database_applies_migrations(self):
+        database.initialize()
+
+        self.assertEqual(database.version, len(MIGRATIONS))
+
+    def test_migrate_upgrades_existing_database(self):
+        database.create_tables()
+        self.cursor.execute("PRAGMA foreign_keys = OFF")
+        self.cursor.execute(
+            "INSERT INTO Courses (id, name, credits) VALUES (1, 'A', 5)"
+        )
+        self.cursor.execute(
+            "INSERT INTO Courses (id, name, credits) VALUES (2, 'B', 5)"
+        )
+        self.cursor.execute("INSERT INTO Requirements VALUES (1, 3)")
+        self.cursor.execute("INSERT INTO Requirements VALUES (1, 2)")
+        self.cursor.execute("INSERT INTO Requirements VALUES (4, 1)")
+        self.cursor.execute("INSERT INTO Periods VALUES (1, 1)")
+        self.cursor.execute("INSERT INTO Periods VALUES (1, 3)")
+        self.cursor.execute("INSERT INTO Periods VALUES (1, 70)")
+        self.cursor.execute("INSERT INTO Periods VALUES (4, 2)")
+        self.connection.commit()
+        self.cursor.execute("PRAGMA foreign_keys = ON")
+
+        database.migrate()
+
+        rows = self.cursor.execute(
+            "SELECT id, name, timing, requirements FROM Courses ORDER BY id"
+        ).fetchall()
+
+        self.assertEqual(database.version, len(MIGRATIONS))
+        self.assertEqual(
+            [
+                (
+                    row["id"],
+                    row["name"],
+                    unpack_timing(row["timing"]),
+                    list(unpack_requirements(row["requirements"])),
+                )
+                for row in rows
+            ],
+            [(1, "A", {1, 3}, [2, 3]), (2, "B", set(), [])],
+        )
+        self.assertEqual(
+            [
+                row["name"]
+                for row in self.cursor.execute("SELECT name FROM sqlite_master")
+            ],
+            ["Courses"],
+        )
+
+        database.migrate()
+
+        self.assertEqual(database.version, len(MIGRATIONS))
+
+    def test_migrate_raises_error_if_database_is_newer(self):
+        database.create_tables()
+        self.cursor.execute(f"PRAGMA user_version = {len(MIGRATIONS) + 1}")
+
+        with self.assertRaises(IOError):
+            database.migrate()
+
+        database.initialize()
+
+    def test_configure_applies_pragmas(self):
+        database.configure()
+
+        def get_pragma(name: str) -> object:
+            return self.cursor.execute(f"PRAGMA {name}").fetchone()[0]
+
+        self.assertEqual(get_pragma("journal_mode"), DATABASE_JOURNAL_MODE.lower())
+        self.assertEqual(
+            get_pragma("synchronous"),
+            ["OFF", "NORMAL", "FULL", "EXTRA"].index(DATABASE_SYNCHRONOUS),
+        )
+        self.assertEqual(get_pragma("cache_size"), DATABASE_CACHE_SIZE)
+        self.assertEqual(
+            get_pragma("temp_store"),
+            ["DEFAULT", "FILE", "MEMORY"].index(DATABASE_TEMP_STORE),
+        )
+
+    def test_database_is_opened_on_first_use(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "lazy.db")
+            lazy_database = Database(path)
+
+            self.assertFalse(lazy_database.connected)
+            self.assertFalse(os.path.exists(path))
+
+            self.assertEqual(lazy_database.version, len(MIGRATIONS))
+            self.assertTrue(lazy_database.connected)
+
+            lazy_database.close()
+
+            self.assertFalse(lazy_database.connected)
+
+    def test_in_memory_database_is_initialized(self):
+        memory_database = Database(":memory:")
+
+        self.assertEqual(memory_database.version, len(MIGRATIONS))
+
+        memory_database.close()
+
+    def test_in_memory_database_is_loaded_from_file(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.db")
+            file_database = Database(path)
+            file_database.cursor.execute(
+                "INSERT INTO Courses (id, name, credits) VALUES (1, 'A', 5)"
+            )
+            file_database.connection.commit()
+            file_database.close()
+
+            memory_database = Database(path, in_memory=True, snapshot_interval=0)
+            rows = memory_database.cursor.execute("SELECT name FROM Courses").fetchall()
+
+            self.assertEqual([row["name"] for row in rows], ["A"])
+            self.assertEqual(memory_database.version, len(MIGRATIONS))
+
+            memory_database.close()
+
+    def test_snapshot_writes_committed_state_to_file(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.db")
+            memory_database = Database(path, in_memory=True, snapshot_interval=0)
+            memory_database.cursor.execute(
+                "INSERT INTO Courses (id, name, credits) VALUES (1, 'A', 5)"
+            )
+
+            self.assertRaises(IOError, memory_database.snapshot)
+            self.assertFalse(os.path.exists(path))
+
+            memory_database.connection.commit()
+            memory_database.snapshot()
+
+            self.assertEqual(self.__count_courses(path), 1)
+
+            memory_database.close()
+
+    def test_close_writes_snapshot_without_uncommitted_changes(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.db")
+            memory_database = Database(path, in_memory=True, snapshot_interval=0)
+            memory_database.cursor.execute(
+                "INSERT INTO Courses (id, name, credits) VALUES (1, 'A', 5)"
+            )
+            memory_database.connection.commit()
+            memory_database.cursor.execute(
+                "INSERT INTO Courses (id, name, credits) VALUES (2, 'B', 5)"
+            )
+
+            memory_database.close()
+
+            self.assertFalse(memory_database.connected)
+            self.assertEqual(self.__count_courses(path), 1)
+
+    def test_snapshot_is_written_periodically(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.db")
+            memory_database = Database(path, in_memory=True, snapshot_interval=0.01)
+            memory_database.cursor.execute(
+                "INSERT INTO Courses (id, name, credits) VALUES (1, 'A', 5)"
+            )
+            memory_database.connection.commit()
+
+            deadline = time.monotonic() + 2
+            count = 0
+
+            while count == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+                try:
+                    count = self.__count_courses(path)
+                except DatabaseError:
+                    pass
+
+            self.assertEqual(count, 1)
+
+            memory_database.close()
+
+    def __count_courses(self, path):
+        connection = connect(path)
+        count = connection.execute("SELECT COUNT(*) FROM Courses").fetchone()[0]
+        connection.close()
+
+        return count
@@ -0,0 +1,51 @@
+import unittest
+
+from lib.lru_cache import CacheInfo, LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = LRUCache(2)
+
+    def test_negative_size_raises_error(self):
+        with self.assertRaises(ValueError):
+            LRUCache(-1)
+
+    def test_get_returns_stored_value(self):
+        self.cache.put("a", 1)
+
+        self.assertEqual(self.cache.get("a"), 1)
+
+    def test_get_returns_none_with_missing_key(self):
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_put_evicts_least_recently_used(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.get("a")
+        self.cache.put("c", 3)
+
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertIn("c", self.cache)
+
+    def test_zero_size_stores_nothing(self):
+        cache = LRUCache(0)
+        cache.put("a", 1)
+
+        self.assertEqual(len(cache), 0)
+
+    def test_discard(self):
+        self.cache.put("a", 1)
+        self.cache.discard("a")
+        self.cache.discard("b")
+
+        self.assertNotIn("a", self.cache)
+
+    def test_info_counts_hits_and_misses(self):
+        self.cache.put("a", 1)
+        self.cache.get("a")
+        self.cache.get("b")
+        self.cache.clear()
+
+        self.assertEqual(self.cache.info(), CacheInfo(1, 1, 2, 0))
@@ -0,0 +1,50 @@
+import unittest
+
+from lib.packing import (
+    MAX_PERIOD,
+    pack_requirements,
+    pack_timing,
+    unpack_requirements,
+    unpack_timing,
+)
+
+
+class TestPacking(unittest.TestCase):
+    def test_pack_timing_sets_bit_of_each_period(self):
+        self.assertEqual(pack_timing(frozenset({1, 3})), 0b1010)
+
+    def test_pack_timing_of_empty_timing_is_zero(self):
+        self.assertEqual(pack_timing(frozenset()), 0)
+
+    def test_pack_timing_raises_error_if_period_does_not_fit(self):
+        with self.assertRaises(ValueError):
+            pack_timing(frozenset({MAX_PERIOD + 1}))
+
+        with self.assertRaises(ValueError):
+            pack_timing(frozenset({-1}))
+
+    def test_unpack_timing_returns_packed_timing(self):
+        timing = frozenset({0, 2, 4, MAX_PERIOD})
+
+        self.assertEqual(unpack_timing(pack_timing(timing)), timing)
+
+    def test_pack_requirements_is_little_endian_in_ascending_order(self):
+        self.assertEqual(
+            pack_requirements(frozenset({256, 1})),
+            b"\x01\x00\x00\x00\x00\x01\x00\x00",
+        )
+
+    def test_unpack_requirements_returns_packed_requirements(self):
+        requirements = frozenset({1, 5, 2**31 - 1})
+
+        self.assertEqual(
+            list(unpack_requirements(pack_requirements(requirements))),
+            sorted(requirements),
+        )
+
+    def test_unpack_requirements_of_empty_blob_is_empty(self):
+        self.assertEqual(list(unpack_requirements(b"")), [])
+
+    def test_pack_requirements_raises_error_if_id_does_not_fit(self):
+        with self.assertRaises(ValueError):
+            pack_requirements(frozenset({2**31}))
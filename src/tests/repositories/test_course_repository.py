@@ -1,7 +1,10 @@
 import unittest
+from sqlite3 import IntegrityError
+from unittest.mock import patch
 
 from entities.course import Course
-from repositories.course_repository import course_repository
+from lib.database import database
+from repositories.course_repository import CourseRepository, course_repository
 
 
 class TestCourseRepository(unittest.TestCase):
@@ -30,16 +33,37 @@ class TestCourseRepository(unittest.TestCase):
     def test_create_updates_existing_course(self):
         course_repository.create(Course("OhJa", 5, {1, 2}, course_id=20))
 
-        course = Course("OhPe", 5, course_id=20)
-        course_repository.create(course)
+        course = course_repository.create(Course("OhPe", 5, course_id=20))
 
         updated_course = course_repository.find_by_id(20)
 
         self.assertEqual(course, updated_course)
 
+    def test_create_writes_course_as_one_row(self):
+        course_repository.create(Course("OhTe", 5, {1, 2}, {1, 2}, course_id=3))
+
+        statements = []
+        database.connection.set_trace_callback(statements.append)
+
+        try:
+            course_repository.create(Course("OhTe", 10, {2, 3}, {1, 2}, course_id=3))
+        finally:
+            database.connection.set_trace_callback(None)
+
+        self.assertEqual(
+            course_repository.find_by_id(3), Course("OhTe", 10, {2, 3}, {1, 2}, 3)
+        )
+        self.assertEqual(
+            CourseRepository(database, 0).find_by_id(3),
+            Course("OhTe", 10, {2, 3}, {1, 2}, 3),
+        )
+        self.assertEqual(
+            sum(statement.lstrip().startswith("INSERT") for statement in statements), 1
+        )
+        self.assertEqual(sum("COMMIT" in statement for statement in statements), 1)
+
     def test_create_with_existing_id(self):
-        course = Course("OhJa", 5, {1, 2}, course_id=20)
-        course_repository.create(course)
+        course = course_repository.create(Course("OhJa", 5, {1, 2}, course_id=20))
 
         self.assertEqual(course, course_repository.find_by_id(20))
 
@@ -52,6 +76,19 @@ class TestCourseRepository(unittest.TestCase):
 
         self.assertEqual(len(course_repository.find_all()), 0)
 
+    def test_delete_removes_requirements_to_course(self):
+        course_repository.create(Course("A", 5, {1}, {1, 7}, course_id=2))
+        course_repository.create(Course("B", 5, {1}, {256, 512}, course_id=3))
+        course_repository.find_all()
+
+        course_repository.delete(1)
+
+        self.assertEqual(course_repository.find_requirements(2), {7})
+        self.assertEqual(course_repository.find_requirements(3), {256, 512})
+        self.assertEqual(
+            CourseRepository(database, 0).find_all(), course_repository.find_all()
+        )
+
     def test_delete_all(self):
         course_repository.create(self.course_ohja)
         course_repository.create(self.course_ohte)
@@ -82,9 +119,26 @@ class TestCourseRepository(unittest.TestCase):
     def test_find_all_returns_empty_list_if_no_courses(self):
         self.assertEqual(course_repository.find_all(), [])
 
+    def test_find_all_uses_one_query(self):
+        for course_id in range(1, 21):
+            course_repository.create(
+                Course(str(course_id), 5, {1, 2}, {course_id - 1}, course_id)
+            )
+
+        statements = []
+        database.connection.set_trace_callback(statements.append)
+
+        try:
+            courses = CourseRepository(database, 0).find_all()
+        finally:
+            database.connection.set_trace_callback(None)
+
+        self.assertEqual(len(courses), 20)
+        self.assertEqual(courses[1], Course("2", 5, {1, 2}, {1}, 2))
+        self.assertEqual(len(statements), 1)
+
     def test_find_requirements(self):
-        course = Course("Tikake", 5, requirements={5, 3, 2})
-        course_repository.create(course)
+        course = course_repository.create(Course("Tikake", 5, requirements={5, 3, 2}))
 
         self.assertEqual(course_repository.find_requirements(course.id), {5, 3, 2})
 
@@ -92,14 +146,12 @@ class TestCourseRepository(unittest.TestCase):
         self.assertEqual(course_repository.find_requirements(2), set())
 
     def test_find_requirements_returns_empty_set_if_no_requirements(self):
-        course = Course("Linis 1", 5)
-        course_repository.create(course)
+        course = course_repository.create(Course("Linis 1", 5))
 
         self.assertEqual(course_repository.find_requirements(course.id), set())
 
     def test_find_timing(self):
-        course = Course("Tikake", 5, timing={5, 3, 2})
-        course_repository.create(course)
+        course = course_repository.create(Course("Tikake", 5, timing={5, 3, 2}))
 
         self.assertEqual(course_repository.find_timing(course.id), {5, 3, 2})
 
@@ -107,7 +159,239 @@ class TestCourseRepository(unittest.TestCase):
         self.assertEqual(course_repository.find_timing(2), set())
 
     def test_find_timing_returns_empty_set_if_no_timing(self):
-        course = Course("Linis 1", 5)
-        course_repository.create(course)
+        course = course_repository.create(Course("Linis 1", 5))
 
         self.assertEqual(course_repository.find_timing(course.id), set())
+
+    def test_create_updating_course_keeps_requirements_of_other_courses(self):
+        course_repository.create(self.course_ohja)
+        course_repository.create(self.course_ohte)
+
+        course_repository.create(Course("OhJa", 10, {1}, course_id=1))
+
+        self.assertEqual(course_repository.find_requirements(3), {1})
+
+    def test_create_all(self):
+        course_repository.create(Course("OhPe", 5, {1}, course_id=3))
+        new_course = Course("Tikape", 5, {3})
+
+        created = course_repository.create_all(
+            [self.course_ohja, self.course_ohte, new_course]
+        )
+
+        self.assertEqual(created[2], new_course.with_id(4))
+        self.assertEqual(new_course.id, -1)
+        self.assertEqual(course_repository.find_all(), created)
+
+    def test_create_all_rolls_back_on_error(self):
+        course_repository.create(self.course_ohja)
+        fingerprint = course_repository.fingerprint
+        new_course = Course("Tikape", 5, {3})
+
+        with self.assertRaises(IntegrityError):
+            course_repository.create_all(
+                [new_course, self.course_ohte, Course("OhTe", 5, {2}, course_id=3)]
+            )
+
+        self.assertEqual(new_course.id, -1)
+        self.assertEqual(course_repository.find_all(), [self.course_ohja])
+        self.assertEqual(course_repository.fingerprint, fingerprint)
+
+    def test_replace_all(self):
+        course_repository.create(Course("OhPe", 5, {1}, course_id=2))
+        course_repository.reachability
+
+        course_repository.replace_all([self.course_ohja, self.course_ohte])
+
+        self.assertEqual(
+            course_repository.find_all(), [self.course_ohja, self.course_ohte]
+        )
+        self.assertEqual(course_repository.reachability.ancestors(3), {1})
+
+    def test_find_by_id_returns_cached_course(self):
+        repository = CourseRepository(database)
+        repository.create(self.course_ohja)
+
+        course = repository.find_by_id(1)
+
+        self.assertIs(repository.find_by_id(1), course)
+        self.assertEqual(repository.cache_info().hits, 2)
+
+    def test_find_all_returns_cached_courses(self):
+        course_repository.create(self.course_ohja)
+        repository = CourseRepository(database)
+        courses = repository.find_all()
+
+        statements = []
+        database.connection.set_trace_callback(statements.append)
+
+        try:
+            self.assertEqual(repository.find_all(), courses)
+            self.assertIs(repository.find_all()[0], courses[0])
+        finally:
+            database.connection.set_trace_callback(None)
+
+        self.assertEqual(statements, [])
+
+    def test_cache_is_updated_when_courses_change(self):
+        course_repository.create(self.course_ohja)
+        course_repository.create(self.course_ohte)
+        course_repository.find_all()
+
+        course_ohpe = Course("OhPe", 5, {1}, course_id=2)
+        course_repository.create(course_ohpe)
+        course_repository.delete(1)
+
+        expected = [course_ohpe, Course("OhTe", 5, {2, 4}, course_id=3)]
+
+        self.assertEqual(course_repository.find_all(), expected)
+        self.assertEqual(course_repository.find_by_id(3), expected[1])
+        self.assertIsNone(course_repository.find_by_id(1))
+        self.assertEqual(CourseRepository(database, 0).find_all(), expected)
+
+    def test_find_all_is_not_cached_if_catalog_exceeds_cache_size(self):
+        repository = CourseRepository(database, 1)
+        repository.create(self.course_ohja)
+        repository.create(self.course_ohte)
+
+        self.assertEqual(repository.find_all(), [self.course_ohja, self.course_ohte])
+        self.assertIsNot(repository.find_all()[0], repository.find_all()[0])
+
+    def test_find_all_without_cache_reads_database(self):
+        repository = CourseRepository(database, 0)
+        repository.find_all()
+
+        course_repository.create(self.course_ohja)
+
+        self.assertEqual(repository.find_all(), [self.course_ohja])
+
+    def test_delete_subtree(self):
+        course_repository.create(self.course_ohja)
+        course_repository.create(Course("OhPe", 5, {1}, course_id=2))
+        course_repository.create(self.course_ohte)
+        course_repository.create(Course("Tikape", 5, {3}, {2, 3}, course_id=4))
+        course_repository.create(Course("Tira", 5, {3}, {2, 5}, course_id=6))
+        course_repository.find_all()
+        course_repository.reachability
+
+        self.assertEqual(course_repository.delete_subtree(1), [1, 3, 4])
+        self.assertEqual(
+            course_repository.find_all(),
+            [Course("OhPe", 5, {1}, course_id=2), Course("Tira", 5, {3}, {2, 5}, 6)],
+        )
+        self.assertEqual(
+            CourseRepository(database, 0).find_all(), course_repository.find_all()
+        )
+        self.assertEqual(course_repository.reachability.descendants(2), {6})
+        self.assertEqual(course_repository.find_requirements(4), set())
+
+    def test_delete_subtree_does_not_build_reachability_index(self):
+        course_repository.create(self.course_ohja)
+        course_repository.create(self.course_ohte)
+
+        with patch(
+            "repositories.course_repository.ReachabilityIndex"
+        ) as reachability_index:
+            self.assertEqual(course_repository.delete_subtree(1), [1, 3])
+
+        reachability_index.assert_not_called()
+
+    def test_delete_finds_dependents_after_earlier_changes(self):
+        course_repository.create(self.course_ohja)
+        course_repository.create(self.course_ohte)
+        course_repository.delete(7)
+        course_repository.create(Course("Tikape", 5, {3}, {1, 3}, course_id=4))
+        course_repository.create(Course("OhTe", 5, {2}, {7}, course_id=3))
+        course_repository.create(Course("Tira", 5, {3}, {3, 7}, course_id=6))
+
+        course_repository.delete(7)
+        course_repository.delete(1)
+
+        self.assertEqual(
+            course_repository.find_all(),
+            [
+                Course("OhTe", 5, {2}, course_id=3),
+                Course("Tikape", 5, {3}, {3}, 4),
+                Course("Tira", 5, {3}, {3}, 6),
+            ],
+        )
+        self.assertEqual(
+            CourseRepository(database, 0).find_all(), course_repository.find_all()
+        )
+        self.assertEqual(course_repository.delete_subtree(3), [3, 4, 6])
+
+    def test_delete_subtree_returns_empty_list_if_course_does_not_exist(self):
+        self.assertEqual(course_repository.delete_subtree(100), [])
+
+    def test_delete_subtree_deletes_dependents_of_missing_course(self):
+        course_repository.create(self.course_ohja)
+        course_repository.create(Course("Tira", 5, {3}, {1, 5}, course_id=6))
+        course_repository.create(Course("Lama", 5, {3}, {6}, course_id=7))
+
+        self.assertEqual(course_repository.delete_subtree(5), [6, 7])
+        self.assertEqual(CourseRepository(database, 0).find_all(), [self.course_ohja])
+
+    def test_create_raises_error_if_course_does_not_fit_storage_format(self):
+        with self.assertRaises(ValueError):
+            course_repository.create(Course("OhJa", 5, {63}, course_id=1))
+
+        with self.assertRaises(ValueError):
+            course_repository.create(Course("OhJa", 5, {1}, {2**31}, course_id=1))
+
+        self.assertEqual(course_repository.find_all(), [])
+
+    def test_fingerprint_is_zero_if_no_courses(self):
+        self.assertEqual(course_repository.fingerprint, 0)
+
+    def test_fingerprint_changes_when_course_is_created(self):
+        fingerprint = course_repository.fingerprint
+
+        course_repository.create(self.course_ohja)
+
+        self.assertNotEqual(course_repository.fingerprint, fingerprint)
+
+    def test_fingerprint_depends_only_on_content(self):
+        course_repository.create(self.course_ohja)
+        course_repository.create(self.course_ohte)
+        fingerprint = course_repository.fingerprint
+
+        course_repository.create(Course("OhJa", 10, {1}, course_id=1))
+        course_repository.create(self.course_ohja)
+
+        self.assertEqual(course_repository.fingerprint, fingerprint)
+
+    def test_fingerprint_after_delete_matches_recomputed_fingerprint(self):
+        course_repository.create(self.course_ohja)
+        course_repository.create(self.course_ohte)
+        course_repository.fingerprint
+
+        course_repository.delete(self.course_ohja.id)
+
+        self.assertEqual(
+            course_repository.fingerprint,
+            CourseRepository(database).fingerprint,
+        )
+
+    def test_reachability_is_updated_when_course_is_created(self):
+        course_repository.create(self.course_ohja)
+        reachability = course_repository.reachability
+
+        course_repository.create(self.course_ohte)
+        course_repository.create(Course("Tira", 10, {3}, {3}, course_id=4))
+
+        self.assertEqual(reachability.ancestors(4), {1, 3})
+        self.assertEqual(reachability.descendants(1), {3, 4})
+
+    def test_reachability_is_updated_when_course_is_deleted(self):
+        course_repository.create(self.course_ohja)
+        course_repository.create(self.course_ohte)
+        reachability = course_repository.reachability
+
+        course_repository.delete(self.course_ohja.id)
+
+        self.assertNotIn(1, reachability)
+        self.assertEqual(reachability.ancestors(3), set())
+        self.assertEqual(
+            reachability.ancestors(3),
+            CourseRepository(database).reachability.ancestors(3),
+        )
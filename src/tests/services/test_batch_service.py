@@ -0,0 +1,71 @@
+import unittest
+
+from entities.course import Course
+from entities.course_graph import CourseGraph
+from services.batch_service import BatchResult, BatchService, StudentCourses
+from services.scheduler_service import CycleError, MaxCreditError, SchedulerService
+
+
+class TestBatchService(unittest.TestCase):
+    def setUp(self):
+        self.courses = [
+            Course("A", 5, {1, 3}, course_id=1),
+            Course("B", 5, {2, 4}, {1}, course_id=2),
+            Course("C", 5, {1, 2, 3, 4}, {1}, course_id=3),
+            Course("D", 10, {4}, {2, 3}, course_id=4),
+        ]
+        self.graph = CourseGraph(self.courses)
+
+    def test_schedule_with_all_courses_matches_scheduler(self):
+        students = [StudentCourses(self.graph.mask([1, 2, 3, 4]))]
+
+        results = list(BatchService(1).schedule(self.graph, students, 1, 10))
+        schedule = SchedulerService(self.courses, 1, 10).get_schedule()
+
+        self.assertEqual(
+            results[0].schedule,
+            tuple(tuple(course.id for course in period) for period in schedule),
+        )
+
+    def test_schedule_with_subset(self):
+        students = [
+            StudentCourses(self.graph.mask([1, 3])),
+            StudentCourses(self.graph.mask([2]), self.graph.mask([1])),
+        ]
+
+        results = list(BatchService(1).schedule(self.graph, students, 1, 10))
+
+        self.assertEqual(
+            results, [BatchResult(0, ((1, 3),)), BatchResult(1, ((), (2,)))]
+        )
+
+    def test_schedule_skips_courses_with_unplanned_requirements(self):
+        students = [StudentCourses(self.graph.mask([1, 2, 4]))]
+
+        results = list(BatchService(1).schedule(self.graph, students, 1, 10))
+
+        self.assertEqual(results[0].schedule, ((1,), (2,)))
+
+    def test_schedule_completed_courses_are_not_scheduled(self):
+        students = [StudentCourses(self.graph.mask([1, 2]), self.graph.mask([1]))]
+
+        results = list(BatchService(1).schedule(self.graph, students, 1, 10))
+
+        self.assertEqual(results[0].schedule, ((), (2,)))
+
+    def test_schedule_with_process_pool_matches_serial_schedule(self):
+        students = [StudentCourses(mask) for mask in range(16)]
+
+        serial = list(BatchService(1).schedule(self.graph, students, 2, 10))
+        parallel = list(BatchService(2).schedule(self.graph, students, 2, 10))
+
+        self.assertEqual(parallel, serial)
+
+    def test_schedule_raises_errors_before_iteration(self):
+        courses = [Course("A", 5, {1}, {2}, 1), Course("B", 5, {1}, {1}, 2)]
+
+        with self.assertRaises(CycleError):
+            BatchService(1).schedule(CourseGraph(courses), [], 1, 10)
+
+        with self.assertRaises(MaxCreditError):
+            BatchService(1).schedule(self.graph, [], 1, 5)
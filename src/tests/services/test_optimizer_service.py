@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+
+from entities.course import Course
+from services.optimizer_service import OptimizerService
+from services.scheduler_service import EmptyGraphError, SchedulerService
+from tests.services import test_scheduler_service
+
+
+class TestOptimizerService(unittest.TestCase):
+    def setUp(self):
+        self.optimizer = OptimizerService(10)
+
+        self.course_a = Course("A", 5, {1, 2, 3}, course_id=1)
+        self.course_b = Course("B", 5, {1, 2, 3}, course_id=2)
+        self.course_c = Course("C", 10, {1}, course_id=3)
+        self.course_d = Course("D", 5, {2}, {3}, course_id=4)
+        self.courses = [self.course_a, self.course_b, self.course_c, self.course_d]
+
+    def test_optimize_finds_shorter_schedule_than_greedy(self):
+        greedy = SchedulerService(self.courses, 1, 10).get_schedule()
+        result = self.optimizer.optimize(self.courses, 1, 10)
+
+        self.assertEqual(len(greedy), 6)
+        self.assertEqual(
+            result.schedule,
+            [[self.course_c], [self.course_a, self.course_d], [self.course_b]],
+        )
+
+    def test_optimize_reports_zero_gap_when_search_finishes(self):
+        result = self.optimizer.optimize(self.courses, 1, 10)
+
+        self.assertEqual(result.lower_bound, 3)
+        self.assertEqual(result.gap, 0)
+
+    def test_optimize_returns_greedy_schedule_without_time(self):
+        greedy = SchedulerService(self.courses, 1, 10).get_schedule()
+        result = self.optimizer.optimize(self.courses, 1, 10, 0)
+
+        self.assertEqual(result.schedule, greedy)
+        self.assertEqual(result.gap, len(greedy) - result.lower_bound)
+        self.assertGreater(result.gap, 0)
+
+    def test_optimize_does_not_search_if_time_runs_out_before_search(self):
+        greedy = SchedulerService(self.courses, 1, 10).get_schedule()
+
+        with patch(
+            "services.optimizer_service.perf_counter", side_effect=[0, 2]
+        ), patch.object(OptimizerService, "_OptimizerService__search") as search:
+            result = self.optimizer.optimize(self.courses, 1, 10, 1)
+
+        search.assert_not_called()
+        self.assertEqual(result.schedule, greedy)
+        self.assertGreater(result.gap, 0)
+
+    def test_optimize_with_starting_period(self):
+        courses = [Course("A", 5, {1}, course_id=1), Course("B", 5, {4}, course_id=2)]
+
+        result = self.optimizer.optimize(courses, 4, 5)
+
+        self.assertEqual(result.schedule, [[courses[1]], [courses[0]]])
+
+    def test_optimize_keeps_schedule_valid(self):
+        courses = [
+            Course(str(i), 1 + i % 3 * 2, {1 + i % 4, 1 + i * 7 % 4}, {i // 2} - {0}, i)
+            for i in range(1, 16)
+        ]
+
+        result = self.optimizer.optimize(courses, 1, 6, 0.2)
+
+        self.assertTrue(
+            test_scheduler_service.TestSchedulerService.check_schedule(
+                result.schedule, 6
+            )
+        )
+        self.assertEqual(
+            sorted(course.id for period in result.schedule for course in period),
+            list(range(1, 16)),
+        )
+
+    def test_optimize_empty_courses_raises_error(self):
+        with self.assertRaises(EmptyGraphError):
+            self.optimizer.optimize([], 1, 10)
@@ -1,5 +1,6 @@
 import os
 import unittest
+from unittest.mock import patch
 
 from services.planner_service import *
 from services.scheduler_service import *
@@ -10,30 +11,52 @@ class FakeCourseRepository:
     def __init__(self) -> None:
         self.__courses: dict[int, Course] = {}
         self.__next_id: int = 1
+        self.fingerprint: int = 0
 
     def create(self, course: Course) -> Course:
         if course.id == -1:
+            course = course.with_id(self.__next_id)
             self.__next_id += 1
 
         else:
-            if course.id in self.__courses:
-                self.delete(course.id)
-
             self.__next_id = max(course.id + 1, self.__next_id)
 
         self.__courses[course.id] = course
+        self.fingerprint += 1
 
         return course
 
+    def replace_all(self, courses: list[Course]) -> list[Course]:
+        self.__courses.clear()
+
+        return [self.create(course) for course in courses]
+
     def delete(self, course_id: int) -> None:
         self.__courses.pop(course_id, None)
 
+        for course in list(self.__courses.values()):
+            if course_id in course.requirements:
+                self.__courses[course.id] = Course(
+                    course.name,
+                    course.credits,
+                    set(course.timing),
+                    set(course.requirements - {course_id}),
+                    course.id,
+                )
+
+        self.fingerprint += 1
+
     def delete_all(self) -> None:
         self.__courses.clear()
+        self.fingerprint += 1
 
     def find_by_id(self, course_id: int) -> Course | None:
         return self.__courses.get(course_id, None)
 
+    @property
+    def reachability(self) -> ReachabilityIndex:
+        return ReachabilityIndex(self.find_all())
+
     def find_all(self) -> list[Course]:
         return list(self.__courses.values())
 
@@ -103,11 +126,9 @@ class TestPlannerService(unittest.TestCase):
             self.planner_service.create_course(Course("", 5))
 
     def test_get_course_returns_course_with_existing_course(self):
-        self.planner_service.create_course(self.course_ohja)
+        course = self.planner_service.create_course(self.course_ohja)
 
-        self.assertEqual(
-            self.planner_service.get_course(self.course_ohja.id), self.course_ohja
-        )
+        self.assertEqual(self.planner_service.get_course(course.id), course)
 
     def test_get_course_returns_none_with_non_existing_course(self):
         self.assertEqual(self.planner_service.get_course(100), None)
@@ -116,12 +137,12 @@ class TestPlannerService(unittest.TestCase):
         self.assertEqual(self.planner_service.get_all_courses(), [])
 
     def test_get_all_courses(self):
-        self.planner_service.create_course(self.course_ohpe)
-        self.planner_service.create_course(self.course_ohja)
+        course_ohpe = self.planner_service.create_course(self.course_ohpe)
+        course_ohja = self.planner_service.create_course(self.course_ohja)
 
+        self.assertEqual(course_ohja, self.course_ohja.with_id(2))
         self.assertEqual(
-            self.planner_service.get_all_courses(),
-            [self.course_ohpe, self.course_ohja],
+            self.planner_service.get_all_courses(), [course_ohpe, course_ohja]
         )
 
     def test_delete_course(self):
@@ -130,6 +151,52 @@ class TestPlannerService(unittest.TestCase):
 
         self.assertEqual(self.planner_service.get_course(1), None)
 
+    def test_delete_course_requiring_itself(self):
+        self.planner_service.create_course(self.course_ohpe)
+        self.planner_service.create_course(Course("Loop", 5, {1}, {2}, course_id=2))
+        self.planner_service.initialize(2023, 1, 15)
+
+        with self.assertRaises(CycleError):
+            self.planner_service.get_schedule()
+
+        self.planner_service.delete_course(2)
+
+        self.assertEqual(self.planner_service.get_schedule(), [[self.course_ohpe]])
+
+    def test_delete_missing_requirement_matches_rebuilt_planner(self):
+        repository = FakeCourseRepository()
+        planner_service = PlannerService(SchedulerService([]), repository)
+        planner_service.create_course(Course("a", 5, {1}, {99}, course_id=1))
+        planner_service.create_course(Course("b", 5, {2}, course_id=2))
+        planner_service.initialize(2023, 1, 15)
+        planner_service.get_schedule()
+
+        planner_service.delete_course(99)
+
+        rebuilt = PlannerService(SchedulerService([]), repository)
+        rebuilt.initialize(2023, 1, 15)
+
+        self.assertEqual(planner_service.get_schedule(), rebuilt.get_schedule())
+        self.assertEqual(
+            planner_service.get_unschedulable_courses(),
+            rebuilt.get_unschedulable_courses(),
+        )
+        self.assertEqual(planner_service.get_unschedulable_courses(), [])
+
+    def test_failed_scheduler_update_reinitializes_scheduler(self):
+        self.planner_service.create_course(self.course_ohpe)
+        self.planner_service.initialize(2023, 1, 15)
+
+        with patch.object(SchedulerService, "remove_course", side_effect=TypeError):
+            self.planner_service.delete_course(1)
+
+        self.planner_service.create_course(Course("OhJa", 5, {1}, course_id=2))
+        self.planner_service.initialize(2023, 1, 15)
+
+        self.assertEqual(
+            self.planner_service.get_schedule(), [[Course("OhJa", 5, {1}, course_id=2)]]
+        )
+
     def test_delete_all_courses(self):
         self.planner_service.create_course(self.course_ohpe)
         self.planner_service.create_course(Course("Test1", 5, {1}))
@@ -170,19 +237,43 @@ class TestPlannerService(unittest.TestCase):
 
         self.assertNotIn(a, self.planner_service.get_all_courses())
 
+    def test_import_courses_keeps_existing_courses_if_course_is_invalid(self):
+        file = os.path.join(self.data_directory, "test_output.json")
+        a = Course("a", 5, {2}, course_id=1)
+
+        self.planner_service.create_course(a)
+        ExportService().write(
+            [Course("b", 5, {2}, course_id=2), Course("c", 5, {7}, course_id=3)], file
+        )
+
+        with self.assertRaises(TimingError):
+            self.planner_service.import_courses(file)
+
+        self.assertEqual(self.planner_service.get_all_courses(), [a])
+
+    def test_import_courses_raises_error_if_id_is_duplicated(self):
+        file = os.path.join(self.data_directory, "test_output.json")
+
+        ExportService().write(
+            [Course("b", 5, {2}, course_id=2), Course("c", 5, {1}, course_id=2)], file
+        )
+
+        with self.assertRaises(ValueError):
+            self.planner_service.import_courses(file)
+
     def test_export_courses(self):
         file = os.path.join(self.data_directory, "test_output.json")
 
-        self.planner_service.create_course(self.course_ohpe)
-        self.planner_service.create_course(self.course_ohja)
+        course_ohpe = self.planner_service.create_course(self.course_ohpe)
+        course_ohja = self.planner_service.create_course(self.course_ohja)
 
         self.planner_service.export_courses(file)
         self.planner_service.import_courses(file)
 
         courses = self.planner_service.get_all_courses()
 
-        self.assertIn(self.course_ohpe, courses)
-        self.assertIn(self.course_ohja, courses)
+        self.assertIn(course_ohpe, courses)
+        self.assertIn(course_ohja, courses)
 
     def test_get_schedule(self):
         file = os.path.join(self.data_directory, "sample_realistic.json")
@@ -192,3 +283,203 @@ class TestPlannerService(unittest.TestCase):
         schedule = self.planner_service.get_schedule()
 
         self.assertTrue(TestSchedulerService.check_schedule(schedule, 15))
+
+    def test_get_schedule_after_creating_course(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {2}, {1}, course_id=2)
+
+        self.planner_service.create_course(a)
+        self.planner_service.initialize(2023, 1, 5)
+        self.assertEqual(self.planner_service.get_schedule(), [[a]])
+
+        self.planner_service.create_course(b)
+        self.assertEqual(self.planner_service.get_schedule(), [[a], [b]])
+
+        self.planner_service.initialize(2023, 2, 5)
+        self.assertEqual(self.planner_service.get_schedule(), [[], [], [], [a], [b]])
+
+    def test_get_schedule_after_deleting_course(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {2}, {1}, course_id=2)
+
+        self.planner_service.create_course(a)
+        self.planner_service.create_course(b)
+        self.planner_service.initialize(2023, 1, 5)
+        self.planner_service.get_schedule()
+
+        self.planner_service.delete_course(2)
+
+        self.assertEqual(self.planner_service.get_schedule(), [[a]])
+
+    def test_iter_schedule(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {2}, {1}, course_id=2)
+
+        self.planner_service.create_course(a)
+        self.planner_service.create_course(b)
+        self.planner_service.initialize(2023, 2, 5)
+
+        self.assertEqual(
+            list(self.planner_service.iter_schedule()), [[], [], [], [a], [b]]
+        )
+
+    def test_iter_schedule_uses_cached_schedule(self):
+        self.planner_service.create_course(Course("a", 5, {1}, course_id=1))
+        self.planner_service.initialize(2023, 1, 5)
+        schedule = self.planner_service.get_schedule()
+
+        self.assertEqual(list(self.planner_service.iter_schedule()), schedule)
+        self.assertEqual(self.planner_service.cache_info().hits, 1)
+
+    def test_iter_schedule_adds_consumed_schedule_to_cache(self):
+        self.planner_service.create_course(Course("a", 5, {1}, course_id=1))
+        self.planner_service.initialize(2023, 1, 5)
+        schedule = list(self.planner_service.iter_schedule())
+
+        self.assertEqual(list(self.planner_service.iter_schedule()), schedule)
+        self.assertEqual(self.planner_service.get_schedule(), schedule)
+        self.assertEqual(self.planner_service.cache_info().hits, 2)
+
+    def test_initialize_reads_courses_after_import(self):
+        file = os.path.join(self.data_directory, "sample.json")
+
+        self.planner_service.create_course(Course("a", 5, {1}, course_id=10))
+        self.planner_service.initialize(2023, 1, 15)
+        self.planner_service.import_courses(file)
+        self.planner_service.initialize(2023, 1, 15)
+
+        schedule = self.planner_service.get_schedule()
+
+        self.assertNotIn(10, [course.id for period in schedule for course in period])
+        self.assertEqual(sum(map(len, schedule)), 3)
+
+    def test_get_schedule_uses_cache_with_same_parameters(self):
+        self.planner_service.create_course(Course("a", 5, {1}, course_id=1))
+        self.planner_service.initialize(2023, 1, 5)
+
+        first = self.planner_service.get_schedule()
+        second = self.planner_service.get_schedule()
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.planner_service.cache_info().hits, 1)
+        self.assertEqual(self.planner_service.cache_info().misses, 1)
+
+    def test_get_schedule_uses_cache_after_changing_parameters_back(self):
+        self.planner_service.create_course(Course("a", 5, {1}, course_id=1))
+        self.planner_service.initialize(2023, 1, 5)
+        self.planner_service.get_schedule()
+
+        self.planner_service.initialize(2023, 2, 10)
+        self.planner_service.get_schedule()
+        self.planner_service.initialize(2023, 1, 5)
+
+        self.assertEqual(
+            self.planner_service.get_schedule(), [[Course("a", 5, {1}, course_id=1)]]
+        )
+        self.assertEqual(self.planner_service.cache_info().hits, 1)
+        self.assertEqual(self.planner_service.cache_info().misses, 2)
+
+    def test_get_schedule_cache_misses_after_creating_course(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {1}, course_id=2)
+
+        self.planner_service.create_course(a)
+        self.planner_service.initialize(2023, 1, 5)
+        self.planner_service.get_schedule()
+        self.planner_service.create_course(b)
+
+        self.assertEqual(self.planner_service.get_schedule(), [[a], [], [], [], [b]])
+        self.assertEqual(self.planner_service.cache_info().hits, 0)
+
+    def test_get_schedule_result_can_be_modified_without_affecting_cache(self):
+        self.planner_service.create_course(Course("a", 5, {1}, course_id=1))
+        self.planner_service.initialize(2023, 1, 5)
+
+        self.planner_service.get_schedule()[0].clear()
+
+        self.assertEqual(len(self.planner_service.get_schedule()[0]), 1)
+
+    def test_get_optimized_schedule(self):
+        a = Course("a", 5, {1, 2, 3}, course_id=1)
+        b = Course("b", 5, {1, 2, 3}, course_id=2)
+        c = Course("c", 10, {1}, course_id=3)
+        d = Course("d", 5, {2}, {3}, course_id=4)
+
+        for course in [a, b, c, d]:
+            self.planner_service.create_course(course)
+
+        self.planner_service.initialize(2023, 1, 10)
+        result = self.planner_service.get_optimized_schedule(10)
+
+        self.assertEqual(result.schedule, [[c], [a, d], [b]])
+        self.assertEqual(result.gap, 0)
+
+    def test_sweep(self):
+        self.planner_service.create_course(Course("a", 5, {1}, course_id=1))
+        self.planner_service.create_course(Course("b", 5, {1}, course_id=2))
+
+        results = self.planner_service.sweep([5, 10], [1])
+
+        self.assertEqual([result.periods for result in results], [5, 1])
+        self.assertEqual(results[1].credits, (10,))
+
+    def test_get_course_metrics_is_recomputed_after_change(self):
+        self.planner_service.create_course(Course("a", 5, {1}, course_id=1))
+        metrics = self.planner_service.get_course_metrics()
+
+        self.assertIs(self.planner_service.get_course_metrics(), metrics)
+
+        self.planner_service.create_course(Course("b", 5, {1}, {1}, course_id=2))
+        metrics = self.planner_service.get_course_metrics()
+
+        self.assertEqual(metrics.dependent_count(1), 1)
+
+    def test_get_valid_requirements_excludes_dependent_courses(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {2}, {1}, course_id=2)
+        c = Course("c", 5, {2}, course_id=3)
+
+        for course in (a, b, c):
+            self.planner_service.create_course(course)
+
+        self.assertEqual(self.planner_service.get_valid_requirements(1), [c])
+        self.assertEqual(self.planner_service.get_valid_requirements(-1), [a, b, c])
+
+    def test_get_unschedulable_courses(self):
+        self.planner_service.create_course(Course("a", 5, {1}, course_id=1))
+        self.planner_service.create_course(Course("b", 5, {2}, {3}, course_id=2))
+        self.planner_service.initialize(2023, 1, 10)
+
+        self.assertEqual(
+            [
+                course.course_id
+                for course in self.planner_service.get_unschedulable_courses()
+            ],
+            [2],
+        )
+
+    def test_create_planner_service_uses_own_database(self):
+        planner = create_planner_service(":memory:")
+        course = Course("a", 5, {1}, course_id=1)
+
+        planner.create_course(course)
+        planner.initialize(2023, 1, 10)
+
+        self.assertEqual(planner.get_all_courses(), [course])
+        self.assertEqual(planner.get_schedule(), [[course]])
+        self.assertEqual(create_planner_service(":memory:").get_all_courses(), [])
+
+    def test_schedule_students(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {2}, {1}, course_id=2)
+
+        self.planner_service.create_course(a)
+        self.planner_service.create_course(b)
+        self.planner_service.initialize(2023, 1, 10)
+
+        results = list(
+            self.planner_service.schedule_students([({1, 2}, ()), ({2}, {1})])
+        )
+
+        self.assertEqual(results[0].schedule, ((1,), (2,)))
+        self.assertEqual(results[1].schedule, ((), (2,)))
@@ -1,6 +1,11 @@
+import random
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 from entities.course import Course
+from entities.course_graph import CourseGraph
+from entities.feasibility import UnschedulableReason
 from services.scheduler_service import *
 
 
@@ -51,6 +56,21 @@ class TestSchedulerService(unittest.TestCase):
             and cls.check_topological_order(schedule)
         )
 
+    @classmethod
+    def create_graph(cls, graph: dict[int, list[int]]) -> CourseGraph:
+        requirements: dict[int, set[int]] = {course_id: set() for course_id in graph}
+
+        for course_id, neighbors in graph.items():
+            for neighbor in neighbors:
+                requirements.setdefault(neighbor, set()).add(course_id)
+
+        return CourseGraph(
+            [
+                Course(str(course_id), 1, {1}, requirements[course_id], course_id)
+                for course_id in requirements
+            ]
+        )
+
     def setUp(self) -> None:
         self.scheduler = SchedulerService([])
 
@@ -75,6 +95,10 @@ class TestSchedulerService(unittest.TestCase):
         with self.assertRaises(MaxCreditError):
             self.scheduler.max_credits = 2
 
+    def test_initialize_raises_error_when_course_exceeds_max_credits(self):
+        with self.assertRaises(MaxCreditError):
+            self.scheduler.initialize([Course("test", 10, {1})], 1, 5)
+
     def test_get_schedule_raises_error_with_cycle_in_graph(self):
         courses = [
             Course("a", 5, {1}, {2}, 1),
@@ -126,9 +150,9 @@ class TestSchedulerService(unittest.TestCase):
         graph2 = {1: [2, 3], 2: [4], 3: [4], 4: []}
         graph3 = {1: [3], 2: [3], 3: []}
 
-        self.scheduler._SchedulerService__check(graph1)
-        self.scheduler._SchedulerService__check(graph2)
-        self.scheduler._SchedulerService__check(graph3)
+        self.scheduler._SchedulerService__check(self.create_graph(graph1))
+        self.scheduler._SchedulerService__check(self.create_graph(graph2))
+        self.scheduler._SchedulerService__check(self.create_graph(graph3))
 
     def test_check_raises_error_with_cyclic_graph(self):
         graph1 = {1: [1]}
@@ -142,17 +166,61 @@ class TestSchedulerService(unittest.TestCase):
         }
 
         with self.assertRaises(CycleError):
-            self.scheduler._SchedulerService__check(graph1)
+            self.scheduler._SchedulerService__check(self.create_graph(graph1))
 
         with self.assertRaises(CycleError):
-            self.scheduler._SchedulerService__check(graph2)
+            self.scheduler._SchedulerService__check(self.create_graph(graph2))
 
         with self.assertRaises(CycleError):
-            self.scheduler._SchedulerService__check(graph3)
+            self.scheduler._SchedulerService__check(self.create_graph(graph3))
+
+    def test_check_reports_cycle(self):
+        graph = {1: [2], 2: [3], 3: [4], 4: [2], 5: []}
+
+        with self.assertRaises(CycleError) as context:
+            self.scheduler._SchedulerService__check(self.create_graph(graph))
+
+        self.assertEqual(context.exception.cycle, [2, 3, 4])
+
+    def test_check_finds_cycle_in_disconnected_component(self):
+        graph = {1: [2], 2: [], 3: [4], 4: [5], 5: [3]}
+
+        with self.assertRaises(CycleError) as context:
+            self.scheduler._SchedulerService__check(self.create_graph(graph))
+
+        self.assertEqual(sorted(context.exception.cycle), [3, 4, 5])
+
+    def test_check_with_long_chain(self):
+        graph = {i: [i + 1] for i in range(1, 20000)}
+        graph[20000] = []
+
+        self.scheduler._SchedulerService__check(self.create_graph(graph))
+
+        graph[20000] = [1]
+
+        with self.assertRaises(CycleError) as context:
+            self.scheduler._SchedulerService__check(self.create_graph(graph))
+
+        self.assertEqual(len(context.exception.cycle), 20000)
+
+    def test_get_schedule_raises_error_with_cycle_in_disconnected_component(self):
+        courses = [
+            Course("a", 5, {1}, course_id=1),
+            Course("b", 5, {2}, {1}, course_id=2),
+            Course("c", 5, {3}, {4}, course_id=3),
+            Course("d", 5, {4}, {3}, course_id=4),
+        ]
+
+        self.scheduler.initialize(courses, 1, 20)
+
+        with self.assertRaises(CycleError) as context:
+            self.scheduler.get_schedule()
+
+        self.assertEqual(sorted(context.exception.cycle), [3, 4])
 
     def test_check_raises_error_with_empty_graph(self):
         with self.assertRaises(EmptyGraphError):
-            self.scheduler._SchedulerService__check({})
+            self.scheduler._SchedulerService__check(CourseGraph())
 
     def test_non_existent_requirements_are_ignored(self):
         course1 = Course("Test1", 10, {1, 2}, {20, 99}, course_id=1)
@@ -160,9 +228,10 @@ class TestSchedulerService(unittest.TestCase):
 
         self.scheduler.initialize([course1, course2], 1, 20)
 
-        self.assertNotIn(20, self.scheduler._SchedulerService__get_graph().keys())
-        self.assertNotIn(99, self.scheduler._SchedulerService__get_graph().keys())
-        self.assertNotIn(3, self.scheduler._SchedulerService__get_graph().keys())
+        self.assertIsNone(self.scheduler.graph.index(20))
+        self.assertIsNone(self.scheduler.graph.index(99))
+        self.assertIsNone(self.scheduler.graph.index(3))
+        self.assertEqual(list(self.scheduler.graph.targets), [1])
 
     def test_get_schedule_period_credits_within_limit(self):
         a = Course("A", 7, {1, 2}, course_id=1)
@@ -202,3 +271,416 @@ class TestSchedulerService(unittest.TestCase):
         schedule = self.scheduler.get_schedule()
 
         self.assertTrue(self.check_schedule(schedule, 15))
+
+    def test_get_schedule_skips_periods_without_courses(self):
+        a = Course("a", 5, {3}, course_id=1)
+        b = Course("b", 5, {3}, {1}, course_id=2)
+        c = Course("c", 5, {3}, {2}, course_id=3)
+
+        self.scheduler.initialize([a, b, c], 1, 5)
+        schedule = self.scheduler.get_schedule()
+
+        self.assertEqual(len(schedule), 11)
+        self.assertEqual(schedule[2], [a])
+        self.assertEqual(schedule[6], [b])
+        self.assertEqual(schedule[10], [c])
+
+    @patch("entities.course_graph.PERIODS_PER_YEAR", 52)
+    @patch("services.scheduler_service.PERIODS_PER_YEAR", 52)
+    def test_get_schedule_with_week_based_calendar(self):
+        a = Course("a", 5, {50}, course_id=1)
+        b = Course("b", 5, {2}, {1}, course_id=2)
+        c = Course("c", 5, {2, 51}, {1}, course_id=3)
+
+        self.scheduler.initialize([a, b, c], 48, 5)
+        schedule = self.scheduler.get_schedule()
+
+        self.assertEqual(len(schedule), 7)
+        self.assertEqual(schedule[2], [a])
+        self.assertEqual(schedule[3], [c])
+        self.assertEqual(schedule[6], [b])
+        self.assertEqual(sum(map(len, schedule)), 3)
+
+    def test_get_schedule_can_be_called_repeatedly(self):
+        courses = [
+            Course("Ohpe", 5, {1, 3}, course_id=1),
+            Course("Ohja", 5, {2, 4}, {1}, course_id=2),
+            Course("Tito", 5, {2, 3}, {1}, course_id=3),
+            Course("Tira", 10, {3}, {2, 3}, course_id=4),
+        ]
+
+        self.scheduler.initialize(courses, 1, 10)
+        schedule = self.scheduler.get_schedule()
+
+        self.assertEqual(self.scheduler.get_schedule(), schedule)
+        self.assertEqual(self.scheduler.get_schedule(), schedule)
+
+    def test_get_schedule_after_changing_parameters(self):
+        a = Course("a", 5, {1, 2}, course_id=1)
+        b = Course("b", 5, {1, 2}, course_id=2)
+
+        self.scheduler.initialize([a, b], 1, 5)
+        self.assertEqual(self.scheduler.get_schedule(), [[a], [b]])
+
+        self.scheduler.max_credits = 10
+        self.assertEqual(self.scheduler.get_schedule(), [[a, b]])
+
+        self.scheduler.starting_period = 3
+        self.assertEqual(self.scheduler.get_schedule(), [[], [], [a, b]])
+
+    def test_get_schedule_concurrently(self):
+        courses = [
+            Course(str(i), 1 + i % 5, {1 + i % 4}, {i - 1} if i > 1 else set(), i)
+            for i in range(1, 101)
+        ]
+
+        self.scheduler.initialize(courses, 1, 10)
+        expected = self.scheduler.get_schedule()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            schedules = list(
+                executor.map(lambda _: self.scheduler.get_schedule(), range(8))
+            )
+
+        for schedule in schedules:
+            self.assertEqual(schedule, expected)
+
+    def test_iter_schedule_matches_get_schedule(self):
+        a = Course("a", 5, {3}, course_id=1)
+        b = Course("b", 5, {3}, {1}, course_id=2)
+        c = Course("c", 5, {1, 3}, {1}, course_id=3)
+
+        self.scheduler.initialize([a, b, c], 1, 5)
+        streamed = list(self.scheduler.iter_schedule())
+
+        self.assertEqual(streamed, self.scheduler.get_schedule())
+        self.assertEqual(list(self.scheduler.iter_schedule()), streamed)
+
+    def test_iter_schedule_stores_schedule_when_consumed(self):
+        self.scheduler.initialize([Course("a", 5, {1}, course_id=1)], 1, 5)
+        list(self.scheduler.iter_schedule())
+
+        with patch.object(
+            SchedulerService, "_SchedulerService__generate_schedule"
+        ) as generate_schedule:
+            self.scheduler.get_schedule()
+
+        generate_schedule.assert_not_called()
+
+    def test_iter_schedule_does_not_store_partial_schedule(self):
+        self.scheduler.initialize(
+            [Course("a", 5, {1}, course_id=1), Course("b", 5, {2}, {1}, 2)], 1, 5
+        )
+        next(self.scheduler.iter_schedule())
+
+        self.assertEqual(
+            self.scheduler.get_schedule(),
+            [[Course("a", 5, {1}, course_id=1)], [Course("b", 5, {2}, {1}, 2)]],
+        )
+
+    def test_iter_schedule_yields_periods_lazily(self):
+        courses = [
+            Course(str(i), 5, {1 + (i - 1) % 4}, {i - 1} if i > 1 else set(), i)
+            for i in range(1, 101)
+        ]
+
+        self.scheduler.initialize(courses, 1, 5)
+        schedule = self.scheduler.iter_schedule()
+
+        with patch.object(
+            SchedulerService,
+            "_SchedulerService__get_next_index",
+            autospec=True,
+            side_effect=SchedulerService._SchedulerService__get_next_index,
+        ) as get_next_index:
+            self.assertEqual(next(schedule), [courses[0]])
+            self.assertEqual(get_next_index.call_count, 0)
+
+    def test_iter_schedule_raises_error_before_iteration(self):
+        self.scheduler.initialize(
+            [Course("a", 5, {1}, {2}, 1), Course("b", 5, {1}, {1}, 2)], 1, 5
+        )
+
+        with self.assertRaises(CycleError):
+            self.scheduler.iter_schedule()
+
+    def test_find_unschedulable_reports_skipped_courses(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {2}, {1, 3}, course_id=2)
+        c = Course("c", 5, {6}, course_id=4)
+
+        self.scheduler.initialize([a, b, c], 1, 5)
+
+        self.assertEqual(
+            [
+                (course.course_id, course.reason)
+                for course in self.scheduler.find_unschedulable()
+            ],
+            [
+                (2, UnschedulableReason.MISSING_REQUIREMENTS),
+                (4, UnschedulableReason.TIMING),
+            ],
+        )
+        self.assertEqual(self.scheduler.get_schedule(), [[a]])
+
+    def test_find_unschedulable_reports_invalid_period_of_scheduled_course(self):
+        a = Course("a", 5, {1, 7}, course_id=1)
+
+        self.scheduler.initialize([a], 1, 5)
+
+        self.assertEqual(self.scheduler.get_schedule(), [[a]])
+        self.assertEqual(
+            [
+                (course.course_id, course.reason, course.details)
+                for course in self.scheduler.find_unschedulable()
+            ],
+            [(1, UnschedulableReason.INVALID_PERIODS, (7,))],
+        )
+
+    def test_get_schedule_raises_error_if_only_invalid_periods_remain(self):
+        self.scheduler.initialize(
+            [Course("a", 5, {7}, course_id=1), Course("b", 5, {1}, {1}, course_id=2)],
+            1,
+            5,
+        )
+
+        with self.assertRaises(UnschedulableError) as context:
+            self.scheduler.get_schedule()
+
+        self.assertEqual(
+            [
+                (course.course_id, course.details)
+                for course in context.exception.courses
+            ],
+            [(1, (7,)), (2, (1,))],
+        )
+
+    def test_find_unschedulable_is_updated_after_change(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {2}, {1, 3}, course_id=2)
+
+        self.scheduler.initialize([a, b], 1, 5)
+        self.assertEqual(len(self.scheduler.find_unschedulable()), 1)
+
+        self.scheduler.update_course(Course("c", 5, {1}, course_id=3))
+
+        self.assertEqual(self.scheduler.find_unschedulable(), [])
+
+    def test_get_schedule_raises_error_if_no_course_is_schedulable(self):
+        self.scheduler.initialize(
+            [Course("a", 5, {5}, course_id=1), Course("b", 5, {1}, {1}, course_id=2)],
+            1,
+            5,
+        )
+
+        with self.assertRaises(UnschedulableError) as context:
+            self.scheduler.get_schedule()
+
+        self.assertEqual(
+            [course.course_id for course in context.exception.courses], [1, 2]
+        )
+
+        with self.assertRaises(UnschedulableError):
+            self.scheduler.iter_schedule()
+
+    def test_get_schedule_raises_error_after_change_leaves_nothing_schedulable(self):
+        self.scheduler.initialize([Course("a", 5, {1}, course_id=1)], 1, 5)
+        self.scheduler.get_schedule()
+
+        self.scheduler.update_course(Course("a", 5, {5}, course_id=1))
+
+        with self.assertRaises(UnschedulableError):
+            self.scheduler.get_schedule()
+
+    def test_stats_is_none_without_instrumentation(self):
+        self.scheduler.initialize([Course("a", 5, {1}, course_id=1)], 1, 5)
+        self.scheduler.get_schedule()
+
+        self.assertIsNone(self.scheduler.stats)
+
+    def test_stats_counts_heap_operations_and_skipped_periods(self):
+        a = Course("a", 5, {3}, course_id=1)
+        b = Course("b", 5, {3}, {1}, course_id=2)
+        c = Course("c", 5, {3}, {2}, course_id=3)
+        scheduler = SchedulerService([a, b, c], 1, 5, instrumented=True)
+
+        scheduler.get_schedule()
+        stats = scheduler.stats
+
+        self.assertEqual(stats.pushes, 5)
+        self.assertEqual(stats.pops, 5)
+        self.assertEqual(stats.stale_pops, 0)
+        self.assertEqual(stats.repushes, 2)
+        self.assertEqual(stats.skipped_periods, 7)
+        self.assertGreater(stats.graph_time, 0)
+        self.assertGreater(stats.validation_time, 0)
+        self.assertGreater(stats.loop_time, 0)
+
+    def test_stats_counts_stale_pops(self):
+        scheduler = SchedulerService(
+            [Course("a", 5, {1, 2}, course_id=1)], 1, 5, instrumented=True
+        )
+
+        scheduler.get_schedule()
+
+        self.assertEqual(scheduler.stats.pushes, 2)
+        self.assertEqual(scheduler.stats.stale_pops, 1)
+
+    def test_stats_is_collected_per_run(self):
+        scheduler = SchedulerService(
+            [Course("a", 5, {1}, course_id=1)], 1, 5, instrumented=True
+        )
+
+        scheduler.get_schedule()
+        first = scheduler.stats
+        scheduler.max_credits = 10
+        list(scheduler.iter_schedule())
+
+        self.assertIsNot(scheduler.stats, first)
+        self.assertEqual(scheduler.stats.validation_time, 0)
+        self.assertEqual(scheduler.stats.pops, 1)
+
+    def test_update_course_matches_full_schedule(self):
+        random.seed(42)
+
+        for _ in range(50):
+            courses = {
+                i: Course(
+                    str(i),
+                    random.randint(1, 6),
+                    set(random.sample(range(1, 5), random.randint(1, 2))),
+                    set(random.sample(range(1, i), min(i - 1, 2))),
+                    i,
+                )
+                for i in range(1, 16)
+            }
+
+            self.scheduler.initialize(list(courses.values()), 2, 10)
+            self.scheduler.get_schedule()
+
+            for _ in range(5):
+                course_id = random.randint(1, 18)
+                course = Course(
+                    "edited",
+                    random.randint(1, 6),
+                    set(random.sample(range(1, 5), random.randint(1, 2))),
+                    set(random.sample(range(1, course_id), min(course_id - 1, 2))),
+                    course_id,
+                )
+                courses[course_id] = course
+
+                self.scheduler.update_course(course)
+
+                self.assertEqual(
+                    self.scheduler.get_schedule(),
+                    SchedulerService(list(courses.values()), 2, 10).get_schedule(),
+                )
+
+    def test_update_course_edit_near_end_keeps_earlier_periods(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {2}, {1}, course_id=2)
+        c = Course("c", 5, {3}, {2}, course_id=3)
+        c_edited = Course("c", 5, {4}, {2}, course_id=3)
+
+        self.scheduler.initialize([a, b, c], 1, 5)
+        self.assertEqual(self.scheduler.get_schedule(), [[a], [b], [c]])
+
+        self.scheduler.update_course(c_edited)
+
+        self.assertEqual(self.scheduler.get_schedule(), [[a], [b], [], [c_edited]])
+
+    def test_update_course_adds_new_course(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {2}, {1}, course_id=2)
+
+        self.scheduler.initialize([a], 1, 5)
+        self.scheduler.get_schedule()
+        self.scheduler.update_course(b)
+
+        self.assertEqual(self.scheduler.get_schedule(), [[a], [b]])
+
+    def test_update_course_resolves_missing_requirement(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {2}, {1, 3}, course_id=2)
+        c = Course("c", 5, {1}, course_id=3)
+
+        self.scheduler.initialize([a, b], 1, 5)
+        self.assertEqual(self.scheduler.get_schedule(), [[a]])
+
+        self.scheduler.update_course(c)
+
+        self.assertEqual(self.scheduler.get_schedule(), [[a], [], [], [], [c], [b]])
+
+    def test_update_course_creating_cycle_raises_error(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {2}, {1}, course_id=2)
+
+        self.scheduler.initialize([a, b], 1, 5)
+        self.scheduler.get_schedule()
+        self.scheduler.update_course(Course("a", 5, {1}, {2}, course_id=1))
+
+        with self.assertRaises(CycleError):
+            self.scheduler.get_schedule()
+
+    def test_update_course_exceeding_max_credits_raises_error(self):
+        a = Course("a", 5, {1}, course_id=1)
+
+        self.scheduler.initialize([a], 1, 5)
+        self.scheduler.get_schedule()
+        self.scheduler.update_course(Course("b", 10, {1}, course_id=2))
+
+        with self.assertRaises(MaxCreditError):
+            self.scheduler.get_schedule()
+
+    def test_remove_course_removes_requirement_from_dependents(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {1}, course_id=2)
+        c = Course("c", 5, {1, 2}, {1, 2}, course_id=3)
+
+        self.scheduler.initialize([a, b, c], 1, 5)
+        self.assertEqual(self.scheduler.get_schedule(), [[a], [], [], [], [b], [c]])
+
+        self.scheduler.remove_course(2)
+
+        self.assertEqual(
+            self.scheduler.get_schedule(), [[a], [Course("c", 5, {1, 2}, {1}, 3)]]
+        )
+
+    def test_remove_course_requiring_itself(self):
+        a = Course("a", 5, {1}, course_id=1)
+        b = Course("b", 5, {1}, {2}, course_id=2)
+
+        self.scheduler.initialize([a, b], 1, 5)
+
+        with self.assertRaises(CycleError):
+            self.scheduler.get_schedule()
+
+        self.scheduler.remove_course(2)
+
+        self.assertEqual(self.scheduler.get_schedule(), [[a]])
+
+    def test_remove_course_with_missing_requirement_matches_initialize(self):
+        a = Course("a", 5, {1}, {99}, course_id=1)
+        b = Course("b", 5, {2}, {1}, course_id=2)
+        c = Course("c", 5, {1}, course_id=3)
+
+        self.scheduler.initialize([a, b, c], 1, 5)
+        self.assertEqual(self.scheduler.get_schedule(), [[c]])
+
+        self.scheduler.remove_course(99)
+
+        rebuilt = SchedulerService([Course("a", 5, {1}, course_id=1), b, c], 1, 5)
+
+        self.assertEqual(self.scheduler.get_schedule(), rebuilt.get_schedule())
+        self.assertEqual(
+            self.scheduler.find_unschedulable(), rebuilt.find_unschedulable()
+        )
+        self.assertEqual(self.scheduler.find_unschedulable(), [])
+
+    def test_remove_course_with_non_existing_course(self):
+        a = Course("a", 5, {1}, course_id=1)
+
+        self.scheduler.initialize([a], 1, 5)
+        self.scheduler.remove_course(2)
+
+        self.assertEqual(self.scheduler.get_schedule(), [[a]])
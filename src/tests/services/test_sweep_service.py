@@ -0,0 +1,63 @@
+import unittest
+
+from entities.course import Course
+from services.scheduler_service import CycleError, SchedulerService
+from services.sweep_service import SweepResult, SweepService
+
+
+class TestSweepService(unittest.TestCase):
+    def setUp(self):
+        self.courses = [
+            Course("A", 5, {1, 3}, course_id=1),
+            Course("B", 10, {2, 4}, {1}, course_id=2),
+            Course("C", 5, {1, 2, 3, 4}, {1}, course_id=3),
+            Course("D", 5, {4}, course_id=4),
+        ]
+
+    def test_sweep_returns_result_for_every_combination(self):
+        results = SweepService(1).sweep(self.courses, [10, 15], [1, 2])
+
+        self.assertEqual(
+            [(result.starting_period, result.max_credits) for result in results],
+            [(1, 10), (1, 15), (2, 10), (2, 15)],
+        )
+
+    def test_sweep_orders_results_by_starting_period_and_max_credits(self):
+        results = SweepService(2).sweep(self.courses, [15, 10], [3, 1])
+
+        self.assertEqual(
+            [(result.starting_period, result.max_credits) for result in results],
+            [(1, 10), (1, 15), (3, 10), (3, 15)],
+        )
+
+    def test_sweep_with_no_starting_periods_returns_no_results(self):
+        self.assertEqual(SweepService(1).sweep(self.courses, [10], []), [])
+
+    def test_sweep_matches_scheduler(self):
+        for result in SweepService(1).sweep(self.courses, range(10, 21)):
+            schedule = SchedulerService(
+                self.courses, result.starting_period, result.max_credits
+            ).get_schedule()
+
+            self.assertEqual(result.periods, len(schedule))
+            self.assertEqual(
+                result.credits,
+                tuple(sum(course.credits for course in period) for period in schedule),
+            )
+
+    def test_sweep_marks_too_low_max_credits(self):
+        results = SweepService(1).sweep(self.courses, [5], [1])
+
+        self.assertEqual(results, [SweepResult(1, 5, None, ())])
+
+    def test_sweep_with_process_pool_matches_serial_sweep(self):
+        serial = SweepService(1).sweep(self.courses, range(5, 21))
+        parallel = SweepService(2).sweep(self.courses, range(5, 21))
+
+        self.assertEqual(parallel, serial)
+
+    def test_sweep_with_cycle_raises_error(self):
+        courses = [Course("A", 5, {1}, {2}, 1), Course("B", 5, {1}, {1}, 2)]
+
+        with self.assertRaises(CycleError):
+            SweepService(1).sweep(courses, [10])
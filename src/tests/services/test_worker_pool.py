@@ -0,0 +1,40 @@
+import os
+import unittest
+
+from entities.course import Course
+from entities.course_graph import CourseGraph
+from services.scheduler_service import SchedulerService
+from services.sweep_service import evaluate
+from services.worker_pool import get_process_count, initialize_worker, map_in_workers
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.graph = CourseGraph(
+            [
+                Course("A", 5, {1, 3}, course_id=1),
+                Course("B", 5, {2, 4}, {1}, course_id=2),
+            ]
+        )
+
+    def test_get_process_count(self):
+        self.assertEqual(get_process_count(3), 3)
+        self.assertEqual(get_process_count(None), os.cpu_count() or 1)
+
+    def test_initialize_worker_initializes_given_scheduler(self):
+        scheduler = SchedulerService()
+
+        initialize_worker(self.graph, 2, 10, scheduler)
+
+        self.assertEqual(scheduler.starting_period, 2)
+        self.assertEqual(scheduler.max_credits, 10)
+        self.assertEqual(len(scheduler.get_schedule()), 3)
+
+    def test_map_in_workers_returns_results_in_input_order(self):
+        tasks = [(starting_period, 5) for starting_period in (4, 1, 3, 2)]
+        scheduler = SchedulerService()
+        initialize_worker(self.graph, 1, 5, scheduler)
+
+        results = list(map_in_workers(evaluate, tasks, self.graph, 1, 5, 2))
+
+        self.assertEqual(results, [evaluate(scheduler, *task) for task in tasks])
@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from entities.course import Course
+from services.planner_service import PlannerService
+from services.scheduler_service import SchedulerService
+from tests.services.test_planner_service import FakeCourseRepository
+from ui.schedule_view import ScheduleView
+
+
+class TestScheduleView(unittest.TestCase):
+    def setUp(self):
+        self.planner_service = PlannerService(
+            course_repository=FakeCourseRepository(),
+            scheduler_service=SchedulerService([]),
+        )
+        self.course_a = Course("a", 5, {1}, course_id=1)
+        self.course_b = Course("b", 5, {2}, {1}, course_id=2)
+
+        self.planner_service.create_course(self.course_a)
+        self.planner_service.create_course(self.course_b)
+        self.planner_service.initialize(2023, 1, 5)
+
+        # Näkymä luodaan ilman ikkunaa, joten tkinterin komponentit korvataan valeolioilla.
+        with patch("ui.view.ttk"), patch("ui.schedule_view.ttk") as ttk:
+            self.tree = ttk.Treeview.return_value
+            self.tree.get_children.return_value = []
+            self.tree.exists.return_value = False
+
+            self.view = ScheduleView(Mock())
+
+    def test_update_adds_periods_and_courses(self):
+        with patch("ui.schedule_view.planner_service", self.planner_service):
+            self.view.update()
+
+        texts = [call.kwargs.get("text") for call in self.tree.insert.call_args_list]
+
+        self.assertIn(str(self.course_a), texts)
+        self.assertIn(str(self.course_b), texts)
+
+    def test_update_twice_uses_cached_schedule(self):
+        with patch("ui.schedule_view.planner_service", self.planner_service):
+            self.view.update()
+            self.view.update()
+
+        self.assertEqual(self.planner_service.cache_info().hits, 1)
+        self.assertEqual(self.planner_service.cache_info().misses, 1)
@@ -1,6 +1,6 @@
 from datetime import date
 from tkinter import IntVar, TclError, constants, ttk
-from tkinter.messagebox import showerror
+from tkinter.messagebox import showerror, showwarning
 from typing import Callable
 
 from config import PERIODS_PER_YEAR
@@ -98,9 +98,28 @@ class CalculationView(View):
             planner_service.initialize(starting_year, starting_period, max_credits)
 
             self.__handle_show_schedule_view()
+            self.__show_unschedulable_courses()
 
         except (TimingError, CycleError, MaxCreditError, ValueError) as error:
             showerror("Virhe", str(error))
 
         except (TclError, EmptyGraphError):
             showerror("Virhe", "Tarkista kurssit.")
+
+    def __show_unschedulable_courses(self) -> None:
+        """Näyttää varoituksen kursseista, joita ei voitu aikatauluttaa."""
+
+        unschedulable = planner_service.get_unschedulable_courses()
+
+        if not unschedulable:
+            return
+
+        rows = [str(course) for course in unschedulable[:10]]
+
+        if len(unschedulable) > 10:
+            rows.append(f"ja {len(unschedulable) - 10} muuta")
+
+        showwarning(
+            "Varoitus",
+            "Seuraavia kursseja ei voitu aikatauluttaa kokonaan:\n" + "\n".join(rows),
+        )
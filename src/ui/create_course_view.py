@@ -214,6 +214,8 @@ class CreateCourseView(View):
             showerror("Virhe", str(error))
         except FileNotFoundError:
             showerror("Virhe", "Tiedostoa ei löytynyt.")
+        except (TimingError, ValueError) as error:
+            showerror("Virhe", str(error))
 
         self.__handle_clear()
         self.__update_course_list()
@@ -312,7 +314,12 @@ class CreateCourseView(View):
 
         requirement_dropdown = ttk.Combobox(
             master=requirement_row,
-            values=self.__course_list,
+            values=[
+                str(requirement)
+                for requirement in planner_service.get_valid_requirements(
+                    self.__current_id
+                )
+            ],
             textvariable=requirement_variable,
             state="readonly",
             width=COURSE_NAME_WIDTH,
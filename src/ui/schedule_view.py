@@ -29,7 +29,12 @@ class ScheduleView(View):
             self.__tree.delete(item)
 
     def update(self) -> None:
-        """Päivittää aikataulun."""
+        """Päivittää aikataulun.
+        Periodit lisätään sitä mukaa, kun ne valmistuvat,
+        ja näkymä piirretään jokaisen vuoden alussa.
+        """
+
+        schedule = planner_service.iter_schedule()
 
         self.__clear_schedule()
 
@@ -37,9 +42,10 @@ class ScheduleView(View):
         period = planner_service.starting_period
         year = planner_service.starting_year
 
-        for courses in planner_service.get_schedule():
+        for courses in schedule:
             if not self.__tree.exists(str(year)):
                 self.__tree.insert("", constants.END, str(year), text=str(year))
+                self.__tree.update_idletasks()
 
             period_id = self.__tree.insert(str(year), constants.END)
 
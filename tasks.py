@@ -11,6 +11,22 @@ def test(ctx):
     ctx.run("pytest src", pty=True)
 
 
+@task
+def benchmark(ctx, output="benchmark.json", size=1000, seed=0):
+    ctx.run(
+        f"python3 src/benchmark.py run --output {output} --size {size} --seed {seed}",
+        pty=True,
+    )
+
+
+@task
+def benchmark_compare(ctx, baseline, current, threshold=0.1):
+    ctx.run(
+        f"python3 src/benchmark.py compare {baseline} {current} --threshold {threshold}",
+        pty=True,
+    )
+
+
 @task
 def coverage_report(ctx):
     ctx.run("coverage run --branch -m pytest src", pty=True)